@@ -0,0 +1,465 @@
+"""
+Замеры производительности алгоритмов на случайных графах.
+
+Примеры:
+    py bench.py eccentricity -n 800 --density 0.01 0.5
+    py bench.py cache -n 20000 -m 100000
+    py bench.py components -n 1000000 -m 5000000 --workers 1 4
+    py bench.py bfs -n 200000 -m 2000000
+    py bench.py maze --size 4000 --algorithms heap dial --bidirectional
+    py bench.py astar --size 1000 --max-height 100 --heuristics manhattan alt --queries 20
+    py bench.py astar --size 1000 --queries 400 --workers 8
+    py bench.py astar --size 300 --queries 100 --workers 2 --edits 50
+    py bench.py hpa --size 1000 --cluster-size 16 --queries 20
+    py bench.py replan --size 500 --changes 5 --batches 10
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from array import array
+from typing import Callable, Dict, List, Tuple
+
+from tasks import task1, task3, task6, task8, task12
+from utils import Graph, Map
+from utils.apsp import floyd_warshall
+from utils.bfs import FrontierBFS
+from utils.csr import build_csr
+from utils.eccentricity import bitset_eccentricities, bounded_eccentricities, eccentricities
+from utils.hpa import CLUSTER_SIZE, MODES, HierarchicalMap
+from utils.landmarks import DEFAULT_LANDMARKS, landmarks_for
+from utils.pathfinding import SearchStats
+from utils.replanning import IncrementalPlanner
+
+
+def random_graph(n: int, density: float, seed: int) -> Tuple[List[List[int]], Tuple[array, array, array]]:
+    """
+    Случайный неориентированный невзвешенный граф.
+
+    Returns:
+        кортеж (матрица смежности, CSR-массивы)
+    """
+    rng = random.Random(seed)
+    matrix = [[0] * n for _ in range(n)]
+    sources = array('i')
+    targets = array('i')
+    for u in range(n):
+        for v in range(u + 1, n):
+            if rng.random() < density:
+                matrix[u][v] = matrix[v][u] = 1
+                sources.extend((u, v))
+                targets.extend((v, u))
+    return matrix, build_csr(n, sources, targets, [1] * len(sources))
+
+
+def measure(function: Callable, repeat: int) -> Tuple[float, object]:
+    """Лучшее время из repeat запусков и результат последнего."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_eccentricity(args: argparse.Namespace) -> None:
+    """Сравнивает способы вычисления эксцентриситетов."""
+    for density in args.density:
+        matrix, (offsets, targets, _) = random_graph(args.vertices, density, args.seed)
+        engines: Dict[str, Callable] = {
+            'floyd': lambda: [max(row) for row in
+                              floyd_warshall(matrix, unit_weights=True, with_paths=False)[0]],
+            'bfs': lambda: eccentricities(offsets, targets, workers=1),
+            'bitset': lambda: bitset_eccentricities(offsets, targets),
+            'bounds': lambda: bounded_eccentricities(offsets, targets, stats=stats),
+        }
+        stats = {}
+        print(f"V = {args.vertices}, E = {len(targets) // 2}, плотность {density}")
+        reference = None
+        for name in args.engines:
+            seconds, result = measure(engines[name], args.repeat)
+            status = "" if reference is None or result == reference else "  (результат отличается!)"
+            reference = reference if reference is not None else result
+            sweeps = f", обходов: {stats['sweeps']}" if name == 'bounds' else ""
+            print(f"  {name:8} {seconds:9.3f} с{sweeps}{status}")
+
+
+def random_maze_file(size: int, max_height: int, walls: float, seed: int) -> str:
+    """Записывает случайную карту высот size×size во временный файл и возвращает путь."""
+    rng = random.Random(seed)
+    handle, path = tempfile.mkstemp(suffix='.txt')
+    with os.fdopen(handle, 'w') as file:
+        file.write(f"{size} {size}\n")
+        for _ in range(size):
+            file.write(' '.join('0' if rng.random() < walls else str(rng.randint(1, max_height))
+                                for _ in range(size)) + '\n')
+    return path
+
+
+def load_random_maze(args: argparse.Namespace) -> Map:
+    """Случайная карта из параметров --size, --max-height, --walls, --seed."""
+    path = random_maze_file(args.size, args.max_height, args.walls, args.seed)
+    try:
+        start = time.perf_counter()
+        maze = Map(path)
+        print(f"Карта {args.size}×{args.size} загружена за {time.perf_counter() - start:.2f} с")
+    finally:
+        os.remove(path)
+    return maze
+
+
+def report_search(name: str, seconds: float, length: str, stats: SearchStats, status: str) -> None:
+    """Строка отчёта: время, длина пути и раскрытые клетки."""
+    expanded = f"раскрыто {stats.expanded}"
+    if stats.backward_expanded or stats.replay_expanded:
+        expanded += (f" (прямой {stats.forward_expanded}, обратный {stats.backward_expanded}, "
+                     f"повтор {stats.replay_expanded})")
+    print(f"  {name:20} {seconds:9.3f} с, {length}, {expanded}{status}")
+
+
+def random_edges_file(path: str, n: int, m: int, seed: int) -> None:
+    """
+    Случайный неориентированный граф из n вершин и m рёбер в формате списка
+    рёбер (каждое ребро записано в обоих направлениях, то есть 2m дуг).
+    """
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(f"{n}\n")
+        for _ in range(m):
+            u, v = rng.randint(1, n), rng.randint(1, n)
+            file.write(f"{u} {v} 1\n{v} {u} 1\n")
+
+
+def random_adjacency_file(path: str, n: int, m: int, seed: int) -> None:
+    """
+    Случайный неориентированный граф из n вершин и m рёбер в формате списков
+    смежности; соседи каждой вершины записаны в случайном порядке.
+    """
+    rng = random.Random(seed)
+    rows: List[Dict[int, int]] = [{} for _ in range(n)]
+    for _ in range(m):
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u != v:
+            rows[u][v] = rows[v][u] = rng.randint(1, 9)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(f"{n}\n")
+        for row in rows:
+            neighbors = list(row.items())
+            rng.shuffle(neighbors)
+            file.write(" ".join(f"{v + 1}:{w}" for v, w in neighbors) + "\n")
+
+
+def bench_cache(args: argparse.Namespace) -> None:
+    """
+    Сравнивает загрузку списков смежности из текста и из двоичного кэша и
+    проверяет, что после загрузки из кэша результаты заданий 3 и 8 те же.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'graph.txt')
+        random_adjacency_file(path, args.vertices, args.edges, args.seed)
+        print(f"V = {args.vertices}, E <= {args.edges}")
+        for storage in args.storage:
+            cache_file = path + '.gcache'
+            if os.path.exists(cache_file):
+                os.remove(cache_file)
+            cold_seconds, cold = measure(lambda: Graph(path, 'adjacency_list', storage, cache=True), 1)
+            hit_seconds, hit = measure(lambda: Graph(path, 'adjacency_list', storage, cache=True), args.repeat)
+            same = (hit.load_profile()['cache_hit']
+                    and all(cold.adjacency_list(v) == hit.adjacency_list(v) for v in range(1, cold.size() + 1))
+                    and task3.solve_task(cold) == task3.solve_task(hit)
+                    and task8.solve_task(cold) == task8.solve_task(hit))
+            status = "" if same else "  (результат отличается!)"
+            print(f"  {storage:6} текст и запись кэша {cold_seconds:7.3f} с, кэш {hit_seconds:7.3f} с{status}")
+
+
+def bench_components(args: argparse.Namespace) -> None:
+    """Сравнивает DFS и BFS задания 1 с FastSV по массивам рёбер (utils.components)."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'graph.txt')
+        random_edges_file(path, args.vertices, args.edges, args.seed)
+        load_seconds, graph = measure(lambda: Graph(path, 'edges', 'sparse'), 1)
+    _, targets, _ = graph.csr()
+    print(f"V = {args.vertices}, E = {len(targets) // 2}, загрузка {load_seconds:.1f} с")
+    engines: Dict[str, Callable] = {
+        'dfs': lambda: task1.find_connected_components_dfs(graph),
+        'bfs': lambda: task1.find_connected_components_bfs(graph),
+    }
+    for workers in args.workers:
+        engines[f'sv×{workers}'] = lambda workers=workers: task1.find_connected_components_sv(graph, workers)
+    reference = None
+    baseline = None
+    for name, engine in engines.items():
+        if name.split('×')[0] not in args.engines:
+            continue
+        seconds, components = measure(engine, args.repeat)
+        result = sorted(sorted(component) for component in components)
+        status = "" if reference is None or result == reference else "  (результат отличается!)"
+        reference = reference if reference is not None else result
+        baseline = baseline or seconds
+        print(f"  {name:8} {seconds:9.3f} с, компонент {len(result)}, "
+              f"ускорение {baseline / seconds:.1f}×{status}")
+
+
+def bench_bfs(args: argparse.Namespace) -> None:
+    """
+    Сравнивает обход в ширину только сверху вниз с выбором направления шага
+    (utils.bfs) в обычном и упорядоченном режимах.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'graph.txt')
+        random_edges_file(path, args.vertices, args.edges, args.seed)
+        graph = Graph(path, 'edges', 'sparse')
+    offsets, targets, _ = graph.csr()
+    print(f"V = {args.vertices}, E = {len(targets) // 2}")
+    modes = {
+        'top-down': dict(symmetric=False),
+        'direction': dict(symmetric=True),
+        'ordered': dict(symmetric=True, ordered=True),
+    }
+    reference = None
+    for name, options in modes.items():
+        searches = []
+        seconds, components = measure(
+            lambda: searches.append(FrontierBFS(offsets, targets, **options)) or searches[-1].traverse_all(),
+            args.repeat)
+        depths = [len(levels) for levels in components]
+        status = "" if reference is None or depths == reference else "  (уровни отличаются!)"
+        reference = reference if reference is not None else depths
+        steps = searches[-1].steps
+        print(f"  {name:10} {seconds:8.3f} с, шагов сверху вниз {steps['top_down']}, "
+              f"снизу вверх {steps['bottom_up']}{status}")
+
+
+def bench_maze(args: argparse.Namespace) -> None:
+    """Сравнивает очереди алгоритма Дейкстры в задании 6 (путь между углами карты)."""
+    maze = load_random_maze(args)
+    corner = (args.size - 1, args.size - 1)
+    reference = None
+    modes = (False, True) if args.bidirectional else (False,)
+    for algorithm in args.algorithms:
+        for bidirectional in modes:
+            stats = SearchStats()
+            seconds, result = measure(
+                lambda: task6.shortest_path_with_heights(maze, (0, 0), corner, algorithm, bidirectional, stats),
+                args.repeat)
+            status = "" if reference is None or result == reference else "  (результат отличается!)"
+            reference = reference if reference is not None else result
+            length = "нет пути" if result is None else f"длина {len(result) - 1}"
+            name = algorithm + (" двунапр." if bidirectional else "")
+            # Счётчики накоплены за все повторы
+            for field in ('forward_expanded', 'backward_expanded', 'replay_expanded'):
+                setattr(stats, field, getattr(stats, field) // args.repeat)
+            report_search(name, seconds, length, stats, status)
+
+
+def random_queries(maze: Map, count: int, seed: int) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """count случайных пар проходимых клеток (первая пара - противоположные углы)."""
+    rng = random.Random(seed)
+    rows, cols = maze.size()
+    cells = [cell for cell, height in enumerate(maze.heights()) if height > 0]
+    queries = [((0, 0), (rows - 1, cols - 1))]
+    while len(queries) < count and cells:
+        queries.append((maze.position(rng.choice(cells)), maze.position(rng.choice(cells))))
+    return queries[:count]
+
+
+def bench_astar(args: argparse.Namespace) -> None:
+    """Сравнивает эвристики и режимы A* задания 12 на серии запросов к одной карте."""
+    maze = load_random_maze(args)
+    queries = random_queries(maze, args.queries, args.seed)
+    print(f"Запросов: {len(queries)}")
+    if args.edits:
+        # Изменённая карта (версия > 0): файл .alt не используется, обработчики
+        # получают ориентиры только из разделяемой памяти
+        rng = random.Random(args.seed)
+        rows, cols = maze.size()
+        for _ in range(args.edits):
+            maze.set_height(rng.randrange(rows), rng.randrange(cols), 0)
+        print(f"Изменено клеток через set_height: {args.edits}")
+    if 'alt' in args.heuristics:
+        start = time.perf_counter()
+        landmarks = landmarks_for(maze, args.landmarks, persist=False)
+        print(f"Ориентиры ALT ({landmarks.count()}) построены за {time.perf_counter() - start:.2f} с")
+    modes = (False, True) if args.bidirectional else (False,)
+    reference = None
+    for heuristic_type in args.heuristics:
+        for bidirectional in modes:
+            stats = SearchStats()
+            seconds, results = measure(
+                lambda: task12.find_paths(maze, queries, heuristic_type, bidirectional, stats,
+                                          workers=args.workers), args.repeat)
+            lengths = [length for _, length in results]
+            status = "" if reference is None or lengths == reference else "  (длины отличаются!)"
+            reference = reference if reference is not None else lengths
+            name = heuristic_type + (" двунапр." if bidirectional else "")
+            for field in ('forward_expanded', 'backward_expanded', 'replay_expanded'):
+                setattr(stats, field, getattr(stats, field) // args.repeat)
+            report_search(name, seconds, f"сумма длин {sum(lengths)}", stats, status)
+
+
+def bench_hpa(args: argparse.Namespace) -> None:
+    """Сравнивает HPA* (время построения и запросов, длины) с обычным A* задания 12."""
+    maze = load_random_maze(args)
+    queries = random_queries(maze, args.queries, args.seed)
+    build_seconds, hierarchy = measure(lambda: HierarchicalMap(maze, args.cluster_size), 1)
+    print(f"Кластеры {args.cluster_size}×{args.cluster_size}: построение {build_seconds:.2f} с, "
+          f"вершин {hierarchy.node_count()}, рёбер {hierarchy.edge_count()}")
+    seconds, results = measure(lambda: task12.find_paths(maze, queries), args.repeat)
+    optimal = [length for _, length in results]
+    per_query = seconds / len(queries)
+    print(f"Запросов: {len(queries)}")
+    print(f"  {'A*':8} {per_query:9.4f} с на запрос")
+    for mode in MODES:
+        mode_seconds, results = measure(
+            lambda: [hierarchy.find_path(maze.cell_id(*start), maze.cell_id(*goal), mode)
+                     for start, goal in queries], args.repeat)
+        lengths = [length for _, length in results]
+        mode_per_query = mode_seconds / len(queries)
+        excess = sum(lengths) - sum(optimal)
+        exact = sum(length == best for length, best in zip(lengths, optimal))
+        saved = per_query - mode_per_query
+        payback = f", построение окупается за {build_seconds / saved:.0f} запросов" if saved > 0 else ""
+        print(f"  {mode:8} {mode_per_query:9.4f} с на запрос, ускорение {per_query / mode_per_query:.1f}×, "
+              f"кратчайших {exact}/{len(queries)}, длиннее на {100 * excess / max(sum(optimal), 1):.2f}%"
+              f"{payback}")
+
+
+def bench_replan(args: argparse.Namespace) -> None:
+    """
+    Сравнивает перепланирование D* Lite с A* с нуля после пакетов изменений
+    карты (--changes случайных клеток возле текущего пути за пакет).
+    """
+    maze = load_random_maze(args)
+    rng = random.Random(args.seed)
+    rows, cols = maze.size()
+    corner = (rows - 1, cols - 1)
+    planner = IncrementalPlanner(maze, (0, 0), corner)
+    stats = SearchStats()
+    seconds, (path, length) = measure(lambda: planner.find_path(stats), 1)
+    print(f"Первый поиск D* Lite: {seconds:.3f} с, длина {length}, раскрыто {stats.expanded}")
+    total_replan = total_scratch = 0.0
+    for batch in range(args.batches):
+        if not path:
+            print("Пути нет, замер остановлен")
+            break
+        changes = []
+        for _ in range(args.changes):
+            row, col = rng.choice(path[1:-1] or path)
+            row = min(max(row + rng.randint(-2, 2), 0), rows - 1)
+            col = min(max(col + rng.randint(-2, 2), 0), cols - 1)
+            changes.append((row, col, rng.choice([0, rng.randint(1, args.max_height)])))
+        planner.apply_changes(changes)
+        replan_stats = SearchStats()
+        replan_seconds, (path, length) = measure(lambda: planner.find_path(replan_stats), 1)
+        scratch_stats = SearchStats()
+        scratch_seconds, (_, expected) = measure(
+            lambda: task12.astar_search(maze, (0, 0), corner, stats=scratch_stats), 1)
+        total_replan += replan_seconds
+        total_scratch += scratch_seconds
+        status = "" if length == expected else "  (длина отличается!)"
+        print(f"  пакет {batch + 1:3}: D* Lite {replan_seconds:8.4f} с, раскрыто {replan_stats.expanded:8}; "
+              f"A* {scratch_seconds:8.4f} с, раскрыто {scratch_stats.expanded:8}; длина {length}{status}")
+    if total_replan > 0:
+        print(f"Всего: D* Lite {total_replan:.3f} с, A* {total_scratch:.3f} с, "
+              f"ускорение {total_scratch / total_replan:.1f}×")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Замеры производительности алгоритмов')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    ecc = subparsers.add_parser('eccentricity', help='Эксцентриситеты (задания 4 и 10)')
+    ecc.add_argument('-n', '--vertices', type=int, default=500, help='Количество вершин')
+    ecc.add_argument('--density', type=float, nargs='+', default=[0.01, 0.3],
+                     help='Вероятность ребра между парой вершин')
+    ecc.add_argument('--engines', nargs='+', choices=['floyd', 'bfs', 'bitset', 'bounds'],
+                     default=['floyd', 'bfs', 'bitset', 'bounds'], help='Сравниваемые способы')
+    ecc.add_argument('--repeat', type=int, default=1, help='Количество повторов замера')
+    ecc.add_argument('--seed', type=int, default=1, help='Зерно генератора графов')
+    ecc.set_defaults(handler=bench_eccentricity)
+
+    cache = subparsers.add_parser('cache', help='Загрузка из двоичного кэша и её результаты')
+    cache.add_argument('-n', '--vertices', type=int, default=20000, help='Количество вершин')
+    cache.add_argument('-m', '--edges', type=int, default=100000, help='Количество рёбер')
+    cache.add_argument('--storage', nargs='+', choices=['dense', 'sparse'], default=['dense', 'sparse'],
+                       help='Способы хранения графа')
+    cache.add_argument('--repeat', type=int, default=1, help='Количество повторов замера')
+    cache.add_argument('--seed', type=int, default=1, help='Зерно генератора графа')
+    cache.set_defaults(handler=bench_cache)
+
+    components = subparsers.add_parser('components', help='Компоненты связности (задание 1)')
+    components.add_argument('-n', '--vertices', type=int, default=1000000, help='Количество вершин')
+    components.add_argument('-m', '--edges', type=int, default=5000000, help='Количество рёбер')
+    components.add_argument('--engines', nargs='+', choices=['dfs', 'bfs', 'sv'],
+                            default=['dfs', 'sv'], help='Сравниваемые способы')
+    components.add_argument('--workers', type=int, nargs='+', default=[1],
+                            help='Количество процессов FastSV (несколько значений - несколько замеров)')
+    components.add_argument('--repeat', type=int, default=1, help='Количество повторов замера')
+    components.add_argument('--seed', type=int, default=1, help='Зерно генератора графа')
+    components.set_defaults(handler=bench_components)
+
+    bfs = subparsers.add_parser('bfs', help='Обход в ширину с выбором направления (задания 1, 3, 5)')
+    bfs.add_argument('-n', '--vertices', type=int, default=200000, help='Количество вершин')
+    bfs.add_argument('-m', '--edges', type=int, default=2000000, help='Количество рёбер')
+    bfs.add_argument('--repeat', type=int, default=1, help='Количество повторов замера')
+    bfs.add_argument('--seed', type=int, default=1, help='Зерно генератора графа')
+    bfs.set_defaults(handler=bench_bfs)
+
+    maze = subparsers.add_parser('maze', help='Алгоритм Дейкстры в лабиринте (задание 6)')
+    maze.add_argument('--size', type=int, default=1000, help='Сторона квадратной карты')
+    maze.add_argument('--max-height', type=int, default=10, help='Наибольшая высота клетки')
+    maze.add_argument('--walls', type=float, default=0.2, help='Доля непроходимых клеток')
+    maze.add_argument('--algorithms', nargs='+', choices=list(task6.ALGORITHMS),
+                      default=list(task6.ALGORITHMS), help='Сравниваемые очереди')
+    maze.add_argument('--bidirectional', action='store_true',
+                      help='Также замерить двунаправленный режим каждой очереди')
+    maze.add_argument('--repeat', type=int, default=1, help='Количество повторов замера')
+    maze.add_argument('--seed', type=int, default=1, help='Зерно генератора карты')
+    maze.set_defaults(handler=bench_maze)
+
+    astar = subparsers.add_parser('astar', help='A* на карте (задание 12)')
+    astar.add_argument('--size', type=int, default=1000, help='Сторона квадратной карты')
+    astar.add_argument('--max-height', type=int, default=10, help='Наибольшая высота клетки')
+    astar.add_argument('--walls', type=float, default=0.2, help='Доля непроходимых клеток')
+    astar.add_argument('--heuristics', nargs='+', choices=list(task12.HEURISTICS),
+                       default=['manhattan', 'alt'], help='Сравниваемые эвристики')
+    astar.add_argument('--queries', type=int, default=10, help='Количество запросов к карте')
+    astar.add_argument('--landmarks', type=int, default=DEFAULT_LANDMARKS, help='Количество ориентиров ALT')
+    astar.add_argument('--bidirectional', action='store_true',
+                       help='Также замерить двунаправленный режим каждой эвристики')
+    astar.add_argument('--workers', type=int, default=1,
+                       help='Количество процессов (карта в разделяемой памяти)')
+    astar.add_argument('--edits', type=int, default=0,
+                       help='Сколько случайных клеток сделать непроходимыми через set_height')
+    astar.add_argument('--repeat', type=int, default=1, help='Количество повторов замера')
+    astar.add_argument('--seed', type=int, default=1, help='Зерно генератора карты')
+    astar.set_defaults(handler=bench_astar)
+
+    hpa = subparsers.add_parser('hpa', help='Иерархический поиск HPA* (задание 12)')
+    hpa.add_argument('--size', type=int, default=1000, help='Сторона квадратной карты')
+    hpa.add_argument('--max-height', type=int, default=10, help='Наибольшая высота клетки')
+    hpa.add_argument('--walls', type=float, default=0.2, help='Доля непроходимых клеток')
+    hpa.add_argument('--cluster-size', type=int, default=CLUSTER_SIZE, help='Сторона кластера')
+    hpa.add_argument('--queries', type=int, default=10, help='Количество запросов к карте')
+    hpa.add_argument('--repeat', type=int, default=1, help='Количество повторов замера')
+    hpa.add_argument('--seed', type=int, default=1, help='Зерно генератора карты')
+    hpa.set_defaults(handler=bench_hpa)
+
+    replan = subparsers.add_parser('replan', help='Перепланирование D* Lite на изменяемой карте')
+    replan.add_argument('--size', type=int, default=500, help='Сторона квадратной карты')
+    replan.add_argument('--max-height', type=int, default=10, help='Наибольшая высота клетки')
+    replan.add_argument('--walls', type=float, default=0.2, help='Доля непроходимых клеток')
+    replan.add_argument('--changes', type=int, default=5, help='Изменённых клеток в пакете')
+    replan.add_argument('--batches', type=int, default=10, help='Количество пакетов изменений')
+    replan.add_argument('--seed', type=int, default=1, help='Зерно генератора карты и изменений')
+    replan.set_defaults(handler=bench_replan)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,9 @@ from typing import Optional, Dict, Tuple, List
 MIN_TASK_NUMBER = 1
 MAX_TASK_NUMBER = 15
 DEFAULT_ALGORITHM = 'dfs'
+DEFAULT_STORAGE = 'dense'
+DEFAULT_HEURISTIC = 'manhattan'
+DEFAULT_WORKERS = 1
 
 # Типы файлов и их маппинг
 FILE_TYPES = {
@@ -79,19 +82,55 @@ def print_test_result(result: TestResult, show_result: bool = False):
             print("  Ожидалось:")
             print(result.expected)
 
+def print_load_profile(graph) -> None:
+    """Выводит статистику загрузки графа"""
+    stats = graph.load_profile()
+    source = "кэш" if stats['cache_hit'] else "текст"
+    print(f"  Загрузка ({source}): {stats['bytes'] / (1 << 20):.2f} МБ за {stats['parse_seconds']:.3f} с "
+          f"({stats['parse_mb_per_s']:.2f} МБ/с)")
+    if 'symmetry_seconds' in stats:
+        print(f"  Проверка симметричности: {stats['symmetry_seconds']:.3f} с")
+
+def print_search_stats(stats) -> None:
+    """Выводит счётчики поиска пути (задания 6 и 12)"""
+    expanded = f"раскрыто {stats.expanded}"
+    if stats.backward_expanded or stats.replay_expanded:
+        expanded += (f" (прямой {stats.forward_expanded}, обратный {stats.backward_expanded}, "
+                     f"повтор {stats.replay_expanded})")
+    print(f"  Поиск: {expanded}, в очередь {stats.pushes}, из очереди {stats.pops} "
+          f"(устаревших {stats.stale_pops}), повторных раскрытий {stats.reopened}, "
+          f"наибольшая очередь {stats.peak_open}")
+    if stats.phases:
+        phases = ", ".join(f"{phase} {seconds:.3f} с" for phase, seconds in stats.phases.items())
+        print(f"  Этапы: {phases}")
+
 def process_graph_task(task_number: int, test_number: str, task_module, algorithm: str, 
-                      file_path: str, internal_type: str, test_dir: str, show_result: bool = False) -> TestResult:
+                      file_path: str, internal_type: str, test_dir: str, show_result: bool = False,
+                      storage: str = DEFAULT_STORAGE, profile: bool = False,
+                      cache: bool = False, workers: int = DEFAULT_WORKERS,
+                      stream: bool = False) -> TestResult:
     """Обрабатывает стандартное задание с графами"""
     try:
+        if stream:
+            return process_stream_task(task_number, test_number, task_module, file_path, internal_type,
+                                       test_dir)
         from utils import Graph
-        graph = Graph(file_path, internal_type)
+        graph = Graph(file_path, internal_type, storage, cache)
+        if profile:
+            print_load_profile(graph)
         
+        stats = {}
         if task_number == 1:
-            result = task_module.solve_task(graph, algorithm)
+            result = task_module.solve_task(graph, algorithm, workers)
         elif task_number == 11:
             result = task_module.solve_task(graph, test_number)
+        elif task_number in (4, 10):
+            result = task_module.solve_task(graph, stats=stats)
         else:
             result = task_module.solve_task(graph)
+        if profile and 'sweeps' in stats:
+            fallback = " (оценки не сошлись, полный расчёт)" if stats['fallback'] else ""
+            print(f"  Обходов для эксцентриситетов: {stats['sweeps']}{fallback}")
         
         answer_file = os.path.join(test_dir, f"ans_t{task_number}_{test_number}.txt")
         expected = load_answer_file(answer_file)
@@ -102,6 +141,27 @@ def process_graph_task(task_number: int, test_number: str, task_module, algorith
     except Exception as e:
         return TestResult(False, error=str(e))
 
+def process_stream_task(task_number: int, test_number: str, task_module, file_path: str,
+                        internal_type: str, test_dir: str) -> TestResult:
+    """Решает задание 1 или 3 за один проход по списку рёбер, не строя Graph"""
+    if not hasattr(task_module, 'solve_stream'):
+        return TestResult(False, error="Потоковый режим есть только у заданий 1 и 3")
+    if internal_type != 'edges':
+        return TestResult(False, error="Потоковый режим читает только список рёбер (-i e)")
+    result = task_module.solve_stream(file_path)
+    answer_file = os.path.join(test_dir, f"ans_t{task_number}_{test_number}.txt")
+    expected = load_answer_file(answer_file)
+    if expected is None:
+        passed = True
+    elif task_number == 3 and result.startswith(task_module.TREE_HEADER) and \
+            expected.startswith(task_module.TREE_HEADER):
+        # Остовный лес не единственный: проверяются рёбра, отсутствие циклов и их число
+        from utils.streaming import is_spanning_forest
+        passed = is_spanning_forest(file_path, task_module.parse_tree(result))
+    else:
+        passed = compare_results(result, expected)
+    return TestResult(passed, result, expected or "")
+
 def process_map_task(task_number: int, test_number: str, task_module, file_path: str, 
                     test_dir: str, show_result: bool = False) -> TestResult:
     """Обрабатывает задание с картами (задание 12)"""
@@ -121,7 +181,7 @@ def process_map_task(task_number: int, test_number: str, task_module, file_path:
         return TestResult(False, error=str(e))
 
 def process_maze_task(task_number: int, test_number: str, task_module, test_dir: str, 
-                     show_result: bool = False) -> TestResult:
+                     show_result: bool = False, search_stats: bool = False) -> TestResult:
     """Обрабатывает задание с лабиринтами (задание 6)"""
     maze_file = os.path.join(test_dir, f"maze_t6_{test_number}.txt")
     if not os.path.exists(maze_file):
@@ -132,7 +192,11 @@ def process_maze_task(task_number: int, test_number: str, task_module, test_dir:
         return TestResult(False, error=f"Файл-ответ для теста {test_number} не найден")
     
     try:
-        result = task_module.solve_task(maze_file, answer_files[0])
+        from utils.pathfinding import SearchStats
+        stats = SearchStats() if search_stats else None
+        result = task_module.solve_task(maze_file, answer_files[0], stats=stats)
+        if stats is not None:
+            print_search_stats(stats)
         expected = load_answer_file(answer_files[0])
         
         if not expected:
@@ -153,7 +217,10 @@ def process_maze_task(task_number: int, test_number: str, task_module, test_dir:
         return TestResult(False, error=str(e))
 
 def process_standard_task(task_number: int, test_number: str, task_module, algorithm: str, 
-                         file_path: str, internal_type: str, test_dir: str, show_result: bool = False) -> bool:
+                         file_path: str, internal_type: str, test_dir: str, show_result: bool = False,
+                         storage: str = DEFAULT_STORAGE, profile: bool = False,
+                         cache: bool = False, workers: int = DEFAULT_WORKERS,
+                         stream: bool = False) -> bool:
     """Обрабатывает стандартное задание"""
     print_test_header(task_number, test_number, file_path)
     
@@ -161,7 +228,8 @@ def process_standard_task(task_number: int, test_number: str, task_module, algor
         result = process_map_task(task_number, test_number, task_module, file_path, test_dir, show_result)
     else:
         result = process_graph_task(task_number, test_number, task_module, algorithm, 
-                                  file_path, internal_type, test_dir, show_result)
+                                  file_path, internal_type, test_dir, show_result, storage, profile, cache,
+                                  workers, stream)
     
     print_test_result(result, show_result)
     return result.passed
@@ -188,20 +256,26 @@ def select_input_file(test_files: Dict[str, Tuple[str, str]], input_type: Option
     return list(test_files.values())[0]
 
 def run_single_test(task_number: int, test_number: str, task_module, algorithm: str = 'dfs', 
-                   input_type: Optional[str] = None, show_result: bool = False) -> bool:
+                   input_type: Optional[str] = None, show_result: bool = False,
+                   storage: str = DEFAULT_STORAGE, profile: bool = False,
+                   cache: bool = False, heuristic: str = DEFAULT_HEURISTIC,
+                   workers: int = DEFAULT_WORKERS, search_stats: bool = False,
+                   stream: bool = False) -> bool:
     """Запускает один конкретный тест"""
     test_dir = get_test_directory(task_number)
     
     # Особая обработка для задания 6 (лабиринты)
     if task_number == 6:
         print_test_header(task_number, test_number, f"maze_t6_{test_number}.txt")
-        result = process_maze_task(task_number, test_number, task_module, test_dir, show_result)
+        result = process_maze_task(task_number, test_number, task_module, test_dir, show_result,
+                                   search_stats)
         print_test_result(result, show_result)
         return result.passed
     
     # Особая обработка для задания 12 (карты)
     if task_number == 12:
-        return run_map_test(task_number, test_number, task_module, test_dir, show_result)
+        return run_map_test(task_number, test_number, task_module, test_dir, show_result, heuristic,
+                            workers, search_stats)
     
     # Обычная обработка для графов
     test_files = find_test_files(task_number, test_number, test_dir)
@@ -211,9 +285,12 @@ def run_single_test(task_number: int, test_number: str, task_module, algorithm:
     
     file_path, internal_type = select_input_file(test_files, input_type)
     return process_standard_task(task_number, test_number, task_module, algorithm, 
-                               file_path, internal_type, test_dir, show_result)
+                               file_path, internal_type, test_dir, show_result, storage, profile, cache,
+                               workers, stream)
 
-def run_map_test(task_number: int, test_number: str, task_module, test_dir: str, show_result: bool = False) -> bool:
+def run_map_test(task_number: int, test_number: str, task_module, test_dir: str, show_result: bool = False,
+                 heuristic: str = DEFAULT_HEURISTIC, workers: int = DEFAULT_WORKERS,
+                 search_stats: bool = False) -> bool:
     """Запускает тест для карт (задание 12)"""
     map_file = os.path.join(test_dir, f"map_{test_number}.txt")
     if not os.path.exists(map_file):
@@ -231,25 +308,52 @@ def run_map_test(task_number: int, test_number: str, task_module, test_dir: str,
     passed_tests = 0
     total_tests = len(answer_files)
     
-    for i, answer_file in enumerate(answer_files, 1):
-        print(f"  Ответ {i}:")
+    # Карта разбирается один раз, все запросы решаются одним пакетом
+    try:
+        from utils.map import load_map
+        map_obj = load_map(map_file)
+    except Exception as e:
+        print(f"  ✗ ОШИБКА: {e}")
+        return False
+    
+    points = {}
+    errors = {}
+    for answer_file in answer_files:
         try:
-            result = task_module.solve_task(map_file, answer_file)
-            expected = load_answer_file(answer_file)
-            passed = expected is None or compare_results(result, expected)
-            
-            print("    ✓ ПРОШЁЛ" if passed else "    ✗ НЕ ПРОШЁЛ")
-            if passed:
-                passed_tests += 1
-            
-            if show_result:
-                print("    Получено:")
-                print(result)
-                print("    Ожидалось:")
-                print(expected)
-                
+            points[answer_file] = task_module.parse_points_from_answer(answer_file)
         except Exception as e:
-            print(f"    ✗ ОШИБКА: {e}")
+            errors[answer_file] = e
+    try:
+        from utils.pathfinding import SearchStats
+        stats = SearchStats() if search_stats else None
+        found = dict(zip(points, task_module.find_paths(map_obj, list(points.values()), heuristic,
+                                                            stats=stats, workers=workers)))
+    except Exception as e:
+        print(f"  ✗ ОШИБКА: {e}")
+        return False
+    if stats is not None:
+        print_search_stats(stats)
+    
+    for i, answer_file in enumerate(answer_files, 1):
+        print(f"  Ответ {i}:")
+        if answer_file in errors:
+            print(f"    ✗ ОШИБКА: {errors[answer_file]}")
+            continue
+        start, goal = points[answer_file]
+        path, length = found[answer_file]
+        result = task_module.format_result(start, goal, path, length)
+        expected = load_answer_file(answer_file)
+        passed = expected is None or compare_results(result, expected)
+        
+        print("    ✓ ПРОШЁЛ" if passed else "    ✗ НЕ ПРОШЁЛ")
+        if passed:
+            passed_tests += 1
+        
+        if show_result:
+            print("    Получено:")
+            print(result)
+            print("    Ожидалось:")
+            print(expected)
     
     print(f"\n  Итого: {passed_tests}/{total_tests} ответов прошли успешно")
     return passed_tests == total_tests
@@ -280,7 +384,11 @@ def get_test_numbers_for_task(task_number: int, test_dir: str) -> List[str]:
     return sorted(test_nums)
 
 def run_all_tests(task_number: int, task_module, algorithm: str = 'dfs', 
-                 input_type: Optional[str] = None, show_result: bool = False) -> None:
+                 input_type: Optional[str] = None, show_result: bool = False,
+                 storage: str = DEFAULT_STORAGE, profile: bool = False,
+                 cache: bool = False, heuristic: str = DEFAULT_HEURISTIC,
+                 workers: int = DEFAULT_WORKERS, search_stats: bool = False,
+                 stream: bool = False) -> None:
     """Запускает все тесты для заданного задания"""
     test_dir = get_test_directory(task_number)
     if not os.path.exists(test_dir):
@@ -301,7 +409,8 @@ def run_all_tests(task_number: int, task_module, algorithm: str = 'dfs',
     for test_num in test_nums:
         if task_number == 12:
             # Особая обработка для карт
-            passed = run_map_test(task_number, test_num, task_module, test_dir, show_result)
+            passed = run_map_test(task_number, test_num, task_module, test_dir, show_result, heuristic,
+                                  workers, search_stats)
             if passed:
                 passed_tests += 1
         else:
@@ -314,7 +423,8 @@ def run_all_tests(task_number: int, task_module, algorithm: str = 'dfs',
             file_path, internal_type = select_input_file(test_files, input_type)
             try:
                 passed = process_standard_task(task_number, test_num, task_module, algorithm, 
-                                            file_path, internal_type, test_dir, show_result)
+                                            file_path, internal_type, test_dir, show_result, storage, profile, cache,
+                                            workers, stream)
                 if passed:
                     passed_tests += 1
             except Exception as e:
@@ -323,17 +433,25 @@ def run_all_tests(task_number: int, task_module, algorithm: str = 'dfs',
     print(f"\nИтого: {passed_tests}/{total_tests} тестов прошли успешно")
 
 def run_task(task_number: int, test_number: Optional[str] = None, algorithm: str = DEFAULT_ALGORITHM, 
-            input_type: Optional[str] = None, show_result: bool = False) -> None:
+            input_type: Optional[str] = None, show_result: bool = False,
+            storage: str = DEFAULT_STORAGE, profile: bool = False,
+            cache: bool = False, heuristic: str = DEFAULT_HEURISTIC,
+            workers: int = DEFAULT_WORKERS, search_stats: bool = False,
+            stream: bool = False) -> None:
     """Основная функция для запуска задания"""
     task_module_name = f"tasks.task{task_number}"
+    if stream and input_type is None:
+        input_type = 'e'  # Потоковый режим читает список рёбер
     
     try:
         task_module = __import__(task_module_name, fromlist=['solve_task'])
         
         if test_number:
-            run_single_test(task_number, test_number, task_module, algorithm, input_type, show_result)
+            run_single_test(task_number, test_number, task_module, algorithm, input_type, show_result,
+                            storage, profile, cache, heuristic, workers, search_stats, stream)
         else:
-            run_all_tests(task_number, task_module, algorithm, input_type, show_result)
+            run_all_tests(task_number, task_module, algorithm, input_type, show_result, storage, profile,
+                          cache, heuristic, workers, search_stats, stream)
             
     except ImportError as e:
         print(f"Ошибка: Модуль {task_module_name} не найден или не содержит функцию solve_task")
@@ -355,20 +473,43 @@ def main() -> None:
   py main.py 1                    # Задание 1, все тесты
   py main.py 1 001               # Задание 1, тест 001
   py main.py 1 001 --algorithm bfs  # Задание 1, тест 001, алгоритм BFS
+  py main.py 1 --algorithm sv --workers 4  # FastSV по массивам рёбер в 4 процессах
   py main.py 2 001               # Задание 2, тест 001
   py main.py 1 -i a --show-result  # Все тесты, только списки смежности, с выводом результатов
   py main.py 1 001 -i e  # Задание 1, тест 001, только список рёбер
+  py main.py 1 -i e --storage sparse  # Разреженное хранение графа (CSR)
+  py main.py 1 001 --profile     # Время и скорость разбора входного файла
+  py main.py 5 --cache           # Двоичный кэш графов рядом с тестовыми файлами
+  py main.py 12 --heuristic alt  # A* с ориентирами (<карта>.alt рядом с картой)
+  py main.py 12 --workers 4      # Запросы к карте в 4 процессах (разделяемая память)
+  py main.py 12 --stats          # Раскрытые клетки, операции с очередью, время этапов поиска
+  py main.py 3 -i e --stream     # Остовный лес за один проход по списку рёбер, память O(V)
         """
     )
     
     parser.add_argument('task_number', type=int, help=f'Номер задания ({MIN_TASK_NUMBER}-{MAX_TASK_NUMBER})')
     parser.add_argument('test_number', nargs='?', help='Номер конкретного теста (например, 001) или не указывать для всех тестов')
-    parser.add_argument('--algorithm', choices=['dfs', 'bfs'], default=DEFAULT_ALGORITHM, 
-                       help='Алгоритм для задания 1 (по умолчанию: dfs)')
+    parser.add_argument('--algorithm', choices=['dfs', 'bfs', 'sv'], default=DEFAULT_ALGORITHM, 
+                       help='Алгоритм для задания 1 (sv - FastSV по массивам рёбер, по умолчанию: dfs)')
     parser.add_argument('-i', '--input-type', choices=['m', 'a', 'e'], 
                        help='Тип входного файла: m (matrix), a (adjacency_list), e (list_of_edges)')
     parser.add_argument('-s', '--show-result', action='store_true', 
                        help='Показывать подробный результат и эталон')
+    parser.add_argument('--storage', choices=['dense', 'sparse'], default=DEFAULT_STORAGE,
+                       help='Хранение графа: dense (матрица и списки) или sparse (CSR без матрицы V×V)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Показывать время и скорость (МБ/с) загрузки графа и число обходов (задания 4, 10)')
+    parser.add_argument('--cache', action='store_true',
+                       help='Использовать двоичный кэш графа (<файл>.gcache, открывается через mmap)')
+    parser.add_argument('--heuristic', choices=['manhattan', 'chebyshev', 'euclidean', 'alt'],
+                       default=DEFAULT_HEURISTIC,
+                       help='Эвристика A* для задания 12 (alt - ориентиры, по умолчанию: manhattan)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                       help='Количество процессов для пакета запросов задания 12 и --algorithm sv (по умолчанию: 1)')
+    parser.add_argument('--stats', action='store_true',
+                       help='Показывать счётчики поиска пути для заданий 6 и 12')
+    parser.add_argument('--stream', action='store_true',
+                       help='Задания 1 и 3: один проход по списку рёбер без построения графа (память O(V))')
     
     args = parser.parse_args()
     
@@ -376,7 +517,9 @@ def main() -> None:
         print(f"Ошибка: Номер задания должен быть от {MIN_TASK_NUMBER} до {MAX_TASK_NUMBER}")
         sys.exit(1)
     
-    run_task(args.task_number, args.test_number, args.algorithm, args.input_type, args.show_result)
+    run_task(args.task_number, args.test_number, args.algorithm, args.input_type, args.show_result,
+             args.storage, args.profile, args.cache, args.heuristic, args.workers,
+             args.stats, args.stream)
 
 if __name__ == "__main__":
     main()
@@ -6,7 +6,13 @@
 
 Алгоритмы:
 - DFS (Depth-First Search) - поиск в глубину
-- BFS (Breadth-First Search) - поиск в ширину
+- BFS (Breadth-First Search) - поиск в ширину с выбором направления шага
+  (utils.bfs: сверху вниз или снизу вверх на каждом уровне)
+- Слабо связные компоненты орграфа - система непересекающихся множеств по дугам
+- FastSV - векторные раунды подвешивания и сжатия по массивам рёбер (utils.components)
+- Потоковый режим - один проход по файлу списка рёбер без построения Graph
+  (utils.streaming), память O(V) независимо от числа рёбер; ориентированность
+  подтверждается загрузкой Graph, если суммы хэшей дуг не совпали
 
 Временная сложность: O(V + E), где V - количество вершин, E - количество рёбер
 Пространственная сложность: O(V)
@@ -17,7 +23,11 @@
 
 from typing import List, Set
 from utils import Graph
-from collections import deque
+from utils.bfs import FrontierBFS
+from utils.components import connected_components
+from utils.dsu import DisjointSet
+from utils.streaming import stream_edges
+from itertools import repeat
 import sys
 
 
@@ -80,7 +90,10 @@ def find_connected_components_bfs(graph: Graph) -> List[List[int]]:
     2. Для каждой непосещённой вершины запускаем BFS
     3. Все вершины, достижимые из стартовой, образуют компоненту связности
     
-    BFS обеспечивает поиск в ширину, что может быть полезно для некоторых задач.
+    Обход выполняется по уровням над массивами graph.csr() (utils.bfs): на
+    средних уровнях графа с малым диаметром шаг идёт «снизу вверх» - от
+    непосещённых вершин к фронту, с остановкой на первом найденном соседе.
+    Вершины компоненты перечисляются по уровням.
     
     Args:
         graph: граф для анализа
@@ -94,44 +107,9 @@ def find_connected_components_bfs(graph: Graph) -> List[List[int]]:
         >>> print(components)
         [[1, 2, 3], [4, 5], [6]]
     """
-    visited = set()
-    components = []
-    
-    def bfs(start_vertex: int) -> List[int]:
-        """
-        BFS для поиска компоненты связности.
-        
-        Использует очередь для обеспечения поиска в ширину.
-        
-        Args:
-            start_vertex: стартовая вершина для поиска
-            
-        Returns:
-            список вершин в компоненте связности
-        """
-        component = []
-        queue = deque([start_vertex])
-        visited.add(start_vertex)
-        
-        while queue:
-            vertex = queue.popleft()
-            component.append(vertex)
-            
-            # Добавляем всех непосещенных соседей в очередь
-            for neighbor in graph.adjacency_list(vertex):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append(neighbor)
-        
-        return component
-    
-    # Проходим по всем вершинам
-    for vertex in range(1, graph.size() + 1):
-        if vertex not in visited:
-            component = bfs(vertex)
-            components.append(component)
-    
-    return components
+    offsets, targets, _ = graph.csr()
+    search = FrontierBFS(offsets, targets, symmetric=not graph.is_directed())
+    return [[vertex + 1 for level in levels for vertex in level] for levels in search.traverse_all()]
 
 
 def find_weakly_connected_components(graph: Graph) -> List[List[int]]:
@@ -143,14 +121,19 @@ def find_weakly_connected_components(graph: Graph) -> List[List[int]]:
     
     Алгоритм:
     1. Если граф неориентированный, используем обычный поиск компонент связности
-    2. Для орграфа создаём неориентированное представление
-    3. Применяем DFS для поиска компонент связности в неориентированном графе
+    2. Для орграфа - один проход по дугам массивов CSR (graph.csr()): концы каждой
+       дуги объединяются в системе непересекающихся множеств (utils.dsu, сжатие
+       пути делением пополам и объединение по размеру)
+    3. Вершины одного множества образуют слабо связную компоненту
+    
+    Время O(V + E·α(V)), память O(V) сверх массивов графа.
     
     Args:
         graph: орграф для анализа
         
     Returns:
-        список слабо связных компонент
+        список слабо связных компонент (вершины по возрастанию, компоненты -
+        по наименьшей вершине)
         
     Пример:
         >>> graph = Graph("digraph.txt", "matrix")  # орграф
@@ -162,50 +145,43 @@ def find_weakly_connected_components(graph: Graph) -> List[List[int]]:
         # Если граф неориентированный, используем обычный поиск компонент связности
         return find_connected_components_dfs(graph)
     
-    # Для орграфа создаем неориентированный граф (матрицу смежности)
-    # и используем итеративный DFS для поиска компонент связности
-    visited = set()
-    components = []
-    
-    def dfs_undirected_iterative(vertex: int) -> List[int]:
-        """
-        Итеративный DFS для неориентированного представления орграфа.
-        
-        При поиске соседей проверяем рёбра в обе стороны, так как
-        мы работаем с неориентированным представлением орграфа.
-        
-        Args:
-            vertex: текущая вершина
-            
-        Returns:
-            список вершин в слабо связной компоненте
-        """
-        component = []
-        stack = [vertex]
-        visited.add(vertex)
-        
-        while stack:
-            current_vertex = stack.pop()
-            component.append(current_vertex)
-            
-            # Проверяем все возможные рёбра (в обе стороны)
-            for neighbor in range(1, graph.size() + 1):
-                if neighbor not in visited and (graph.is_edge(current_vertex, neighbor) or graph.is_edge(neighbor, current_vertex)):
-                    visited.add(neighbor)
-                    stack.append(neighbor)
-        
-        return component
+    offsets, targets, weights = graph.csr()
+    n = graph.size()
+    components = DisjointSet(n)
+    for u in range(n):
+        lo, hi = offsets[u], offsets[u + 1]
+        if lo == hi:
+            continue
+        # Дугами считаются только рёбра с положительным весом (как graph.is_edge)
+        heads = [v for v, w in zip(targets[lo:hi], weights[lo:hi]) if w > 0]
+        components.union_pairs(repeat(u, len(heads)), heads)
+    return [[vertex + 1 for vertex in group] for group in components.groups()]
+
+
+def find_connected_components_sv(graph: Graph, workers: int = 1) -> List[List[int]]:
+    """
+    Находит компоненты связности (для орграфа - слабо связные компоненты)
+    алгоритмом FastSV по массивам CSR (graph.csr()), без списков смежности.
     
-    # Проходим по всем вершинам
-    for vertex in range(1, graph.size() + 1):
-        if vertex not in visited:
-            component = dfs_undirected_iterative(vertex)
-            components.append(component)
+    Вершины хранят ссылку на наименьшую известную вершину компоненты; раунды
+    подвешивания и сжатия путей выполняются операциями NumPy сразу над всеми
+    рёбрами (utils.components). Для орграфа учитываются только дуги с
+    положительным весом (как graph.is_edge).
     
-    return components
+    Args:
+        graph: граф для анализа
+        workers: количество процессов, между которыми делятся рёбра
+        
+    Returns:
+        список компонент (вершины по возрастанию, компоненты - по наименьшей вершине)
+    """
+    offsets, targets, weights = graph.csr()
+    directed = graph.is_directed()
+    groups = connected_components(offsets, targets, weights if directed else None, not directed, workers)
+    return [[vertex + 1 for vertex in group] for group in groups]
 
 
-def solve_task(graph: Graph, algorithm: str = 'dfs') -> str:
+def solve_task(graph: Graph, algorithm: str = 'dfs', workers: int = 1) -> str:
     """
     Решает задачу 1: поиск компонент связности.
     
@@ -214,7 +190,8 @@ def solve_task(graph: Graph, algorithm: str = 'dfs') -> str:
     
     Args:
         graph: граф для анализа
-        algorithm: алгоритм ('dfs' или 'bfs') - используется только для неориентированных графов
+        algorithm: алгоритм ('dfs', 'bfs' или 'sv'); для орграфов учитывается только 'sv'
+        workers: количество процессов для алгоритма 'sv'
         
     Returns:
         строка с результатом в требуемом формате:
@@ -237,7 +214,9 @@ def solve_task(graph: Graph, algorithm: str = 'dfs') -> str:
         sys.setrecursionlimit(max(sys.getrecursionlimit(), graph.size() * 2))
     
     is_digraph = graph.is_directed()
-    if is_digraph:
+    if algorithm == 'sv':
+        components = find_connected_components_sv(graph, workers)
+    elif is_digraph:
         components = find_weakly_connected_components(graph)
     else:
         if algorithm == 'dfs':
@@ -247,7 +226,25 @@ def solve_task(graph: Graph, algorithm: str = 'dfs') -> str:
         else:
             raise ValueError(f"Неподдерживаемый алгоритм: {algorithm}")
     
-    # Формируем результат
+    return format_components(components, is_digraph)
+
+
+def solve_stream(edges_file: str) -> str:
+    """
+    Решает задачу 1 за один проход по файлу списка рёбер, не строя Graph.
+    
+    Args:
+        edges_file: путь к файлу списка рёбер (первая строка - число вершин)
+        
+    Returns:
+        строка в формате solve_task
+    """
+    forest = stream_edges(edges_file)
+    return format_components(forest.components(), forest.is_directed())
+
+
+def format_components(components: List[List[int]], is_digraph: bool) -> str:
+    """Формирует вывод задачи 1 по списку компонент."""
     result = []
     
     if len(components) == 1:
@@ -5,8 +5,11 @@
 
 Алгоритм:
 - Динамическое программирование
+- Для графов с единичными весами - пакетный битовый обход в ширину
+- Для неориентированных графов с неотрицательными весами - ограничивающие оценки
+  эксцентриситетов по обходам алгоритмом Дейкстры
 
-Временная сложность: O(V^3)
+Временная сложность: O(V^3), для единичных весов O(V·E / 64)
 Пространственная сложность: O(V^2)
 
 Пример вывода:
@@ -16,26 +19,18 @@
     3 1 0
 """
 from utils import Graph
+from utils.apsp import floyd_warshall as apsp_floyd_warshall
+from utils.eccentricity import bitset_eccentricities, bounded_eccentricities
 from typing import List, Tuple
 import math
 
 def floyd_warshall(n: int, adj: List[List[int]]) -> Tuple[List[List[float]], List[List[int]]]:
-    dist = [[math.inf] * n for _ in range(n)]
-    nxt = [[-1] * n for _ in range(n)]
-    for u in range(n):
-        for v in range(n):
-            if adj[u][v] != 0:
-                dist[u][v] = adj[u][v]
-                nxt[u][v] = v
-        dist[u][u] = 0
-        nxt[u][u] = u
-    for k in range(n):
-        for i in range(n):
-            for j in range(n):
-                if dist[i][k] + dist[k][j] < dist[i][j]:
-                    dist[i][j] = dist[i][k] + dist[k][j]
-                    nxt[i][j] = nxt[i][k]
-    return dist, nxt
+    """
+    Алгоритм Флойда-Уоршелла с матрицей nxt для восстановления путей.
+
+    Вычисления выполняет общий движок utils.apsp (векторизованный по k).
+    """
+    return apsp_floyd_warshall(adj)
 
 def restore_path(u: int, v: int, nxt: List[List[int]]) -> List[int]:
     if nxt[u][v] == -1:
@@ -64,10 +59,35 @@ def get_components(n: int, adj: List[List[int]]) -> List[List[int]]:
             components.append(sorted(comp))
     return components
 
-def solve_task(graph: Graph) -> str:
+def solve_task(graph: Graph, **kwargs) -> str:
+    """
+    Args:
+        graph: граф
+        **kwargs: engine - способ вычисления эксцентриситетов:
+                  'auto' (по умолчанию): 'bitset' для единичных весов, 'bounds'
+                  для неориентированного графа с неотрицательными весами,
+                  иначе 'floyd'; неприменимый способ заменяется на 'floyd';
+                  stats - словарь для статистики 'bounds' (число обходов 'sweeps')
+    """
     n = graph.size()
     adj = graph.adjacency_matrix()
-    dist, nxt = floyd_warshall(n, adj)
+    unit = set().union(*adj) <= {0, 1}
+    metric = n > 0 and not graph.is_directed() and min(map(min, adj)) >= 0
+    engine = kwargs.get('engine', 'auto')
+    if engine == 'auto':
+        engine = 'bitset' if unit else 'bounds' if metric else 'floyd'
+    dist = None
+    if engine == 'bitset' and unit:
+        # Невзвешенный граф: расстояния в рёбрах, достаточно обходов в ширину
+        offsets, targets, _ = graph.csr()
+        depths = bitset_eccentricities(offsets, targets, ignore_unreachable=True)
+    elif engine == 'bounds' and metric:
+        # Неориентированный граф: точные эксцентриситеты по оценкам за несколько обходов
+        offsets, targets, weights = graph.csr()
+        depths = bounded_eccentricities(offsets, targets, None if unit else weights,
+                                        ignore_unreachable=True, stats=kwargs.get('stats'))
+    else:
+        dist, nxt = floyd_warshall(n, adj)
     components = get_components(n, adj)
     result = ""
     for idx, comp in enumerate(components):
@@ -83,7 +103,10 @@ def solve_task(graph: Graph) -> str:
         # Эксцентриситеты для этой компоненты
         eccentricity = []
         for i in comp:
-            mx = max(dist[i][j] for j in comp if dist[i][j] < math.inf)
+            if dist is None:
+                mx = depths[i]
+            else:
+                mx = max(dist[i][j] for j in comp if dist[i][j] < math.inf)
             eccentricity.append(float(mx))
         result += "Eccentricity:\n"
         result += str(eccentricity) + "\n"
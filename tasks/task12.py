@@ -4,7 +4,9 @@
 Реализует поиск кратчайшего пути на карте с помощью алгоритма A* с различными эвристиками.
 
 Алгоритм:
-- A* (A-star) с эвристиками: манхэттен, чебышев, евклидова
+- A* (A-star) с эвристиками: манхэттен, чебышев, евклидова, ALT (ориентиры с
+  заранее вычисленными расстояниями, учитывают высоты)
+- HPA*: поиск по абстрактному графу кластеров с уточнением (hierarchical_search)
 
 Временная сложность: зависит от эвристики и плотности препятствий
 Пространственная сложность: O(N*M)
@@ -15,10 +17,35 @@
     (1, 1) -> (1, 2) -> ... -> (5, 5)
 """
 from utils import Map
+from utils.hpa import hierarchy_for
+from utils.landmarks import landmarks_for
+from utils.map import as_map
+from utils.pathfinding import SearchStats, bidirectional_corridor, phase_timer
+from utils.shared_map import attach_map, share_map
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import heapq
 import math
+import os
 import re
 
+# Эвристики astar_search
+HEURISTICS = ('manhattan', 'chebyshev', 'euclidean', 'alt')
+
+# g-оценка ещё не достигнутой клетки
+UNVISITED = (1 << 63) - 1
+
+# Меньшие пакеты решаются в текущем процессе: запуск пула дороже поиска
+PARALLEL_MIN_QUERIES = 32
+
+# Количество задач на один процесс (для выравнивания нагрузки)
+CHUNKS_PER_WORKER = 4
+
+# Карта в разделяемой памяти, подключённая в процессе-обработчике: (блок, Map)
+_shared = None
+
 def heuristic(a, b, type='manhattan'):
     if type == 'manhattan':
         return abs(a[0] - b[0]) + abs(a[1] - b[1])
@@ -29,33 +56,129 @@ def heuristic(a, b, type='manhattan'):
     else:
         raise ValueError('Unknown heuristic type')
 
-def astar_search(map_obj: Map, start, goal, heuristic_type='manhattan'):
+def _cell_heuristic(map_obj: Map, goal, heuristic_type='manhattan', start=None):
+    """
+    Эвристика как функция номера клетки (координаты цели вычислены заранее).
+    
+    'alt' - оценка по ориентирам (utils.landmarks): таблицы расстояний строятся
+    один раз на карту и сохраняются рядом с её файлом; start выбирает лучшие
+    для запроса ориентиры.
+    """
+    if heuristic_type == 'alt':
+        start_cell = map_obj.cell_id(*start) if start is not None else None
+        return landmarks_for(map_obj).heuristic(map_obj.cell_id(*goal), start_cell)
+    _, cols = map_obj.size()
+    goal_row, goal_col = goal
+    if heuristic_type == 'manhattan':
+        return lambda cell: abs(cell // cols - goal_row) + abs(cell % cols - goal_col)
+    elif heuristic_type == 'chebyshev':
+        return lambda cell: max(abs(cell // cols - goal_row), abs(cell % cols - goal_col))
+    elif heuristic_type == 'euclidean':
+        return lambda cell: math.sqrt((cell // cols - goal_row) ** 2 + (cell % cols - goal_col) ** 2)
+    else:
+        raise ValueError('Unknown heuristic type')
+
+def astar_search(map_obj: Map, start, goal, heuristic_type='manhattan', bidirectional=False, stats=None):
+    """
+    A* на номерах клеток Map: g-оценки и предшественники хранятся в плоских
+    массивах, соседи берутся из таблицы Map.neighbor_table.
+    
+    При bidirectional=True сначала выполняется двунаправленный A* со средними
+    потенциалами (utils.pathfinding), затем A* повторяется только по найденным
+    им клеткам кратчайших путей: путь и длина совпадают с однонаправленным поиском.
+    stats (SearchStats) получает раскрытые клетки, операции с очередью,
+    повторные раскрытия и время этапов (connectivity, heuristic, bidirectional,
+    search или replay).
+    """
+    s = map_obj.cell_id(*start)
+    g = map_obj.cell_id(*goal)
+    with phase_timer(stats, 'connectivity'):
+        if not map_obj.connected(s, g):
+            return [], 0  # Разные области: ответ по меткам областей без поиска
+    with phase_timer(stats, 'heuristic'):
+        h = _cell_heuristic(map_obj, goal, heuristic_type, start)
+        if bidirectional:
+            h_start = _cell_heuristic(map_obj, start, heuristic_type, goal)
+    masks, table = map_obj.neighbor_table()
+    replay_stats = stats
+    if bidirectional:
+        with phase_timer(stats, 'bidirectional'):
+            masks = bidirectional_corridor(map_obj, s, g, lambda cell: (h(cell) - h_start(cell)) / 2, stats)
+        if masks is None:
+            return [], 0
+        replay_stats = SearchStats() if stats is not None else None
+    with phase_timer(stats, 'replay' if bidirectional else 'search'):
+        result = _astar_cells(map_obj, s, g, h, masks, table, replay_stats)
+    if bidirectional and stats is not None:
+        stats.merge(replay_stats, as_replay=True)
+    return result
+
+def _astar_cells(map_obj: Map, s, g, h, masks, table, stats):
+    """A* от клетки s до клетки g с масками соседей masks; возвращает (путь, длина)."""
     rows, cols = map_obj.size()
-    open_set = []
-    heapq.heappush(open_set, (0, start))
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal, heuristic_type)}
+    heights = map_obj.heights()
+    if map_obj.is_mapped():
+        # Карта в mmap: память только под клетки, до которых дошёл поиск
+        g_score = defaultdict(repeat(UNVISITED).__next__)
+        came_from = {}
+        closed = defaultdict(int)
+    else:
+        g_score = array('q', [UNVISITED]) * (rows * cols)
+        came_from = array('i', [-1]) * (rows * cols)
+        closed = bytearray(rows * cols)
+    g_score[s] = 0
+    # Записи (f, клетка, g): порядок извлечения тот же, что у пар (f, клетка)
+    open_set = [(h(s), s, 0)]
+    expanded = 0
+    pushes = peak = 1
+    pops = stale = reopened = 0
+    path, length = [], 0
     while open_set:
-        _, current = heapq.heappop(open_set)
-        if current == goal:
+        if len(open_set) > peak:
+            peak = len(open_set)
+        _, current, current_g = heapq.heappop(open_set)
+        pops += 1
+        if current == g:
             # Восстановление пути
-            path = []
-            while current in came_from:
-                path.append(current)
+            while current != s:
+                path.append(map_obj.position(current))
                 current = came_from[current]
-            path.append(start)
+            path.append(map_obj.position(s))
             path.reverse()
-            return path, g_score[goal]
-        for neighbor in map_obj.neighbors(*current):
-            step_cost = abs(neighbor[0] - current[0]) + abs(neighbor[1] - current[1]) + abs(map_obj[neighbor[0], neighbor[1]] - map_obj[current[0], current[1]])
-            tentative_g = g_score[current] + step_cost
-            if neighbor not in g_score or tentative_g < g_score[neighbor]:
+            length = g_score[g]
+            break
+        if current_g > g_score[current]:
+            stale += 1
+            continue  # Устаревшая запись
+        expanded += 1
+        if closed[current]:
+            reopened += 1  # Клетка уже раскрывалась с большей g-оценкой
+        closed[current] = 1
+        height = heights[current]
+        for step in table[masks[current]]:
+            neighbor = current + step
+            tentative_g = current_g + 1 + abs(heights[neighbor] - height)
+            if tentative_g < g_score[neighbor]:
                 came_from[neighbor] = current
                 g_score[neighbor] = tentative_g
-                f_score[neighbor] = tentative_g + heuristic(neighbor, goal, heuristic_type)
-                heapq.heappush(open_set, (f_score[neighbor], neighbor))
-    return [], 0
+                heapq.heappush(open_set, (tentative_g + h(neighbor), neighbor, tentative_g))
+                pushes += 1
+    if stats is not None:
+        stats.forward_expanded += expanded
+        stats.count_queue(pushes, pops, stale, peak, reopened)
+    return path, length
+
+def hierarchical_search(map_obj: Map, start, goal, mode='fast', stats=None):
+    """
+    Иерархический поиск (HPA*, utils.hpa): абстрактный граф кластеров строится
+    один раз на карту, запрос уточняется только по выбранным кластерам.
+    
+    Результат в формате astar_search; длина может быть больше кратчайшей
+    ('fast' - немного, 'exact' - редко, см. utils.hpa).
+    """
+    cells, length = hierarchy_for(map_obj).find_path(map_obj.cell_id(*start), map_obj.cell_id(*goal),
+                                                     mode, stats)
+    return [map_obj.position(cell) for cell in cells], length
 
 def parse_points_from_answer(answer_file: str):
     with open(answer_file, 'r', encoding='utf-8') as f:
@@ -67,12 +190,86 @@ def parse_points_from_answer(answer_file: str):
     goal = (int(m.group(4)), int(m.group(5)))
     return start, goal
 
-def solve_task(map_file, answer_file, heuristic_type='manhattan'):
-    map_obj = Map(map_file)
-    start, goal = parse_points_from_answer(answer_file)
-    path, length = astar_search(map_obj, start, goal, heuristic_type)
-    # Формируем вывод строго по эталону
+def _attach_shared(info):
+    """Инициализатор процесса: подключает карту из разделяемой памяти."""
+    global _shared
+    _shared = attach_map(info)
+
+def _shared_paths(queries, heuristic_type, bidirectional, hierarchical):
+    """Задача процесса: пакет запросов к разделяемой карте; возвращает (результаты, счётчики)."""
+    stats = SearchStats()
+    return find_paths(_shared[1], queries, heuristic_type, bidirectional, stats, hierarchical), stats
+
+def _find_paths_parallel(map_obj, queries, heuristic_type, bidirectional, stats, hierarchical, workers):
+    """find_paths в workers процессах; порядок результатов - порядок запросов."""
+    landmarks = None
+    if heuristic_type == 'alt' and hierarchical is None:
+        landmarks = landmarks_for(map_obj)  # Таблицы строятся один раз и передаются в блоке
+    block, info = share_map(map_obj, landmarks)
+    try:
+        step = max(1, -(-len(queries) // (workers * CHUNKS_PER_WORKER)))
+        chunks = [queries[begin:begin + step] for begin in range(0, len(queries), step)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_shared,
+                                 initargs=(info,)) as executor:
+            parts = executor.map(_shared_paths, chunks, repeat(heuristic_type), repeat(bidirectional),
+                                 repeat(hierarchical))
+            results = []
+            for part, part_stats in parts:
+                results.extend(part)
+                if stats is not None:
+                    stats.merge(part_stats)
+        return results
+    finally:
+        if block is not None:
+            block.close()
+            block.unlink()
+
+def find_paths(map_source, queries, heuristic_type='manhattan', bidirectional=False, stats=None,
+               hierarchical=None, workers=1):
+    """
+    Пакетный поиск путей на одной карте.
+    
+    Карта разбирается один раз (объект Map или путь к файлу, загружаемый через
+    кэш load_map), все запросы используют её массив высот и маски соседей.
+    
+    Args:
+        map_source: объект Map или путь к файлу карты
+        queries: список пар (start, goal)
+        heuristic_type: эвристика A*
+        bidirectional: двунаправленный режим (см. astar_search)
+        stats: счётчики раскрытых клеток, суммируются по всем запросам
+        hierarchical: None (A*) или режим HPA* 'fast' / 'exact' (hierarchical_search)
+        workers: количество процессов (None - число ядер); при workers > 1 и
+                 не меньше PARALLEL_MIN_QUERIES запросах карта один раз
+                 копируется в разделяемую память (utils.shared_map), а запросы
+                 делятся между процессами
+        
+    Returns:
+        список пар (путь, длина) в порядке запросов
+    """
+    map_obj = as_map(map_source)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(queries) >= PARALLEL_MIN_QUERIES:
+        return _find_paths_parallel(map_obj, list(queries), heuristic_type, bidirectional, stats,
+                                    hierarchical, workers)
+    if hierarchical is not None:
+        return [hierarchical_search(map_obj, start, goal, hierarchical, stats) for start, goal in queries]
+    return [astar_search(map_obj, start, goal, heuristic_type, bidirectional, stats)
+            for start, goal in queries]
+
+def format_result(start, goal, path, length):
+    """Формирует вывод строго по эталону."""
     result = f"{length} - length of path between {start} and {goal} points.\n"
     result += "Path:\n"
     result += str(path)
-    return result 
\ No newline at end of file
+    return result
+
+def solve_task(map_file, answer_file, heuristic_type='manhattan', bidirectional=False, stats=None):
+    """
+    Args:
+        map_file: путь к файлу карты (загружается через кэш) или объект Map
+    """
+    start, goal = parse_points_from_answer(answer_file)
+    (path, length), = find_paths(map_file, [(start, goal)], heuristic_type, bidirectional, stats)
+    return format_result(start, goal, path, length)
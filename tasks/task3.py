@@ -5,7 +5,10 @@
 
 Алгоритмы:
 - DFS (поиск в глубину)
-- BFS (поиск в ширину)
+- BFS (поиск в ширину) с выбором направления шага (utils.bfs); лес совпадает
+  с лесом обычного BFS на очереди
+- Потоковый режим (solve_stream): остовный лес системой непересекающихся
+  множеств за один проход по файлу списка рёбер, память O(V)
 
 Временная сложность: O(V + E)
 Пространственная сложность: O(V)
@@ -17,10 +20,29 @@
     (3, 4)
 """
 from utils import Graph
-from collections import deque
+from utils.bfs import FrontierBFS
+from utils.streaming import stream_edges
 import sys
 
+# Первая строка вывода с остовным лесом
+TREE_HEADER = "Spanning tree:"
+
+
+def _bfs_tree_edges(graph: Graph):
+    """Рёбра леса BFS в порядке обхода: предок каждой вершины - как у обхода с очередью."""
+    offsets, targets, _ = graph.csr()
+    search = FrontierBFS(offsets, targets, symmetric=not graph.is_directed(), ordered=True)
+    parent = search.parent
+    tree_edges = []
+    for levels in search.traverse_all():
+        for level in levels[1:]:
+            tree_edges.extend(tuple(sorted((parent[v] + 1, v + 1))) for v in level)
+    return tree_edges
+
+
 def spanning_tree_edges(graph: Graph, method: str = 'dfs'):
+    if method != 'dfs':
+        return _bfs_tree_edges(graph)
     n = graph.size()
     visited = [False] * (n + 1)
     tree_edges = []
@@ -32,23 +54,9 @@ def spanning_tree_edges(graph: Graph, method: str = 'dfs'):
                 tree_edges.append(tuple(sorted((u, v))))
                 dfs(v)
 
-    def bfs(start):
-        queue = deque([start])
-        visited[start] = True
-        while queue:
-            u = queue.popleft()
-            for v in graph.adjacency_list(u):
-                if not visited[v]:
-                    visited[v] = True
-                    tree_edges.append(tuple(sorted((u, v))))
-                    queue.append(v)
-
     for v in range(1, n + 1):
         if not visited[v]:
-            if method == 'dfs':
-                dfs(v)
-            else:
-                bfs(v)
+            dfs(v)
     return tree_edges
 
 
@@ -57,10 +65,34 @@ def solve_task(graph: Graph, algorithm: str = 'dfs', **kwargs) -> str:
         return "This task is only for undirected graphs."
     if graph.size() > 1000:
         sys.setrecursionlimit(max(sys.getrecursionlimit(), graph.size() * 2))
-    edges = spanning_tree_edges(graph, method=algorithm)
+    return format_tree(spanning_tree_edges(graph, method=algorithm))
+
+
+def solve_stream(edges_file: str) -> str:
+    """
+    Остовный лес за один проход по файлу списка рёбер без построения Graph.
+    
+    Ребро входит в лес, если соединяет разные компоненты уже прочитанной части
+    файла, поэтому лес может отличаться от леса обхода (число рёбер то же);
+    проверка результата - utils.streaming.is_spanning_forest.
+    """
+    forest = stream_edges(edges_file)
+    if forest.is_directed():
+        return "This task is only for undirected graphs."
+    return format_tree(forest.forest_edges())
+
+
+def parse_tree(text: str):
+    """Рёбра остовного леса (u, v) из вывода задачи 3 (обратно format_tree)."""
+    lines = text.strip().splitlines()
+    return [tuple(map(int, line.split('-'))) for line in lines[1:]]
+
+
+def format_tree(edges) -> str:
+    """Формирует вывод задачи 3 по рёбрам остовного леса."""
     # Удаляем дубликаты и сортируем рёбра по формату эталона
     edges = sorted(set(edges))
-    result = ["Spanning tree:"]
+    result = [TREE_HEADER]
     for u, v in edges:
         result.append(f"{u}-{v}")
     return "\n".join(result) 
\ No newline at end of file
@@ -10,17 +10,27 @@
 - Периферийных вершин
 
 Алгоритмы:
-- Флойда-Уоршелла для вычисления кратчайших путей между всеми парами вершин
+- Пакетный битовый обход в ширину (по умолчанию), ограничивающие оценки
+  эксцентриситетов (Takes-Kosters), обход в ширину из каждой вершины или
+  алгоритм Флойда-Уоршелла для вычисления кратчайших расстояний
 - Вычисление эксцентриситета как максимального расстояния от вершины до других
 - Определение центра и периферии на основе эксцентриситетов
 
-Временная сложность: O(V^3) для алгоритма Флойда-Уоршелла
-Пространственная сложность: O(V^2)
+Временная сложность: O(V·E) для обходов в ширину (битовый обход - V/64 проходов
+по рёбрам), O(V^3) для Флойда-Уоршелла
+Пространственная сложность: O(V + E) для обходов в ширину, O(V^2) для Флойда-Уоршелла
 """
 
 from utils import Graph
+from utils.apsp import floyd_warshall as apsp_floyd_warshall
+from utils.eccentricity import (bitset_eccentricities, bounded_eccentricities, eccentricities,
+                                radius_and_diameter)
+import math
 import sys
 
+# Способы вычисления эксцентриситетов
+ENGINES = ('bitset', 'bounds', 'bfs', 'floyd')
+
 
 def floyd_warshall(graph: Graph):
     """
@@ -28,9 +38,9 @@ def floyd_warshall(graph: Graph):
     между всеми парами вершин.
     
     Алгоритм:
-    1. Инициализация матрицы расстояний
+    1. Инициализация матрицы расстояний (каждое ребро имеет длину 1)
     2. Для каждой промежуточной вершины k:
-       - Для каждой пары вершин (i, j):
+       - Для всех пар вершин (i, j) сразу (движок utils.apsp):
          - Если путь через k короче, обновляем расстояние
     
     Args:
@@ -39,28 +49,7 @@ def floyd_warshall(graph: Graph):
     Returns:
         матрица кратчайших расстояний между всеми парами вершин
     """
-    n = graph.size()
-    INF = float('inf')
-    dist = [[INF] * n for _ in range(n)]
-    
-    # Инициализация: расстояние до себя равно 0
-    for i in range(n):
-        dist[i][i] = 0
-    
-    # Инициализация: прямые рёбра
-    matrix = graph.adjacency_matrix()
-    for i in range(n):
-        for j in range(n):
-            if matrix[i][j] > 0:
-                dist[i][j] = 1  # Для неориентированного/не взвешенного графа
-    
-    # Основной цикл алгоритма Флойда-Уоршелла
-    for k in range(n):
-        for i in range(n):
-            for j in range(n):
-                if dist[i][k] + dist[k][j] < dist[i][j]:
-                    dist[i][j] = dist[i][k] + dist[k][j]
-    
+    dist, _ = apsp_floyd_warshall(graph.adjacency_matrix(), unit_weights=True, with_paths=False)
     return dist
 
 
@@ -78,7 +67,13 @@ def solve_task(graph: Graph, **kwargs) -> str:
     
     Args:
         graph: неориентированный граф для анализа
-        **kwargs: дополнительные параметры (не используются)
+        **kwargs: дополнительные параметры:
+            engine: 'bitset' (пакетный битовый обход в ширину, по умолчанию),
+                    'bounds' (ограничивающие оценки эксцентриситетов),
+                    'bfs' (обход в ширину из каждой вершины, параллельно)
+                    или 'floyd' (алгоритм Флойда-Уоршелла)
+            workers: количество процессов для engine='bfs'
+            stats: словарь для статистики engine='bounds' (число обходов 'sweeps')
         
     Returns:
         строка с результатом анализа в требуемом формате
@@ -110,20 +105,33 @@ def solve_task(graph: Graph, **kwargs) -> str:
     # Вычисляем степени всех вершин
     degrees = [len(graph.adjacency_list(i + 1)) for i in range(n)]
     
-    # Находим кратчайшие пути между всеми парами вершин
-    dist = floyd_warshall(graph)
+    engine = kwargs.get('engine', 'bitset')
+    if engine not in ENGINES:
+        raise ValueError(f"Неизвестный способ вычисления: {engine}")
     
     # Вычисляем эксцентриситет каждой вершины
-    eccentricity = []
-    for i in range(n):
-        row = dist[i]
-        # Проверяем, есть ли недостижимые вершины
-        if any(d == float('inf') and j != i for j, d in enumerate(row)):
-            eccentricity.append('+Infinity')
+    if engine != 'floyd':
+        offsets, targets, _ = graph.csr()
+        if engine == 'bitset':
+            values = bitset_eccentricities(offsets, targets)
+        elif engine == 'bounds':
+            values = bounded_eccentricities(offsets, targets, stats=kwargs.get('stats'))
         else:
-            # Эксцентриситет = максимальное расстояние до других вершин
-            max_dist = max([d for d in row if d < float('inf')])
-            eccentricity.append(max_dist)
+            values = eccentricities(offsets, targets, kwargs.get('workers'))
+        eccentricity = ['+Infinity' if e == math.inf else e for e in values]
+    else:
+        # Находим кратчайшие пути между всеми парами вершин
+        dist = floyd_warshall(graph)
+        eccentricity = []
+        for i in range(n):
+            row = dist[i]
+            # Проверяем, есть ли недостижимые вершины
+            if any(d == float('inf') and j != i for j, d in enumerate(row)):
+                eccentricity.append('+Infinity')
+            else:
+                # Эксцентриситет = максимальное расстояние до других вершин
+                max_dist = max([d for d in row if d < float('inf')])
+                eccentricity.append(max_dist)
     
     # Определяем радиус, диаметр, центральные и периферийные вершины
     if any(e == '+Infinity' for e in eccentricity):
@@ -132,8 +140,8 @@ def solve_task(graph: Graph, **kwargs) -> str:
         central = peripherial = list(range(1, n + 1))
     else:
         # Граф связный
-        D = max(eccentricity)  # Диаметр = максимальный эксцентриситет
-        R = min(eccentricity)  # Радиус = минимальный эксцентриситет
+        # Радиус = минимальный эксцентриситет, диаметр = максимальный
+        R, D = radius_and_diameter(eccentricity)
         
         # Центральные вершины имеют эксцентриситет R
         central = [i + 1 for i, e in enumerate(eccentricity) if e == R]
@@ -4,7 +4,9 @@
 Реализует алгоритм проверки двудольности с помощью раскраски в два цвета (BFS).
 
 Алгоритм:
-- BFS с раскраской вершин
+- BFS с раскраской вершин: цвет - чётность уровня обхода (utils.bfs, шаги
+  сверху вниз или снизу вверх); когда найден следующий уровень, все соседи
+  предыдущего уже раскрашены, и его дуги проверяются на одноцветность
 
 Временная сложность: O(V + E)
 Пространственная сложность: O(V)
@@ -15,34 +17,70 @@
     Partition 2: [2, 4, 6]
 """
 from utils import Graph
-from collections import deque
+from utils.bfs import FrontierBFS, gather_arcs
 import sys
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Уровни с меньшим числом дуг проверяются циклом Python: на путях и других
+# графах с большим диаметром уровни из одной-двух вершин, и накладные расходы
+# вызовов NumPy на каждом уровне в десятки раз больше самой проверки
+VECTOR_ARCS = 256
+
+
+def _has_monochromatic_arc(offsets, targets, color, vertices, arrays=None) -> bool:
+    """
+    Есть ли дуга из вершин vertices в вершину того же цвета.
+
+    arrays - те же offsets и targets в виде массивов NumPy (или None): по ним
+    проверяются уровни, у которых не меньше VECTOR_ARCS дуг.
+    """
+    if arrays is not None and (len(vertices) >= VECTOR_ARCS
+                               or sum(offsets[u + 1] - offsets[u] for u in vertices) >= VECTOR_ARCS):
+        offsets_array, targets_array = arrays
+        colors = np.frombuffer(color, dtype=np.uint8)
+        sources = np.asarray(vertices, dtype=np.int64)
+        arcs, counts = gather_arcs(offsets_array, sources)
+        return bool(np.any(colors[targets_array[arcs]] == np.repeat(colors[sources], counts)))
+    for u in vertices:
+        c = color[u]
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            if color[v] == c:
+                return True
+    return False
+
 
 def is_bipartite(graph: Graph):
+    offsets, targets, _ = graph.csr()
+    search = FrontierBFS(offsets, targets, symmetric=not graph.is_directed())
+    arrays = None
+    if np is not None:
+        arrays = np.asarray(offsets, dtype=np.int64), np.asarray(targets, dtype=np.int64)
     n = graph.size()
-    color = [-1] * n  # 0-индексация
+    color = bytearray(n)  # 0-индексация
     part1, part2 = [], []
     
-    for start in range(n):  # от 0 до n-1
-        if color[start] == -1:
-            queue = deque([start])
-            color[start] = 0
-            part1.append(start)
-            
-            while queue:
-                v = queue.popleft()
-                for u in graph.adjacency_list(v + 1):  # +1 для перехода к 1-индексации
-                    u = u - 1  # переводим обратно в 0-индексацию
-                    if color[u] == -1:
-                        color[u] = 1 - color[v]
-                        if color[u] == 0:
-                            part1.append(u)
-                        else:
-                            part2.append(u)
-                        queue.append(u)
-                    elif color[u] == color[v]:
-                        return False, [], []
+    for start in range(n):
+        if search.visited[start]:
+            continue
+        previous = None
+        for depth, level in enumerate(search.iter_levels(start)):
+            if depth % 2:
+                for v in level:
+                    color[v] = 1
+                part2.extend(level)
+            else:
+                part1.extend(level)
+            # Соседи предыдущего уровня теперь раскрашены
+            if previous is not None and _has_monochromatic_arc(offsets, targets, color, previous, arrays):
+                return False, [], []
+            previous = level
+        if _has_monochromatic_arc(offsets, targets, color, previous, arrays):
+            return False, [], []
     
     return True, sorted(part1), sorted(part2)
 
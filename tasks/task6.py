@@ -5,8 +5,10 @@
 
 Алгоритм:
 - Дейкстра с модификацией для учёта разности высот между соседними клетками
+- Очередь: двоичная куча heapq ('heap') или массив корзин Дейкстры-Диала ('dial')
 
-Временная сложность: O((V + E) log V), где V - количество вершин, E - количество рёбер
+Временная сложность: O((V + E) log V) для кучи, O(V + E + D) для корзин,
+где V - количество вершин, E - количество рёбер, D - длина кратчайшего пути
 Пространственная сложность: O(N*M)
 
 Пример вывода:
@@ -15,10 +17,27 @@
     [(1, 1), (1, 2), (2, 2), ..., (5, 5)]
 """
 from utils import Map
+from utils.distance_field import DistanceField
+from utils.map import as_map
+from utils.pathfinding import SearchStats, bidirectional_corridor, phase_timer
+from array import array
+from collections import Counter, defaultdict
+from itertools import repeat
 from typing import Tuple, List, Optional
 import re
 import heapq
 
+# Способы хранения очереди с приоритетом
+ALGORITHMS = ('heap', 'dial')
+DEFAULT_ALGORITHM = 'heap'
+
+# "Бесконечное" расстояние в массиве int32
+INF_COST = (1 << 31) - 1
+
+# С какого числа запросов с общим стартом find_paths строит поле расстояний
+# вместо отдельного поиска для каждой цели
+SHARED_START_QUERIES = 3
+
 
 def parse_points_from_answer(answer_file: str) -> Tuple[Tuple[int, int], Tuple[int, int]]:
     """Парсит координаты старта и финиша из файла-ответа (индексация рабочей области, без рамки)."""
@@ -32,53 +51,261 @@ def parse_points_from_answer(answer_file: str) -> Tuple[Tuple[int, int], Tuple[i
     return start, goal
 
 
-def shortest_path_with_heights(maze: Map, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+def shortest_path_with_heights(maze: Map, start: Tuple[int, int], goal: Tuple[int, int],
+                               algorithm: str = DEFAULT_ALGORITHM, bidirectional: bool = False,
+                               stats: Optional[SearchStats] = None) -> Optional[List[Tuple[int, int]]]:
     """Поиск кратчайшего пути с учётом высот с помощью алгоритма Дейкстры.
     
     Алгоритм находит кратчайший путь от старта до цели, учитывая:
     - Расстояние между соседними клетками (1 для горизонтальных/вертикальных, √2 для диагональных)
     - Разность высот между клетками (дополнительная стоимость)
+    
+    Поиск работает на номерах клеток Map: расстояния и предшественники - плоские
+    массивы int32, соседи - таблица Map.neighbor_table.
+    
+    Args:
+        algorithm: 'heap' (двоичная куча) или 'dial' (корзины по стоимости);
+                   оба варианта возвращают один и тот же путь
+        bidirectional: сначала двунаправленный Дейкстра (utils.pathfinding), затем
+                       поиск algorithm только по найденным им клеткам
+                       кратчайших путей; путь совпадает с однонаправленным
+        stats: счётчики поиска (SearchStats): раскрытые клетки, операции с
+               очередью, время этапов
     """
-    rows, cols = maze.size()
-    # Сдвигаем координаты для обращения к Map (матрица с рамкой)
-    s = (start[0], start[1])
-    g = (goal[0], goal[1])
-    dist = [[float('inf')] * cols for _ in range(rows)]
-    prev: List[List[Optional[Tuple[int, int]]]] = [[None] * cols for _ in range(rows)]
-    dist[s[0]][s[1]] = 0
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Неизвестный алгоритм: {algorithm}")
+    s = maze.cell_id(*start)
+    g = maze.cell_id(*goal)
+    with phase_timer(stats, 'connectivity'):
+        if not maze.connected(s, g):
+            return None  # Разные области: ответ по меткам областей без поиска
+    masks, table = maze.neighbor_table()
+    replay_stats = stats
+    if bidirectional:
+        with phase_timer(stats, 'bidirectional'):
+            masks = bidirectional_corridor(maze, s, g, stats=stats)
+        if masks is None:
+            return None
+        replay_stats = SearchStats() if stats is not None else None
+    search = _dijkstra_dial if algorithm == 'dial' else _dijkstra_heap
+    with phase_timer(stats, 'replay' if bidirectional else 'search'):
+        prev, dist = search(maze, s, g, masks, table, replay_stats)
+    if bidirectional and stats is not None:
+        stats.merge(replay_stats, as_replay=True)
+    return _restore_path(maze, prev, dist, s, g)
+
+
+def _dijkstra_heap(maze: Map, s: int, g: int, masks: bytearray, table: List[Tuple[int, ...]],
+                   stats: Optional[SearchStats]) -> Tuple[array, array]:
+    """Дейкстра на двоичной куче; возвращает массивы (prev, dist)."""
+    heights = maze.heights()
+    dist, prev = _search_arrays(maze)
+    dist[s] = 0
     heap = [(0, s)]
+    expanded = 0
+    pushes = peak = 1
+    pops = stale = 0
     while heap:
-        cost, (r, c) = heapq.heappop(heap)
-        if (r, c) == g:
+        if len(heap) > peak:
+            peak = len(heap)
+        cost, u = heapq.heappop(heap)
+        pops += 1
+        if u == g:
             break
-        for nr, nc in maze.neighbors(r, c):
-            step_cost = abs(nr - r) + abs(nc - c) + abs(maze[nr, nc] - maze[r, c])
-            new_cost = cost + step_cost
-            if new_cost < dist[nr][nc]:
-                dist[nr][nc] = new_cost
-                prev[nr][nc] = (r, c)
-                heapq.heappush(heap, (new_cost, (nr, nc)))
-    if dist[g[0]][g[1]] == float('inf'):
+        if cost > dist[u]:
+            stale += 1
+            continue  # Устаревшая запись
+        expanded += 1
+        height = heights[u]
+        for step in table[masks[u]]:
+            v = u + step
+            new_cost = cost + 1 + abs(heights[v] - height)
+            if new_cost < dist[v]:
+                dist[v] = new_cost
+                prev[v] = u
+                heapq.heappush(heap, (new_cost, v))
+                pushes += 1
+    if stats is not None:
+        stats.forward_expanded += expanded
+        stats.count_queue(pushes, pops, stale, peak)
+    return prev, dist
+
+
+def _search_arrays(maze: Map):
+    """
+    Массивы расстояний и предшественников для поиска: плоские int32 или, для
+    карты в mmap (Map.is_mapped), словари только по достигнутым клеткам.
+    """
+    if maze.is_mapped():
+        return defaultdict(repeat(INF_COST).__next__), defaultdict(repeat(-1).__next__)
+    n = maze.size()[0] * maze.size()[1]
+    return array('i', [INF_COST]) * n, array('i', [-1]) * n
+
+
+def _restore_path(maze: Map, prev: array, dist: array, s: int, g: int) -> Optional[List[Tuple[int, int]]]:
+    """Восстанавливает путь из s в g по массиву предшественников (None, если пути нет)."""
+    if dist[g] == INF_COST:
         return None
-    # Восстановление пути
     path = []
     cur = g
-    while cur is not None and cur != s:
-        path.append((cur[0], cur[1]))  # Без +1
-        cur = prev[cur[0]][cur[1]]
-    if cur is None:
-        return None
-    path.append((s[0], s[1]))
+    while cur != s:
+        path.append(maze.position(cur))
+        cur = prev[cur]
+    path.append(maze.position(s))
     path.reverse()
-    if path[-1] != (g[0], g[1]):
-        path.append((g[0], g[1]))
     return path
 
 
-def solve_task(maze_file: str, answer_file: str, **kwargs) -> str:
-    maze = Map(maze_file)
+def shortest_path_dial(maze: Map, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+    """Алгоритм Дейкстры с очередью Диала (массив корзин по стоимости)."""
+    return shortest_path_with_heights(maze, start, goal, 'dial')
+
+
+def _dijkstra_dial(maze: Map, s: int, g: int, masks: bytearray, table: List[Tuple[int, ...]],
+                   stats: Optional[SearchStats]) -> Tuple[array, array]:
+    """Дейкстра с очередью Диала; возвращает массивы (prev, dist).
+    
+    Стоимость шага - целое число от 1 до C = 1 + (max высота - min высота), поэтому
+    хватает C + 1 корзин, используемых по кругу. Расстояния и предшественники
+    хранятся в плоских массивах int32 по номеру клетки r * cols + c (Map.cell_id).
+    
+    Клетки одной корзины обрабатываются в порядке возрастания номера - так же,
+    как куча извлекает пары (стоимость, (r, c)), поэтому путь совпадает с
+    вариантом на куче.
+    """
+    heights = maze.heights()
+    dist, prev = _search_arrays(maze)
+    dist[s] = 0
+    low, high = maze.height_range()
+    ring = 2 + high - low
+    buckets = [[] for _ in range(ring)]
+    buckets[0].append(s)
+    pending = 1
+    cost = 0
+    expanded = 0
+    found = False
+    pushes = peak = 1
+    pops = stale = 0
+    while pending and not found:
+        slot = cost % ring
+        bucket = buckets[slot]
+        if bucket:
+            if pending > peak:
+                peak = pending
+            buckets[slot] = []
+            pending -= len(bucket)
+            bucket.sort()
+            for u in bucket:
+                pops += 1
+                if dist[u] != cost:
+                    stale += 1
+                    continue  # Устаревшая запись: клетка уже обработана дешевле
+                if u == g:
+                    found = True
+                    break
+                expanded += 1
+                height = heights[u]
+                for step in table[masks[u]]:
+                    v = u + step
+                    new_cost = cost + 1 + abs(heights[v] - height)
+                    if new_cost < dist[v]:
+                        dist[v] = new_cost
+                        prev[v] = u
+                        buckets[new_cost % ring].append(v)
+                        pending += 1
+                        pushes += 1
+        cost += 1
+    if stats is not None:
+        stats.forward_expanded += expanded
+        stats.count_queue(pushes, pops, stale, peak)
+    return prev, dist
+
+
+def distance_field(maze: Map, start: Tuple[int, int], algorithm: str = DEFAULT_ALGORITHM,
+                   stats: Optional[SearchStats] = None) -> DistanceField:
+    """
+    Полный проход Дейкстры от start: расстояния и предшественники для всех клеток.
+    
+    Путь DistanceField.path(goal) совпадает с shortest_path_with_heights(maze,
+    start, goal, algorithm): поиск до цели останавливается, когда её
+    предшественник уже окончательный, а полный проход его не меняет.
+    
+    Args:
+        algorithm: 'heap' или 'dial'
+        stats: счётчики раскрытых клеток (SearchStats)
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Неизвестный алгоритм: {algorithm}")
+    rows, cols = maze.size()
+    masks, table = maze.neighbor_table()
+    search = _dijkstra_dial if algorithm == 'dial' else _dijkstra_heap
+    s = maze.cell_id(*start)
+    with phase_timer(stats, 'search'):
+        prev, dist = search(maze, s, -1, masks, table, stats)  # Цель -1 не встретится: обход всей карты
+    if maze.is_mapped():
+        # Словари поиска по карте в mmap -> плоские массивы поля
+        dense_dist = array('i', [INF_COST]) * (rows * cols)
+        dense_prev = array('i', [-1]) * (rows * cols)
+        for cell, cost in dist.items():
+            dense_dist[cell] = cost
+            dense_prev[cell] = prev[cell]
+        dist, prev = dense_dist, dense_prev
+    return DistanceField(rows, cols, s, dist, prev, maze.version())
+
+
+def find_paths(maze_source, queries: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+               algorithm: str = DEFAULT_ALGORITHM, bidirectional: bool = False,
+               stats: Optional[SearchStats] = None) -> List[Optional[List[Tuple[int, int]]]]:
+    """
+    Пакетный поиск путей в одном лабиринте.
+    
+    Для старта, общего хотя бы для SHARED_START_QUERIES запросов, строится одно
+    поле расстояний (distance_field), и пути до всех его целей восстанавливаются
+    без повторного поиска (кроме двунаправленного режима).
+    
+    Args:
+        maze_source: объект Map или путь к файлу (загружается один раз через кэш load_map)
+        queries: список пар (start, goal)
+        algorithm: 'heap' или 'dial'
+        bidirectional: двунаправленный режим (см. shortest_path_with_heights)
+        stats: счётчики раскрытых клеток, суммируются по всем запросам
+        
+    Returns:
+        список путей (None, если пути нет) в порядке запросов
+    """
+    maze = as_map(maze_source)
+    fields = {}
+    if not bidirectional:
+        shared = Counter(start for start, _ in queries)
+        fields = {start: None for start, count in shared.items() if count >= SHARED_START_QUERIES}
+    results = []
+    for start, goal in queries:
+        if start in fields:
+            if fields[start] is None:
+                fields[start] = distance_field(maze, start, algorithm, stats)
+            results.append(fields[start].path(goal))
+        else:
+            results.append(shortest_path_with_heights(maze, start, goal, algorithm, bidirectional, stats))
+    return results
+
+
+def solve_task(maze_file, answer_file: str, **kwargs) -> str:
+    """
+    Args:
+        maze_file: путь к файлу лабиринта (загружается через кэш) или объект Map
+        **kwargs: algorithm - 'heap' (по умолчанию) или 'dial',
+                  bidirectional - двунаправленный режим, stats - SearchStats
+    """
+    maze = as_map(maze_file)
     start, goal = parse_points_from_answer(answer_file)
-    path = shortest_path_with_heights(maze, start, goal)
+    path, = find_paths(maze, [(start, goal)], kwargs.get('algorithm', DEFAULT_ALGORITHM),
+                       kwargs.get('bidirectional', False), kwargs.get('stats'))
+    return format_result(maze, start, goal, path)
+
+
+def format_result(maze: Map, start: Tuple[int, int], goal: Tuple[int, int],
+                  path: Optional[List[Tuple[int, int]]]) -> str:
+    """Формирует вывод: длина пути и сам путь (длинный путь - рисунком лабиринта)."""
     if path is None:
         return "No path found"
     result = []
@@ -0,0 +1,179 @@
+"""
+Кратчайшие пути между всеми парами вершин (all-pairs shortest paths).
+
+Алгоритм Флойда-Уоршелла, в котором шаг по промежуточной вершине k
+выполняется сразу для всей матрицы:
+    D = min(D, D[:, k, None] + D[None, k, :])
+и в том же шаге обновляется матрица nxt для восстановления путей.
+
+Если установлен NumPy, матрица расстояний хранится в непрерывном массиве int32
+(неотрицательные веса) или float64, матрица nxt - в int32; иначе используется построчный вариант на списках (внутренний цикл по j заменён
+операциями над целой строкой).
+
+Результат совпадает с классическим тройным циклом для графов без циклов
+отрицательного веса: конечные расстояния - int, недостижимые - math.inf.
+
+Временная сложность: O(V^3)
+Пространственная сложность: O(V^2)
+"""
+
+from itertools import compress, repeat
+from operator import add, lt
+from typing import List, Optional, Tuple
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# "Бесконечность" для матрицы int32: сумма двух таких значений не переполняет int32
+INT32_INF = (1 << 30) - 1
+
+# Если улучшилось меньше 1/SPARSE_UPDATE_RATIO ячеек, nxt обновляется по маске
+SPARSE_UPDATE_RATIO = 16
+
+
+def floyd_warshall(adj: List[List[int]], unit_weights: bool = False,
+                   with_paths: bool = True) -> Tuple[List[List[float]], Optional[List[List[int]]]]:
+    """
+    Вычисляет кратчайшие расстояния между всеми парами вершин.
+
+    Args:
+        adj: матрица смежности n×n (0 - нет дуги)
+        unit_weights: считать вес каждой дуги с положительным весом равным 1
+                      (расстояние в рёбрах), дуги с неположительным весом игнорируются
+        with_paths: вычислять матрицу nxt для восстановления путей
+
+    Returns:
+        кортеж (dist, nxt): dist[i][j] - длина кратчайшего пути (int или math.inf),
+        nxt[i][j] - следующая вершина на пути из i в j (-1, если пути нет);
+        nxt равен None при with_paths=False
+    """
+    if np is not None:
+        return _floyd_warshall_numpy(adj, unit_weights, with_paths)
+    return _floyd_warshall_rows(adj, unit_weights, with_paths)
+
+
+def _initial_rows(adj: List[List[int]], unit_weights: bool) -> List[List[float]]:
+    """Начальная матрица расстояний: веса дуг, 0 на диагонали, math.inf без дуги."""
+    n = len(adj)
+    inf = math.inf
+    if unit_weights:
+        dist = [[1 if w > 0 else inf for w in row] for row in adj]
+    else:
+        dist = [[w if w != 0 else inf for w in row] for row in adj]
+    for i in range(n):
+        dist[i][i] = 0
+    return dist
+
+
+def _floyd_warshall_rows(adj: List[List[int]], unit_weights: bool,
+                         with_paths: bool) -> Tuple[List[List[float]], Optional[List[List[int]]]]:
+    """Построчный вариант на списках Python."""
+    n = len(adj)
+    inf = math.inf
+    dist = _initial_rows(adj, unit_weights)
+    indices = range(n)
+    nxt = None
+    if with_paths:
+        nxt = [[j if d != inf else -1 for j, d in enumerate(row)] for row in dist]
+
+    for k in range(n):
+        row_k = dist[k]
+        for i in range(n):
+            d_ik = dist[i][k]
+            if d_ik == inf:
+                continue
+            row_i = dist[i]
+            via_k = list(map(add, repeat(d_ik), row_k))
+            improved = list(compress(indices, map(lt, via_k, row_i)))
+            if not improved:
+                continue
+            for j in improved:
+                row_i[j] = via_k[j]
+            if with_paths:
+                step = nxt[i][k]
+                nxt_i = nxt[i]
+                for j in improved:
+                    nxt_i[j] = step
+    return dist, nxt
+
+
+def _floyd_warshall_numpy(adj: List[List[int]], unit_weights: bool,
+                          with_paths: bool) -> Tuple[List[List[float]], Optional[List[List[int]]]]:
+    """
+    Векторизованный вариант: каждая итерация по k - несколько операций над всей матрицей.
+
+    При неотрицательных весах, если любой путь короче INT32_INF, матрица хранится
+    в int32 (вдвое меньше памяти и трафика), иначе - в float64 с np.inf.
+    """
+    n = len(adj)
+    weights = np.array(adj, dtype=np.int64).reshape(n, n)
+    edges = weights > 0 if unit_weights else weights != 0
+    if unit_weights:
+        weights = edges.astype(np.int64)
+    max_weight = int(np.abs(weights).max()) if n else 0
+    if (unit_weights or not (weights < 0).any()) and max_weight * max(n - 1, 1) < INT32_INF:
+        dtype, inf = np.int32, INT32_INF
+    else:
+        dtype, inf = np.float64, np.inf
+    dist = np.full((n, n), inf, dtype=dtype)
+    dist[edges] = weights[edges]
+    np.fill_diagonal(dist, 0)
+
+    nxt = None
+    if with_paths:
+        nxt = np.where(dist != inf, np.arange(n, dtype=np.int32)[None, :], np.int32(-1))
+        nxt = np.ascontiguousarray(nxt, dtype=np.int32)
+
+    # Буферы переиспользуются на всех итерациях, чтобы не выделять память n раз
+    via_k = np.empty_like(dist)
+    improved = np.empty((n, n), dtype=bool)
+    delta = np.empty((n, n), dtype=np.int32)
+    column = np.empty((n, 1), dtype=dtype)
+    step = np.empty((n, 1), dtype=np.int32)
+    for k in range(n):
+        column[:, 0] = dist[:, k]
+        rows = np.flatnonzero(column[:, 0] != inf)
+        if rows.size * 2 < n:
+            # Путь через k есть лишь у немногих строк - обновляем только их
+            _relax_rows(dist, nxt, rows, k)
+            continue
+        np.add(column, dist[None, k, :], out=via_k)
+        np.less(via_k, dist, out=improved)
+        improved_count = np.count_nonzero(improved)
+        if not improved_count:
+            continue
+        np.minimum(dist, via_k, out=dist)
+        if not with_paths:
+            continue
+        # nxt[i][j] = nxt[i][k] там, где путь через k короче
+        step[:, 0] = nxt[:, k]
+        if improved_count * SPARSE_UPDATE_RATIO < n * n:
+            np.copyto(nxt, step, where=improved)
+        else:
+            # Плотное обновление без ветвлений: nxt += (step - nxt) * improved
+            np.subtract(step, nxt, out=delta)
+            np.multiply(delta, improved, out=delta)
+            np.add(nxt, delta, out=nxt)
+
+    unreachable = dist >= inf
+    rows = np.where(unreachable, 0, dist).astype(np.int64).astype(object)
+    rows[unreachable] = math.inf
+    return rows.tolist(), (nxt.tolist() if with_paths else None)
+
+
+def _relax_rows(dist, nxt, rows, k: int):
+    """Шаг k алгоритма только для строк rows, у которых dist[i][k] конечно."""
+    block = dist[rows]
+    via_k = block[:, k, None] + dist[None, k, :]
+    improved = via_k < block
+    if not improved.any():
+        return
+    np.minimum(block, via_k, out=block)
+    dist[rows] = block
+    if nxt is not None:
+        nxt_block = nxt[rows]
+        np.copyto(nxt_block, nxt_block[:, k, None].copy(), where=improved)
+        nxt[rows] = nxt_block
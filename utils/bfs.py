@@ -0,0 +1,310 @@
+"""
+Обход в ширину с выбором направления на каждом уровне (Beamer и др.).
+
+Обычный шаг «сверху вниз» просматривает дуги всех вершин фронта. На графах
+с малым диаметром средние уровни содержат большую часть вершин, и почти все
+эти дуги ведут в уже посещённые вершины. Шаг «снизу вверх» наоборот
+перебирает ещё не посещённые вершины и ищет среди их соседей вершину фронта;
+поиск для вершины прекращается на первом найденном соседе. Посещённые вершины
+отмечаются в карте bytearray, фронт - в массиве позиций (-1 - вне фронта),
+поэтому обе проверки стоят одно обращение по индексу.
+
+Битовых карт фронта, как в работе Beamer и др., здесь нет. Шагу снизу вверх
+нужна не только принадлежность соседа фронту, но и его позиция во фронте:
+по ней восстанавливается порядок очереди (ordered=True) и находится предок.
+Кроме того, в Python проверка бита (сдвиг и маска) дороже обращения к байту,
+а выигрыш битовой карты в кэше процессора за интерпретатором не виден.
+
+Направление выбирается по объёму работы: снизу вверх, когда дуги фронта m_f
+превышают (m_u + n_u) / ALPHA (m_u и n_u - дуги и число непосещённых вершин
+с ненулевой степенью), и обратно сверху вниз, когда фронт уменьшается до
+n / BETA вершин. Шаг снизу вверх требует
+симметричных списков смежности, поэтому для орграфов все шаги - сверху вниз.
+
+В упорядоченном режиме (ordered=True) обход воспроизводит очередь обычного
+BFS: предок вершины - первая в порядке фронта смежная вершина, а вершины
+уровня идут в порядке (позиция предка во фронте, позиция вершины в списке
+смежности предка). Ранний выход тогда невозможен, и снизу вверх выполняется
+только шаг, в котором дуг непосещённых вершин меньше, чем дуг фронта.
+"""
+
+from array import array
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Порог перехода сверху вниз -> снизу вверх: m_f > (m_u + n_u) / ALPHA.
+# В работе Beamer и др. ALPHA = 14; для циклов Python по замерам bench.py bfs
+# выгоднее 4: шаг снизу вверх дороже в пересчёте на вершину
+ALPHA = 4
+
+# Порог обратного перехода: фронт меньше n / BETA вершин
+BETA = 24
+
+# С NumPy шаг снизу вверх просматривает все дуги непосещённых вершин одной
+# векторной операцией; дуга в нём дешевле дуги в цикле Python примерно во
+# столько раз, и шаг выбирается при m_f * NUMPY_ARC_RATIO > m_u + n_u
+NUMPY_ARC_RATIO = 10
+
+
+def gather_arcs(offsets, vertices):
+    """
+    Номера дуг вершин vertices подряд (массивы NumPy).
+
+    Args:
+        offsets: массив NumPy offsets графа в CSR-форме
+        vertices: массив NumPy номеров вершин
+
+    Returns:
+        кортеж (номера дуг, число дуг каждой вершины)
+    """
+    starts = offsets[vertices]
+    counts = offsets[vertices + 1] - starts
+    segments = np.cumsum(counts) - counts
+    return np.arange(int(counts.sum())) + np.repeat(starts - segments, counts), counts
+
+
+class FrontierBFS:
+    """
+    Обходы в ширину из нескольких стартов по массивам CSR с общим множеством
+    посещённых вершин (каждый обход находит ещё не посещённую часть графа).
+
+    После обходов parent[v] - предок вершины v в лесе обхода (-1 для стартов
+    и непосещённых вершин), steps - число шагов каждого направления.
+    """
+
+    def __init__(self, offsets: Sequence[int], targets: Sequence[int], symmetric: bool,
+                 ordered: bool = False):
+        """
+        Args:
+            offsets, targets: граф в CSR-форме (0-индексация), например из Graph.csr()
+            symmetric: списки смежности симметричны (неориентированный граф);
+                       иначе используются только шаги сверху вниз
+            ordered: воспроизводить порядок очереди обычного BFS (см. модуль)
+        """
+        n = len(offsets) - 1
+        self._offsets = offsets
+        self._targets = targets
+        self._symmetric = symmetric
+        self._ordered = ordered
+        self.visited = bytearray(n)
+        self.parent = array('i', [-1]) * n
+        self.steps: Dict[str, int] = {'top_down': 0, 'bottom_up': 0}
+        # Непосещённые вершины с ненулевой степенью (список сжимается в шагах
+        # снизу вверх; изолированные вершины снизу вверх не находятся) и их дуги
+        if np is not None:
+            self._offsets_array = np.asarray(offsets, dtype=np.int64)
+            self._targets_array = np.asarray(targets)
+            self._visited_array = np.frombuffer(self.visited, dtype=np.uint8)
+            self._parent_array = np.frombuffer(self.parent, dtype=np.int32)
+            # Строки CSR упорядочены по номерам соседей: порядок вершин в строке
+            # предка - порядок номеров (иначе порядок очереди восстанавливается
+            # просмотром строк, см. _queue_order)
+            self._rows_sorted = False
+            if ordered:
+                inner = np.ones(len(targets), dtype=bool)
+                inner[self._offsets_array[:-1][np.diff(self._offsets_array) > 0]] = False
+                self._rows_sorted = bool(np.all(np.diff(self._targets_array)[inner[1:]] >= 0))
+            self._unvisited = np.flatnonzero(np.diff(self._offsets_array))
+            # Позиция вершины в текущем фронте (n - не во фронте)
+            self._rank = np.full(n, n, dtype=np.int64)
+        else:
+            self._unvisited = [v for v in range(n) if offsets[v + 1] > offsets[v]]
+            # Позиция вершины в текущем фронте (-1 - не во фронте)
+            self._rank = array('i', [-1]) * n
+        self._unvisited_arcs = len(targets)
+        self._unvisited_count = len(self._unvisited)
+
+    def traverse(self, source: int) -> List[List[int]]:
+        """
+        Обход из непосещённой вершины source.
+
+        Returns:
+            уровни обхода: списки вершин на расстоянии 0, 1, 2, ... от source
+        """
+        return list(self.iter_levels(source))
+
+    def iter_levels(self, source: int) -> Iterator[List[int]]:
+        """
+        Обход из непосещённой вершины source по одному уровню: следующий
+        уровень вычисляется, когда запрошен (можно прервать обход досрочно).
+        """
+        offsets = self._offsets
+        n = len(offsets) - 1
+        self.visited[source] = 1
+        frontier = [source]
+        frontier_arcs = self._discount(frontier)
+        yield frontier
+        bottom_up = False
+        while True:
+            if self._symmetric:
+                unvisited_work = self._unvisited_arcs + self._unvisited_count
+                if np is not None:
+                    bottom_up = frontier_arcs * NUMPY_ARC_RATIO > unvisited_work
+                elif self._ordered:
+                    bottom_up = frontier_arcs > unvisited_work
+                elif bottom_up:
+                    bottom_up = len(frontier) >= n / BETA
+                else:
+                    bottom_up = frontier_arcs > unvisited_work / ALPHA
+            if bottom_up:
+                self.steps['bottom_up'] += 1
+                frontier = self._bottom_up(frontier)
+            else:
+                self.steps['top_down'] += 1
+                frontier = self._top_down(frontier)
+            if not frontier:
+                return
+            frontier_arcs = self._discount(frontier)
+            yield frontier
+
+    def _discount(self, vertices: List[int]) -> int:
+        """
+        Исключает только что посещённые вершины из оценки работы шага снизу вверх.
+
+        Returns:
+            число дуг вершин vertices (дуги фронта для выбора следующего шага)
+        """
+        offsets = self._offsets
+        arcs = count = 0
+        for v in vertices:
+            degree = offsets[v + 1] - offsets[v]
+            if degree:
+                arcs += degree
+                count += 1
+        self._unvisited_arcs -= arcs
+        self._unvisited_count -= count
+        return arcs
+
+    def traverse_all(self) -> List[List[List[int]]]:
+        """
+        Обходит все непосещённые вершины: каждый обход начинается с наименьшей
+        из них.
+
+        Returns:
+            уровни обходов (см. traverse) в порядке стартовых вершин
+        """
+        visited = self.visited
+        return [self.traverse(source) for source in range(len(visited)) if not visited[source]]
+
+    def _top_down(self, frontier: List[int]) -> List[int]:
+        """Шаг сверху вниз: непосещённые соседи вершин фронта в порядке очереди."""
+        offsets, targets = self._offsets, self._targets
+        visited, parent = self.visited, self.parent
+        next_frontier = []
+        for u in frontier:
+            for v in targets[offsets[u]:offsets[u + 1]]:
+                if not visited[v]:
+                    visited[v] = 1
+                    parent[v] = u
+                    next_frontier.append(v)
+        return next_frontier
+
+    def _bottom_up(self, frontier: List[int]) -> List[int]:
+        """Шаг снизу вверх: непосещённые вершины, смежные с фронтом."""
+        if np is not None:
+            positions, vertices = self._scan_numpy(frontier)
+            self._visited_array[vertices] = 1
+            self._parent_array[vertices] = np.asarray(frontier, dtype=np.int32)[positions]
+            if not self._ordered:
+                return vertices.tolist()
+            if self._rows_sorted:
+                return vertices[np.argsort(positions, kind='stable')].tolist()
+            return self._queue_order(frontier, list(zip(positions.tolist(), vertices.tolist())))
+        found = self._scan(frontier)
+        visited, parent = self.visited, self.parent
+        for position, v in found:
+            visited[v] = 1
+            parent[v] = frontier[position]
+        if not self._ordered:
+            return [v for _, v in found]
+        return self._queue_order(frontier, found)
+
+    def _scan_numpy(self, frontier: List[int]):
+        """
+        Шаг снизу вверх одной векторной операцией: для каждой непосещённой
+        вершины - наименьшая позиция смежной вершины во фронте.
+
+        Returns:
+            массивы (позиции предков во фронте, вершины) по возрастанию вершин
+        """
+        rank = self._rank
+        n = len(rank)
+        unvisited = self._unvisited
+        unvisited = unvisited[self._visited_array[unvisited] == 0]
+        if not len(unvisited):
+            self._unvisited = unvisited
+            return unvisited, unvisited
+        frontier_array = np.asarray(frontier, dtype=np.int64)
+        rank[frontier_array] = np.arange(len(frontier_array))
+        # У каждой непосещённой вершины списка есть дуги, поэтому начала
+        # отрезков для reduceat строго возрастают
+        arcs, counts = gather_arcs(self._offsets_array, unvisited)
+        best = np.minimum.reduceat(rank[self._targets_array[arcs]], np.cumsum(counts) - counts)
+        rank[frontier_array] = n
+        hit = best < n
+        self._unvisited = unvisited[~hit]
+        return best[hit], unvisited[hit]
+
+    def _scan(self, frontier: List[int]) -> List[Tuple[int, int]]:
+        """Шаг снизу вверх циклами Python (без NumPy), см. _scan_numpy."""
+        offsets, targets = self._offsets, self._targets
+        visited, rank = self.visited, self._rank
+        for position, u in enumerate(frontier):
+            rank[u] = position
+        found = []
+        remaining = []
+        if self._ordered:
+            for v in self._unvisited:
+                if visited[v]:
+                    continue
+                best = -1
+                for u in targets[offsets[v]:offsets[v + 1]]:
+                    position = rank[u]
+                    if position >= 0 and (best < 0 or position < best):
+                        best = position
+                if best >= 0:
+                    found.append((best, v))
+                else:
+                    remaining.append(v)
+        else:
+            for v in self._unvisited:
+                if visited[v]:
+                    continue
+                for u in targets[offsets[v]:offsets[v + 1]]:
+                    if rank[u] >= 0:
+                        found.append((rank[u], v))
+                        break
+                else:
+                    remaining.append(v)
+        for u in frontier:
+            rank[u] = -1
+        self._unvisited = remaining
+        return found
+
+    def _queue_order(self, frontier: List[int], found: List[Tuple[int, int]]) -> List[int]:
+        """Вершины уровня в порядке очереди BFS: по предку, затем по списку смежности предка."""
+        offsets, targets = self._offsets, self._targets
+        found.sort()
+        next_frontier = []
+        start = 0
+        while start < len(found):
+            position = found[start][0]
+            stop = start
+            while stop < len(found) and found[stop][0] == position:
+                stop += 1
+            if stop - start == 1:
+                next_frontier.append(found[start][1])
+            else:
+                children = {v for _, v in found[start:stop]}
+                u = frontier[position]
+                for v in targets[offsets[u]:offsets[u + 1]]:
+                    if v in children:
+                        next_frontier.append(v)
+                        children.discard(v)
+            start = stop
+        return next_frontier
+
@@ -0,0 +1,264 @@
+"""
+Мосты, шарниры и блоки (компоненты двусвязности) алгоритмом Тарьяна.
+
+Обход в глубину выполняется без рекурсии: стек хранит путь от корня, а для
+каждой вершины - позицию следующей дуги в её строке CSR (массив position).
+Порядок обхода совпадает с рекурсивным DFS по спискам смежности, поэтому
+мосты находятся в том же порядке (при возврате из потомка).
+
+Ребро в обратную сторону по дереву распознаётся по номеру ребра, а не по
+вершине-предку: у каждой дуги есть номер ребра (обе записи ребра u - v
+неориентированного графа получают один номер), и пропускается только дуга
+с номером ребра дерева. Поэтому второе из кратных рёбер u - v считается
+обратным, и такое ребро не является мостом.
+
+За тот же проход дуги дерева и обратные дуги складываются в стек рёбер; когда
+low[v] >= disc[u] для дуги дерева u -> v, рёбра стека до неё включительно
+образуют блок. Дерево блоков и шарниров (block-cut tree) соединяет каждый блок
+с его вершинами-шарнирами.
+"""
+
+from array import array
+from bisect import bisect_right
+from itertools import compress, islice
+from operator import gt
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def edge_ids(offsets: Sequence[int], targets: Sequence[int]) -> array:
+    """
+    Номера рёбер для дуг графа в CSR-форме.
+
+    k-я дуга u -> v (в порядке строк) и k-я дуга v -> u получают один номер,
+    дуги без пары и петли - собственные номера. Номера лежат в 0..m-1, но
+    идут не подряд.
+
+    Args:
+        offsets, targets: граф в CSR-форме (0-индексация), например из Graph.csr()
+
+    Returns:
+        массив array('i'): номер ребра каждой дуги
+    """
+    m = len(targets)
+    if np is not None and m:
+        offsets_array = np.asarray(offsets, dtype=np.int64)
+        sources = np.repeat(np.arange(len(offsets_array) - 1), np.diff(offsets_array))
+        heads = np.asarray(targets, dtype=np.int64)
+        low, high = np.minimum(sources, heads), np.maximum(sources, heads)
+        reverse = sources > heads
+        # Дуги одного неупорядоченного ребра подряд: сначала прямые (из меньшей
+        # вершины, в порядке строк), затем обратные
+        order = np.lexsort((reverse, high, low))
+        key_low, key_high, key_reverse = low[order], high[order], reverse[order]
+        group = np.ones(m, dtype=bool)
+        group[1:] = (key_low[1:] != key_low[:-1]) | (key_high[1:] != key_high[:-1])
+        direction = group.copy()
+        direction[1:] |= key_reverse[1:] != key_reverse[:-1]
+        positions = np.arange(m)
+        group_start = np.maximum.accumulate(np.where(group, positions, 0))
+        direction_start = np.maximum.accumulate(np.where(direction, positions, 0))
+        # k-я дуга направления получает номер (начало группы + k): у k-х прямой
+        # и обратной дуг номера совпадают, остальные различны
+        values = np.empty(m, dtype=np.int32)
+        values[order] = group_start + positions - direction_start
+        return array('i', values.tobytes())
+    if _rows_sorted(offsets, targets):
+        return array('i', _pair_arcs(offsets, targets))
+    # Строки в порядке файла: пары ищутся в устойчиво отсортированных копиях строк
+    order: List[int] = []
+    for u in range(len(offsets) - 1):
+        order.extend(sorted(range(offsets[u], offsets[u + 1]), key=targets.__getitem__))
+    paired = _pair_arcs(offsets, list(map(targets.__getitem__, order)))
+    ids = array('i', [0]) * m
+    for position, arc in enumerate(order):
+        ids[arc] = order[paired[position]]
+    return ids
+
+
+def _rows_sorted(offsets: Sequence[int], targets: Sequence[int]) -> bool:
+    """Строки targets не убывают: каждое убывание соседних дуг - граница строк."""
+    starts = set(offsets)
+    descents = compress(range(1, len(targets)), map(gt, targets, islice(targets, 1, None)))
+    return all(map(starts.__contains__, descents))
+
+
+def _pair_arcs(offsets: Sequence[int], targets: Sequence[int]) -> List[int]:
+    """
+    Номера рёбер для CSR с неубывающими строками за один проход по дугам.
+
+    Прямая дуга u -> v (u < v) получает собственный номер. Вершины u
+    просматриваются по возрастанию, поэтому обратные дуги v -> u встречаются в
+    строке v в том же порядке: для каждой строки хранится позиция первой ещё не
+    сопоставленной дуги, и k-я дуга u -> v находит k-ю дугу v -> u сравнением
+    на этой позиции, без поиска.
+    """
+    offsets, targets = list(offsets), list(targets)
+    ids = list(range(len(targets)))
+    cursor = offsets[:]
+    for u in range(len(offsets) - 1):
+        end = offsets[u + 1]
+        for arc in range(bisect_right(targets, u, offsets[u], end), end):
+            v = targets[arc]
+            p = cursor[v]
+            if p < offsets[v + 1] and targets[p] == u:
+                ids[p] = arc
+                cursor[v] = p + 1
+                continue
+            # Дуги v -> w с w < u без пары (орграф) пропускаются
+            stop = offsets[v + 1]
+            while p < stop and targets[p] < u:
+                p += 1
+            if p < stop and targets[p] == u:
+                ids[p] = arc
+                p += 1
+            cursor[v] = p
+    return ids
+
+
+class Biconnectivity:
+    """
+    Результат алгоритма Тарьяна (вершины с 0).
+
+    Attributes:
+        bridges: мосты (u, v) - дуги дерева обхода в порядке нахождения
+        cut_vertices: шарниры по возрастанию
+        block_arcs: блоки - списки номеров дуг CSR, по одной на ребро, в порядке
+                    нахождения (изолированные вершины блоков не образуют)
+    """
+
+    def __init__(self, offsets: Sequence[int], targets: Sequence[int]):
+        self._offsets = offsets
+        self._targets = targets
+        self.bridges: List[Tuple[int, int]] = []
+        self.cut_vertices: List[int] = []
+        self.block_arcs: List[List[int]] = []
+
+    def blocks(self) -> List[List[Tuple[int, int]]]:
+        """Рёбра каждого блока - дуги (u, v) в порядке обхода."""
+        if not self.block_arcs:
+            return []
+        sources, targets = _arc_sources(self._offsets), self._targets
+        return [[(sources[arc], targets[arc]) for arc in block] for block in self.block_arcs]
+
+    def block_vertices(self) -> List[List[int]]:
+        """Вершины каждого блока по возрастанию."""
+        return [sorted({vertex for edge in block for vertex in edge}) for block in self.blocks()]
+
+    def block_cut_tree(self) -> List[Tuple[int, int]]:
+        """
+        Рёбра дерева блоков и шарниров (лес для несвязного графа).
+
+        Returns:
+            пары (номер блока, шарнир) по возрастанию
+        """
+        cut = set(self.cut_vertices)
+        return [(index, vertex) for index, vertices in enumerate(self.block_vertices())
+                for vertex in vertices if vertex in cut]
+
+
+def biconnected_components(offsets: Sequence[int], targets: Sequence[int],
+                           ids: Optional[Sequence[int]] = None) -> Biconnectivity:
+    """
+    Мосты, шарниры и блоки за один обход в глубину по массивам CSR.
+
+    Обходы начинаются с непосещённых вершин по возрастанию, соседи
+    просматриваются в порядке строк CSR. Для орграфа дуги обходятся только по
+    направлению (результат совпадает с рекурсивным вариантом по спискам
+    смежности, но смысла мостов неориентированного графа не имеет).
+
+    Args:
+        offsets, targets: граф в CSR-форме (0-индексация), например из Graph.csr()
+        ids: номер ребра каждой дуги (по умолчанию - edge_ids)
+
+    Returns:
+        Biconnectivity
+    """
+    n = len(offsets) - 1
+    if ids is None:
+        ids = edge_ids(offsets, targets)
+    disc = array('i', [-1]) * n
+    low = array('i', [0]) * n
+    # Номер ребра дерева, по которому вершина достигнута (-1 для корней), и
+    # позиция его дуги в стеке дуг
+    tree_edge = array('q', [-1]) * n
+    entry = array('q', [0]) * n
+    position = array('q', offsets[:n])
+    result = Biconnectivity(offsets, targets)
+    bridges, blocks = result.bridges, result.block_arcs
+    cut = bytearray(n)
+    time = 0
+    for root in range(n):
+        if disc[root] >= 0:
+            continue
+        disc[root] = low[root] = time
+        time += 1
+        children = 0
+        stack = [root]
+        arcs: List[int] = []  # Стек дуг текущих блоков
+        while stack:
+            u = stack[-1]
+            arc, end = position[u], offsets[u + 1]
+            edge, start_u, low_u = tree_edge[u], disc[u], low[u]
+            while arc < end:
+                v = targets[arc]
+                # Петля не влияет на мосты и блоки; ребро, по которому пришли
+                # в u, пропускается
+                if v != u and ids[arc] != edge:
+                    start_v = disc[v]
+                    if start_v < 0:
+                        break
+                    if start_v < low_u:
+                        low_u = start_v
+                    if start_v < start_u:
+                        arcs.append(arc)  # Обратное ребро (второй раз не записывается)
+                arc += 1
+            low[u] = low_u
+            if arc < end:
+                # Спуск по дуге дерева u -> v
+                position[u] = arc + 1
+                disc[v] = low[v] = time
+                time += 1
+                tree_edge[v] = ids[arc]
+                entry[v] = len(arcs)
+                arcs.append(arc)
+                stack.append(v)
+                continue
+            position[u] = end
+            # Возврат из u в предка
+            stack.pop()
+            if not stack:
+                break
+            parent = stack[-1]
+            if low_u < low[parent]:
+                low[parent] = low_u
+            start_parent = disc[parent]
+            if low_u > start_parent:
+                bridges.append((parent, u))
+            if parent == root:
+                children += 1
+                if children > 1:
+                    cut[root] = 1
+            elif low_u >= start_parent:
+                cut[parent] = 1
+            if low_u >= start_parent:
+                # Блок: дуги стека выше дуги дерева parent -> u и она сама
+                blocks.append(arcs[entry[u]:])
+                del arcs[entry[u]:]
+    result.cut_vertices = [v for v in range(n) if cut[v]]
+    return result
+
+
+def _arc_sources(offsets: Sequence[int]):
+    """Начало каждой дуги графа в CSR-форме."""
+    if np is not None:
+        offsets_array = np.asarray(offsets, dtype=np.int64)
+        return np.repeat(np.arange(len(offsets_array) - 1), np.diff(offsets_array)).tolist()
+    sources = array('i')
+    for u in range(len(offsets) - 1):
+        sources.extend([u] * (offsets[u + 1] - offsets[u]))
+    return sources
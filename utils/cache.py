@@ -0,0 +1,177 @@
+"""
+Двоичный кэш графа рядом с исходным файлом.
+
+Формат файла <исходный файл>.gcache (little-endian):
+- заголовок HEADER: сигнатура, версия, флаги (ориентированность, тип файла),
+  количество вершин и дуг, mtime (нс), размер и хэш исходного файла
+- offsets: (V + 1) × int64
+- targets: E × int32, дополнены до границы 8 байт
+- weights: E × int64
+
+Строки CSR идут в порядке списков смежности графа: для списков смежности из
+файла - в порядке файла (с повторами), для матрицы и списка рёбер - по
+возрастанию соседей (все ненулевые ячейки матрицы).
+
+Кэш открывается через mmap, массивы CSR - это memoryview поверх отображённого
+файла, поэтому повторная загрузка не копирует данные. Кэш считается
+устаревшим, если изменился размер исходного файла, а при несовпадении mtime -
+ещё и хэш его содержимого.
+"""
+
+from array import array
+from typing import Optional, Sequence, Tuple
+import hashlib
+import mmap
+import os
+import struct
+import sys
+
+from .csr import OFFSET_TYPECODE, TARGET_TYPECODE, WEIGHT_TYPECODE
+
+CACHE_SUFFIX = '.gcache'
+MAGIC = b'GRPHCSR\x00'
+# Версия 2: строки списков смежности в порядке файла (в версии 1 - отсортированы)
+VERSION = 2
+FLAG_DIRECTED = 1
+FILE_TYPE_CODES = {'matrix': 1, 'adjacency_list': 2, 'edges': 3}
+
+# сигнатура, версия, флаги, тип файла, V, E, mtime_ns, размер, хэш
+HEADER = struct.Struct('<8sIIIxxxxqqqq16s')
+
+
+def cache_path(file_path: str) -> str:
+    """Возвращает путь к файлу кэша для исходного файла."""
+    return file_path + CACHE_SUFFIX
+
+
+def file_digest(file_path: str) -> bytes:
+    """Вычисляет хэш содержимого файла (BLAKE2b, 16 байт)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def _padded(size: int) -> int:
+    """Округляет размер вверх до границы 8 байт."""
+    return (size + 7) & ~7
+
+
+def save_cache(file_path: str, file_type: str, vertices_count: int, is_directed: bool,
+               offsets: Sequence[int], targets: Sequence[int], weights: Sequence[int]):
+    """
+    Записывает CSR-представление графа в кэш рядом с исходным файлом.
+
+    Запись атомарная: сначала во временный файл, затем os.replace.
+
+    Raises:
+        OSError: если файл кэша не удалось записать
+    """
+    stat = os.stat(file_path)
+    header = HEADER.pack(MAGIC, VERSION, FLAG_DIRECTED if is_directed else 0,
+                         FILE_TYPE_CODES[file_type], vertices_count, len(targets),
+                         stat.st_mtime_ns, stat.st_size, file_digest(file_path))
+    sections = [array(OFFSET_TYPECODE, offsets), array(TARGET_TYPECODE, targets),
+                array(WEIGHT_TYPECODE, weights)]
+    if sys.byteorder != 'little':
+        for section in sections:
+            section.byteswap()
+
+    target = cache_path(file_path)
+    temp = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(temp, 'wb') as file:
+            file.write(header)
+            for section in sections:
+                data = section.tobytes()
+                file.write(data)
+                file.write(b'\0' * (_padded(len(data)) - len(data)))
+        os.replace(temp, target)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+def load_cache(file_path: str, file_type: str) -> Optional[Tuple[int, bool, memoryview, memoryview, memoryview]]:
+    """
+    Открывает кэш графа через mmap, если он соответствует исходному файлу.
+
+    Если изменился только mtime исходного файла, а хэш совпал, mtime в
+    заголовке кэша обновляется, чтобы следующие загрузки не хэшировали файл.
+
+    Returns:
+        кортеж (V, is_directed, offsets, targets, weights) или None, если кэша
+        нет, он повреждён или устарел
+
+    Raises:
+        ValueError: если тип файла неизвестен
+    """
+    if file_type not in FILE_TYPE_CODES:
+        raise ValueError(f"Неизвестный тип файла: {file_type}")
+    path = cache_path(file_path)
+    if sys.byteorder != 'little' or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    header = _valid_header(mapped, file_path, file_type)
+    if header is None:
+        mapped.close()
+        return None
+    flags, vertices_count, edges_count, mtime_ns = header
+    stat = os.stat(file_path)
+    if stat.st_mtime_ns != mtime_ns:
+        _refresh_mtime(path, stat.st_mtime_ns)
+
+    offsets_size = 8 * (vertices_count + 1)
+    view = memoryview(mapped)
+    position = HEADER.size
+    offsets = view[position:position + offsets_size].cast(OFFSET_TYPECODE)
+    position += offsets_size
+    targets = view[position:position + 4 * edges_count].cast(TARGET_TYPECODE)
+    position += _padded(4 * edges_count)
+    weights = view[position:position + 8 * edges_count].cast(WEIGHT_TYPECODE)
+    return vertices_count, bool(flags & FLAG_DIRECTED), offsets, targets, weights
+
+
+def _valid_header(mapped: mmap.mmap, file_path: str,
+                  file_type: str) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Проверяет заголовок и размер кэша.
+
+    Returns:
+        (флаги, V, E, mtime_ns из заголовка) или None, если кэш повреждён или устарел
+    """
+    if len(mapped) < HEADER.size:
+        return None
+    (magic, version, flags, type_code, vertices_count, edges_count,
+     mtime_ns, size, digest) = HEADER.unpack_from(mapped)
+    if magic != MAGIC or version != VERSION or type_code != FILE_TYPE_CODES[file_type]:
+        return None
+
+    stat = os.stat(file_path)
+    if stat.st_size != size:
+        return None
+    if stat.st_mtime_ns != mtime_ns and file_digest(file_path) != digest:
+        return None
+
+    offsets_size = 8 * (vertices_count + 1)
+    targets_size = _padded(4 * edges_count)
+    if len(mapped) != HEADER.size + offsets_size + targets_size + 8 * edges_count:
+        return None
+    return flags, vertices_count, edges_count, mtime_ns
+
+
+def _refresh_mtime(path: str, mtime_ns: int):
+    """Записывает в заголовок кэша новый mtime исходного файла (содержимое то же)."""
+    field = struct.calcsize('<8sIIIxxxxqq')  # Смещение поля mtime_ns в HEADER
+    try:
+        with open(path, 'r+b') as file:
+            file.seek(field)
+            file.write(struct.pack('<q', mtime_ns))
+    except OSError:
+        pass  # Кэш только для чтения: файл будет хэшироваться при каждой загрузке
@@ -0,0 +1,212 @@
+"""
+Компоненты связности по массивам рёбер (алгоритм FastSV).
+
+Вместо обхода графа по вершинам каждая вершина хранит родителя f[v] - номер
+не больше своего. Раунд алгоритма состоит из векторных операций NumPy над
+всеми рёбрами сразу:
+- стохастическое подвешивание: f[f[u]] = min(f[f[u]], f[f[v]])
+- агрессивное подвешивание: f[u] = min(f[u], f[f[v]])
+- сжатие путей: f[u] = min(f[u], f[f[u]])
+Раунды повторяются, пока не перестанет меняться массив f[f]; число раундов -
+O(log V) на практике. После остановки f[v] - наименьшая вершина компоненты v.
+
+Для больших графов рёбра делятся между процессами ProcessPoolExecutor:
+массивы CSR один раз копируются в разделяемую память, каждый процесс считает
+метки для своего диапазона вершин и возвращает только вершины, у которых
+метка отличается от собственного номера. Пары (вершина, метка) всех частей
+образуют небольшой граф, который объединяется ещё одним проходом FastSV.
+
+Без NumPy используется система непересекающихся множеств (utils.dsu).
+"""
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Optional, Sequence
+import os
+
+from .csr import OFFSET_TYPECODE, TARGET_TYPECODE, WEIGHT_TYPECODE
+from .dsu import DisjointSet
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Меньшие графы обрабатываются в текущем процессе: запуск пула дороже раундов
+PARALLEL_MIN_EDGES = 1 << 20
+
+# Массивы CSR, подключённые в процессе-обработчике
+_shared = None
+
+
+def hook_and_compress(n: int, sources, targets, symmetric: bool = False):
+    """
+    Метки компонент графа из n вершин с рёбрами sources[i] - targets[i].
+
+    Args:
+        sources, targets: массивы NumPy концов рёбер (0-индексация)
+        symmetric: каждое ребро уже записано в обоих направлениях (как в CSR
+                   неориентированного графа) - подвешивание выполняется только
+                   по направлению sources -> targets
+
+    Returns:
+        массив NumPy: для каждой вершины - наименьшая вершина её компоненты
+    """
+    dtype = np.int32 if n < (1 << 31) else np.int64
+    parent = np.arange(n, dtype=dtype)
+    if len(sources) == 0:
+        return parent
+    sources = sources.astype(dtype, copy=False)
+    targets = targets.astype(dtype, copy=False)
+    directions = [(sources, targets)] if symmetric else [(sources, targets), (targets, sources)]
+    grandparent = parent.copy()
+    while True:
+        for u, v in directions:
+            # Стохастическое подвешивание корня u к деду v и агрессивное - самой u
+            np.minimum.at(parent, parent[u], grandparent[v])
+            np.minimum.at(parent, u, grandparent[v])
+        # Сжатие путей
+        np.minimum(parent, grandparent, out=parent)
+        next_grandparent = parent[parent]
+        if np.array_equal(next_grandparent, grandparent):
+            break
+        grandparent = next_grandparent
+    # Досжатие: каждая вершина указывает прямо на корень компоненты
+    while True:
+        root = parent[parent]
+        if np.array_equal(root, parent):
+            return parent
+        parent = root
+
+
+def _edge_range(offsets, targets, weights, start: int, stop: int):
+    """
+    Рёбра вершин start..stop-1 массивами NumPy (источники, приёмники).
+
+    Если указаны weights, рёбра с неположительным весом пропускаются
+    (как Graph.is_edge).
+    """
+    offs = np.asarray(offsets[start:stop + 1], dtype=np.int64)
+    lo, hi = int(offs[0]), int(offs[-1])
+    sources = np.repeat(np.arange(start, stop, dtype=np.int64), np.diff(offs))
+    heads = np.asarray(targets[lo:hi], dtype=np.int64)
+    if weights is not None:
+        positive = np.asarray(weights[lo:hi]) > 0
+        sources, heads = sources[positive], heads[positive]
+    return sources, heads
+
+
+def _range_labels(offsets, targets, weights, start: int, stop: int, symmetric: bool):
+    """Метки по рёбрам вершин start..stop-1: (вершины с чужой меткой, их метки)."""
+    n = len(offsets) - 1
+    sources, heads = _edge_range(offsets, targets, weights, start, stop)
+    if symmetric:
+        # Часть рёбер сама по себе не симметрична: из двух записей ребра
+        # остаётся одна, подвешивание идёт в обоих направлениях
+        forward = sources < heads
+        sources, heads = sources[forward], heads[forward]
+    labels = hook_and_compress(n, sources, heads)
+    moved = np.flatnonzero(labels != np.arange(n, dtype=labels.dtype))
+    return moved, labels[moved]
+
+
+def _attach_shared(name: str, n: int, m: int, weighted: bool, symmetric: bool):
+    """Инициализатор процесса: подключает массивы CSR из разделяемой памяти."""
+    from multiprocessing import shared_memory
+    global _shared
+    block = shared_memory.SharedMemory(name=name)
+    view = block.buf
+    offsets_size = 8 * (n + 1)
+    targets_end = offsets_size + 4 * m
+    offsets = view[:offsets_size].cast(OFFSET_TYPECODE)
+    targets = view[offsets_size:targets_end].cast(TARGET_TYPECODE)
+    weights = view[targets_end:targets_end + 8 * m].cast(WEIGHT_TYPECODE) if weighted else None
+    _shared = (block, offsets, targets, weights, symmetric)
+
+
+def _shared_range(start: int, stop: int):
+    """Задача процесса: метки по рёбрам диапазона вершин разделяемого графа."""
+    _, offsets, targets, weights, symmetric = _shared
+    return _range_labels(offsets, targets, weights, start, stop, symmetric)
+
+
+def _parallel_labels(offsets, targets, weights, symmetric: bool, workers: int):
+    """Метки компонент: части рёбер в workers процессах и объединение их результатов."""
+    from multiprocessing import shared_memory
+    n = len(offsets) - 1
+    sections = [array(OFFSET_TYPECODE, offsets).tobytes(), array(TARGET_TYPECODE, targets).tobytes()]
+    if weights is not None:
+        sections.append(array(WEIGHT_TYPECODE, weights).tobytes())
+    m = len(sections[1]) // 4
+    block = shared_memory.SharedMemory(create=True, size=max(sum(map(len, sections)), 1))
+    try:
+        position = 0
+        for section in sections:
+            block.buf[position:position + len(section)] = section
+            position += len(section)
+        # Одна часть на процесс: части равны по числу рёбер, а раунды каждой
+        # части проходят по всем V вершинам, поэтому дробить мельче невыгодно
+        cuts = np.searchsorted(np.asarray(offsets, dtype=np.int64),
+                               np.linspace(0, m, workers + 1)[1:-1], side='right') - 1
+        bounds = sorted({0, n, *cuts.tolist()})
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_shared,
+                                 initargs=(block.name, n, m, weights is not None, symmetric)) as executor:
+            parts = list(executor.map(_shared_range, bounds[:-1], bounds[1:]))
+    finally:
+        block.close()
+        block.unlink()
+    sources = np.concatenate([moved for moved, _ in parts])
+    heads = np.concatenate([labels for _, labels in parts])
+    return hook_and_compress(n, sources, heads)
+
+
+def _groups(labels) -> List[List[int]]:
+    """Вершины с одинаковой меткой: по возрастанию, группы - по наименьшей вершине."""
+    order = np.argsort(labels, kind='stable')
+    cuts = (np.flatnonzero(np.diff(labels[order])) + 1).tolist()
+    order = order.tolist()
+    return [order[lo:hi] for lo, hi in zip([0] + cuts, cuts + [len(order)])]
+
+
+def connected_components(offsets: Sequence[int], targets: Sequence[int],
+                         weights: Optional[Sequence[int]] = None, symmetric: bool = False,
+                         workers: Optional[int] = 1) -> List[List[int]]:
+    """
+    Компоненты связности (для орграфа - слабой связности) по массивам CSR.
+
+    Args:
+        offsets, targets: граф в CSR-форме (0-индексация), например из Graph.csr()
+        weights: веса рёбер; если указаны, рёбра с неположительным весом не
+                 учитываются
+        symmetric: граф неориентированный (каждое ребро записано дважды)
+        workers: количество процессов (None - число ядер); при workers > 1 и
+                 не меньше PARALLEL_MIN_EDGES рёбрах части рёбер обрабатываются
+                 в разных процессах; без NumPy не используется
+
+    Returns:
+        список компонент (вершины по возрастанию, компоненты - по наименьшей вершине)
+    """
+    n = len(offsets) - 1
+    if n == 0:
+        return []
+    if np is None:
+        components = DisjointSet(n)
+        for u in range(n):
+            lo, hi = offsets[u], offsets[u + 1]
+            if lo == hi:
+                continue
+            if weights is None:
+                heads = targets[lo:hi]
+            else:
+                heads = [v for v, w in zip(targets[lo:hi], weights[lo:hi]) if w > 0]
+            components.union_pairs(repeat(u, len(heads)), heads)
+        return components.groups()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(targets) >= PARALLEL_MIN_EDGES:
+        labels = _parallel_labels(offsets, targets, weights, symmetric, workers)
+    else:
+        sources, heads = _edge_range(offsets, targets, weights, 0, n)
+        labels = hook_and_compress(n, sources, heads, symmetric)
+    return _groups(labels)
@@ -0,0 +1,204 @@
+"""
+Построение компактного CSR-представления графа (Compressed Sparse Row).
+
+Граф хранится в трёх плоских массивах модуля array:
+- offsets: массив длины V+1, рёбра вершины u занимают отрезок [offsets[u], offsets[u+1])
+- targets: номера концов рёбер (0-индексация), внутри строки отсортированы по возрастанию
+- weights: веса рёбер, параллельно targets
+
+Память: O(V + E), матрица V×V не создаётся.
+"""
+
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, compress, islice, repeat
+from operator import add, and_, mul, ne
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Типы элементов массивов CSR
+OFFSET_TYPECODE = 'q'
+TARGET_TYPECODE = 'i'
+WEIGHT_TYPECODE = 'q'
+
+
+def _from_numpy(typecode: str, values) -> array:
+    """Копирует numpy-массив в array с заданным типом элементов."""
+    result = array(typecode)
+    result.frombytes(values.astype(np.dtype(typecode)).tobytes())
+    return result
+
+
+def _counting_order(keys: Sequence[int], order: Sequence[int], n: int) -> List[int]:
+    """
+    Устойчивая сортировка подсчётом индексов order по ключам keys.
+
+    Args:
+        keys: ключи (номера вершин в диапазоне [0, n))
+        order: исходный порядок индексов
+        n: количество различных ключей
+
+    Returns:
+        список индексов, упорядоченных по ключу с сохранением исходного порядка
+    """
+    counts = [0] * (n + 1)
+    for key in keys:
+        counts[key + 1] += 1
+    starts = list(accumulate(counts))
+    result = [0] * len(keys)
+    for i in order:
+        key = keys[i]
+        result[starts[key]] = i
+        starts[key] += 1
+    return result
+
+
+def build_csr(n: int, sources: Sequence[int], targets: Sequence[int],
+              weights: Sequence[int]) -> Tuple[array, array, array]:
+    """
+    Строит CSR из списка дуг (source, target, weight) в 0-индексации.
+
+    Семантика совпадает с заполнением матрицы смежности: при повторе дуги
+    побеждает последнее значение, ячейки с нулевым весом рёбрами не считаются.
+    Сортировка выполняется двумя проходами подсчётом, поэтому время O(V + E).
+    Если установлен NumPy, используется устойчивая сортировка numpy.argsort.
+
+    Args:
+        n: количество вершин
+        sources: начала дуг
+        targets: концы дуг
+        weights: веса дуг
+
+    Returns:
+        кортеж (offsets, targets, weights)
+
+    Raises:
+        ValueError: если номер вершины выходит за диапазон [0, n)
+    """
+    m = len(sources)
+    if m and (min(sources) < 0 or max(sources) >= n or min(targets) < 0 or max(targets) >= n):
+        raise ValueError("Номер вершины должен быть в диапазоне [1, size]")
+
+    if np is not None and isinstance(sources, array) and isinstance(targets, array):
+        return _build_csr_numpy(n, sources, targets, weights)
+
+    # Сначала по концу, затем устойчиво по началу: строки отсортированы по target
+    order = _counting_order(targets, range(m), n)
+    order = _counting_order(sources, order, n)
+    sorted_sources = list(map(sources.__getitem__, order))
+    sorted_targets = list(map(targets.__getitem__, order))
+    sorted_weights = list(map(weights.__getitem__, order))
+
+    # Оставляем последнюю из повторяющихся дуг и только ненулевые веса
+    keys = list(map(add, map(mul, sorted_sources, repeat(n)), sorted_targets))
+    keep = list(map(ne, keys, islice(keys, 1, None)))
+    keep.append(True)
+    keep = list(map(and_, keep, map(bool, sorted_weights)))
+    if not all(keep):
+        sorted_sources = list(compress(sorted_sources, keep))
+        sorted_targets = list(compress(sorted_targets, keep))
+        sorted_weights = list(compress(sorted_weights, keep))
+
+    offsets = array(OFFSET_TYPECODE, map(bisect_left, repeat(sorted_sources), range(n + 1)))
+    return offsets, array(TARGET_TYPECODE, sorted_targets), array(WEIGHT_TYPECODE, sorted_weights)
+
+
+def _build_csr_numpy(n: int, sources: array, targets: array, weights: Sequence[int]) -> Tuple[array, array, array]:
+    """Вариант build_csr на NumPy с той же семантикой."""
+    src = np.frombuffer(sources, dtype=np.dtype(sources.typecode)).astype(np.int64)
+    dst = np.frombuffer(targets, dtype=np.dtype(targets.typecode)).astype(np.int64)
+    wts = np.asarray(weights, dtype=np.int64)
+    keys = src * n + dst
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    keep = np.append(keys[1:] != keys[:-1], True) & (wts[order] != 0)
+    order = order[keep]
+    offsets = np.searchsorted(src[order], np.arange(n + 1), side='left')
+    return (_from_numpy(OFFSET_TYPECODE, offsets),
+            _from_numpy(TARGET_TYPECODE, dst[order]),
+            _from_numpy(WEIGHT_TYPECODE, wts[order]))
+
+
+def csr_from_lists(adjacency_lists: Sequence[Sequence[Tuple[int, int]]]) -> Tuple[array, array, array]:
+    """
+    Переводит списки смежности [(вершина, вес), ...] в 1-индексации в массивы CSR.
+
+    Порядок соседей и повторы сохраняются как есть.
+
+    Args:
+        adjacency_lists: списки смежности для каждой вершины
+
+    Returns:
+        кортеж (offsets, targets, weights) в 0-индексации
+    """
+    offsets = array(OFFSET_TYPECODE, [0])
+    targets = array(TARGET_TYPECODE)
+    weights = array(WEIGHT_TYPECODE)
+    for adj_list in adjacency_lists:
+        for vertex, weight in adj_list:
+            targets.append(vertex - 1)
+            weights.append(weight)
+        offsets.append(len(targets))
+    return offsets, targets, weights
+
+
+def is_sorted_csr(offsets: Sequence[int], targets: Sequence[int]) -> bool:
+    """Строки targets строго возрастают (отсортированы и без повторов, как после build_csr)."""
+    if np is not None:
+        dst = np.asarray(targets, dtype=np.int64)
+        rising = np.diff(dst) > 0
+        # Пары соседних дуг на границе строк не сравниваются
+        starts = np.asarray(offsets, dtype=np.int64)[1:-1]
+        starts = starts[(starts > 0) & (starts < len(dst))]
+        rising[starts - 1] = True
+        return bool(rising.all())
+    for u in range(len(offsets) - 1):
+        row = targets[offsets[u]:offsets[u + 1]]
+        if any(a >= b for a, b in zip(row, islice(row, 1, None))):
+            return False
+    return True
+
+
+def is_symmetric_csr(n: int, offsets: Sequence[int], targets: Sequence[int],
+                     weights: Sequence[int]) -> bool:
+    """
+    Проверяет, совпадает ли граф в CSR-форме со своим транспонированием.
+
+    Дуги (u, v, w) уже упорядочены по (u, v); транспонированные дуги (v, u, w)
+    упорядочиваются устойчивой сортировкой по v и сравниваются с исходными
+    массивами. Проверка прерывается на первом расхождении: сначала сравниваются
+    полустепени исхода и захода, затем номера соседей, затем веса.
+    Строки targets должны быть отсортированы и без повторов (как после build_csr).
+
+    Returns:
+        True, если матрица смежности симметрична
+    """
+    m = len(targets)
+    if np is not None:
+        offs = np.asarray(offsets, dtype=np.int64)
+        dst = np.asarray(targets, dtype=np.int64)
+        src = np.repeat(np.arange(n, dtype=np.int64), np.diff(offs))
+        if not np.array_equal(np.bincount(dst, minlength=n), np.diff(offs)):
+            return False
+        order = np.argsort(dst * n + src, kind='stable')
+        if not np.array_equal(src[order], dst):
+            return False
+        wts = np.asarray(weights, dtype=np.int64)
+        return bool(np.array_equal(wts[order], wts))
+
+    in_degrees = [0] * (n + 1)
+    for v in targets:
+        in_degrees[v + 1] += 1
+    if list(accumulate(in_degrees)) != list(offsets):
+        return False
+    sources = []
+    for u in range(n):
+        sources.extend(repeat(u, offsets[u + 1] - offsets[u]))
+    order = _counting_order(targets, range(m), n)
+    if list(map(sources.__getitem__, order)) != list(targets):
+        return False
+    return list(map(weights.__getitem__, order)) == list(weights)
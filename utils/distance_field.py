@@ -0,0 +1,143 @@
+"""
+Поле расстояний от одной стартовой клетки карты (задание 6).
+
+Полный проход Дейкстры от старта даёт расстояния до всех клеток и
+предшественников на кратчайших путях; после этого путь до любой цели
+восстанавливается по массиву предшественников без нового поиска.
+
+Формат файла (little-endian):
+- заголовок HEADER: сигнатура, версия, rows, cols, номер стартовой клетки,
+  хэш высот карты, для которой вычислено поле
+- dist: rows * cols × int32 - расстояния, UNREACHED для недостижимых клеток
+- prev: rows * cols × int32 - предшественники, -1 для старта и недостижимых
+
+Файл открывается через mmap, массивы - memoryview поверх отображённого файла.
+"""
+
+from array import array
+from typing import List, Optional, Sequence, Tuple
+import hashlib
+import mmap
+import os
+import struct
+import sys
+
+from .map import Map
+
+MAGIC = b'MAPDIST\x00'
+# 3: в заголовке хэш высот карты вместо версии и хэша файла карты
+VERSION = 3
+
+# Расстояние до недостижимой клетки (как INF_COST задания 6)
+UNREACHED = (1 << 31) - 1
+
+# сигнатура, версия, rows, cols, старт, хэш высот
+HEADER = struct.Struct('<8sIIII16s')
+
+
+def heights_digest(map_obj: Map) -> bytes:
+    """
+    Хэш высот карты (BLAKE2b, 16 байт).
+
+    Поле зависит только от высот, поэтому хэш отличает и разные истории
+    изменений с одинаковым числом set_height (Map.version их не различает),
+    и изменённый файл карты.
+    """
+    heights = map_obj.heights()
+    digest = hashlib.blake2b(digest_size=16)
+    if getattr(heights, 'itemsize', 0) == 4 and sys.byteorder == 'little':
+        digest.update(heights)  # array('i') или memoryview - без копирования
+    else:
+        digest.update(array('i', heights).tobytes())
+    return digest.digest()
+
+
+class DistanceField:
+    """
+    Расстояния и предшественники кратчайших путей от клетки source.
+
+    dist[x] - длина кратчайшего пути от source до клетки x (UNREACHED, если пути
+    нет), prev[x] - предыдущая клетка этого пути (-1 для source и недостижимых).
+    """
+
+    def __init__(self, rows: int, cols: int, source: int, dist: Sequence[int], prev: Sequence[int],
+                 version: int = 0):
+        self.rows = rows
+        self.cols = cols
+        self.source = source
+        self.dist = dist
+        self.prev = prev
+        # Версия карты (Map.version), для которой вычислено поле
+        self.version = version
+
+    def distance(self, goal: Tuple[int, int]) -> Optional[int]:
+        """Длина кратчайшего пути от старта до клетки goal (None, если пути нет)."""
+        cost = self.dist[goal[0] * self.cols + goal[1]]
+        return None if cost == UNREACHED else cost
+
+    def path(self, goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """Кратчайший путь [(row, col), ...] от старта до goal (None, если пути нет)."""
+        cell = goal[0] * self.cols + goal[1]
+        if self.dist[cell] == UNREACHED:
+            return None
+        cols = self.cols
+        prev = self.prev
+        path = []
+        while cell != self.source:
+            path.append(divmod(cell, cols))
+            cell = prev[cell]
+        path.append(divmod(cell, cols))
+        path.reverse()
+        return path
+
+    def save(self, path: str, map_obj: Map):
+        """
+        Записывает поле в файл (атомарно, через временный файл) вместе с хэшем
+        высот карты map_obj, для которой оно вычислено.
+
+        Raises:
+            OSError: если файл не удалось записать
+        """
+        header = HEADER.pack(MAGIC, VERSION, self.rows, self.cols, self.source, heights_digest(map_obj))
+        sections = [array('i', self.dist), array('i', self.prev)]
+        if sys.byteorder != 'little':
+            for section in sections:
+                section.byteswap()
+        temp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp, 'wb') as file:
+                file.write(header)
+                for section in sections:
+                    file.write(section.tobytes())
+            os.replace(temp, path)
+        finally:
+            if os.path.exists(temp):
+                os.remove(temp)
+
+    @classmethod
+    def load(cls, path: str, map_obj: Map) -> Optional['DistanceField']:
+        """
+        Открывает файл поля через mmap, если оно вычислено для текущих высот map_obj.
+
+        Returns:
+            объект DistanceField или None, если файла нет, он повреждён или
+            высоты карты с тех пор изменились (файл карты или set_height)
+        """
+        if sys.byteorder != 'little' or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(mapped) < HEADER.size:
+            mapped.close()
+            return None
+        magic, version, rows, cols, source, digest = HEADER.unpack_from(mapped)
+        n = rows * cols
+        if (magic != MAGIC or version != VERSION or (rows, cols) != map_obj.size()
+                or len(mapped) != HEADER.size + 8 * n or digest != heights_digest(map_obj)):
+            mapped.close()
+            return None
+        view = memoryview(mapped)[HEADER.size:].cast('i')
+        return cls(rows, cols, source, view[:n], view[n:], map_obj.version())
@@ -0,0 +1,104 @@
+"""
+Система непересекающихся множеств (DSU, union-find).
+
+Элементы - числа 0..size-1, родители и размеры множеств хранятся в массивах
+array('i'). find сжимает путь делением пополам, union подвешивает меньшее
+множество к большему (при равенстве - к множеству с меньшим корнем).
+"""
+
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
+
+class DisjointSet:
+    """Система непересекающихся множеств на элементах 0..size-1."""
+
+    def __init__(self, size: int):
+        self._parent = array('i', range(size))
+        self._size = array('i', [1]) * size
+        self._count = size
+
+    def __len__(self) -> int:
+        """Количество элементов."""
+        return len(self._parent)
+
+    def find(self, x: int) -> int:
+        """Корень множества элемента x."""
+        parent = self._parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        """
+        Объединяет множества элементов a и b.
+
+        Returns:
+            True, если множества были разными
+        """
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return False
+        if self._size[a] < self._size[b] or (self._size[a] == self._size[b] and b < a):
+            a, b = b, a
+        self._parent[b] = a
+        self._size[a] += self._size[b]
+        self._count -= 1
+        return True
+
+    def union_pairs(self, first: Iterable[int], second: Iterable[int],
+                    merges: Optional[List[Tuple[int, int]]] = None) -> int:
+        """
+        Объединяет множества элементов first[i] и second[i] для всех пар - то же,
+        что union в цикле, но без вызова методов на каждую пару.
+
+        Args:
+            merges: если указан, в него добавляются пары (first[i], second[i]),
+                    объединившие разные множества (рёбра остовного леса)
+
+        Returns:
+            количество объединений (пар из разных множеств)
+        """
+        parent = self._parent
+        size = self._size
+        merged = 0
+        for x, y in zip(first, second):
+            a, b = x, y
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            if a == b:
+                continue
+            if size[a] < size[b] or (size[a] == size[b] and b < a):
+                a, b = b, a
+            parent[b] = a
+            size[a] += size[b]
+            merged += 1
+            if merges is not None:
+                merges.append((x, y))
+        self._count -= merged
+        return merged
+
+    def set_count(self) -> int:
+        """Количество множеств."""
+        return self._count
+
+    def groups(self) -> List[List[int]]:
+        """
+        Элементы каждого множества по возрастанию; множества упорядочены по
+        наименьшему элементу.
+        """
+        result = []
+        index = {}
+        for x in range(len(self._parent)):
+            root = self.find(x)
+            if root not in index:
+                index[root] = len(result)
+                result.append([])
+            result[index[root]].append(x)
+        return result
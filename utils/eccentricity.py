@@ -0,0 +1,462 @@
+"""
+Эксцентриситеты, радиус и диаметр невзвешенного графа.
+
+Эксцентриситет каждой вершины вычисляется отдельным обходом в ширину по
+CSR-массивам (offsets, targets), поэтому время O(V·E), а память - O(V) на
+процесс вместо матрицы расстояний V×V.
+
+Для больших графов источники распределяются по процессам ProcessPoolExecutor.
+Массивы CSR один раз копируются в разделяемую память (shared_memory), каждый
+процесс подключается к ней при запуске, а задачи передают только диапазоны
+номеров источников.
+
+bitset_eccentricities обходит из многих источников одновременно, храня для
+каждой вершины битовую маску источников (целые числа Python или слова uint64).
+
+bounded_eccentricities находит точные эксцентриситеты неориентированного
+графа по верхним и нижним оценкам, обычно за небольшое число обходов.
+"""
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+import heapq
+import math
+import os
+
+from .csr import OFFSET_TYPECODE, TARGET_TYPECODE
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Меньшие графы обрабатываются в текущем процессе: запуск пула дороже обходов
+PARALLEL_MIN_VERTICES = 5000
+
+# Количество задач на один процесс (для выравнивания нагрузки)
+CHUNKS_PER_WORKER = 4
+
+# Количество источников в одном пакете битового обхода: для целых чисел Python
+# выгодны длинные маски, для NumPy - одно слово uint64 на вершину
+BITSET_BATCH = 1024
+BITSET_BATCH_NUMPY = 64
+
+# Число обходов в bounded_eccentricities, после которого оставшиеся
+# эксцентриситеты вычисляются полностью
+BOUNDING_MAX_SWEEPS = 64
+
+# Массивы CSR, подключённые в процессе-обработчике
+_shared = None
+
+
+def bfs_eccentricity(offsets: Sequence[int], targets: Sequence[int], source: int,
+                     mark: array) -> float:
+    """
+    Эксцентриситет вершины source - глубина обхода в ширину.
+
+    Args:
+        offsets, targets: граф в CSR-форме (0-индексация)
+        source: начальная вершина
+        mark: рабочий массив длины V; вершина считается посещённой, если
+              mark[v] == source, поэтому между обходами из разных источников
+              массив не нужно очищать (начальное значение - -1)
+
+    Returns:
+        наибольшее расстояние в рёбрах или math.inf, если достижимы не все вершины
+    """
+    n = len(mark)
+    mark[source] = source
+    frontier = [source]
+    reached = 1
+    level = 0
+    while True:
+        next_frontier = []
+        for u in frontier:
+            for v in targets[offsets[u]:offsets[u + 1]]:
+                if mark[v] != source:
+                    mark[v] = source
+                    next_frontier.append(v)
+        if not next_frontier:
+            break
+        reached += len(next_frontier)
+        level += 1
+        frontier = next_frontier
+    return level if reached == n else math.inf
+
+
+def _eccentricity_range(offsets: Sequence[int], targets: Sequence[int],
+                        start: int, stop: int) -> List[float]:
+    """Эксцентриситеты вершин start..stop-1."""
+    mark = array('i', [-1]) * (len(offsets) - 1)
+    return [bfs_eccentricity(offsets, targets, source, mark) for source in range(start, stop)]
+
+
+def _attach_shared(name: str, n: int, m: int):
+    """Инициализатор процесса: подключает массивы CSR из разделяемой памяти."""
+    from multiprocessing import shared_memory
+    global _shared
+    block = shared_memory.SharedMemory(name=name)
+    view = block.buf
+    offsets_size = 8 * (n + 1)
+    offsets = view[:offsets_size].cast(OFFSET_TYPECODE)
+    targets = view[offsets_size:offsets_size + 4 * m].cast(TARGET_TYPECODE)
+    _shared = (block, offsets, targets)
+
+
+def _shared_range(start: int, stop: int) -> List[float]:
+    """Задача процесса: эксцентриситеты диапазона источников по разделяемому графу."""
+    _, offsets, targets = _shared
+    return _eccentricity_range(offsets, targets, start, stop)
+
+
+def eccentricities(offsets: Sequence[int], targets: Sequence[int],
+                   workers: Optional[int] = None) -> List[float]:
+    """
+    Вычисляет эксцентриситеты всех вершин невзвешенного графа.
+
+    Args:
+        offsets, targets: граф в CSR-форме (0-индексация), например из Graph.csr()
+        workers: количество процессов (по умолчанию - число ядер); при workers=1
+                 или числе вершин меньше PARALLEL_MIN_VERTICES обходы выполняются
+                 в текущем процессе
+
+    Returns:
+        список эксцентриситетов (int или math.inf для вершин, из которых
+        достижимы не все вершины)
+    """
+    n = len(offsets) - 1
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or n < PARALLEL_MIN_VERTICES:
+        return _eccentricity_range(offsets, targets, 0, n)
+
+    from multiprocessing import shared_memory
+    offsets_bytes = array(OFFSET_TYPECODE, offsets).tobytes()
+    targets_bytes = array(TARGET_TYPECODE, targets).tobytes()
+    m = len(targets_bytes) // 4
+    block = shared_memory.SharedMemory(create=True, size=max(len(offsets_bytes) + len(targets_bytes), 1))
+    try:
+        block.buf[:len(offsets_bytes)] = offsets_bytes
+        block.buf[len(offsets_bytes):len(offsets_bytes) + len(targets_bytes)] = targets_bytes
+        step = max(1, -(-n // (workers * CHUNKS_PER_WORKER)))
+        bounds = [(start, min(start + step, n)) for start in range(0, n, step)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_shared,
+                                 initargs=(block.name, n, m)) as executor:
+            parts = executor.map(_shared_range, *zip(*bounds))
+            result = []
+            for part in parts:
+                result.extend(part)
+        return result
+    finally:
+        block.close()
+        block.unlink()
+
+
+def radius_and_diameter(eccentricity: Sequence[float]) -> Tuple[float, float]:
+    """
+    Радиус и диаметр графа по эксцентриситетам.
+
+    Returns:
+        кортеж (R, D); для несвязного графа оба значения равны math.inf
+    """
+    return min(eccentricity), max(eccentricity)
+
+
+def _bit_depths(level_masks: List[int], width: int) -> List[int]:
+    """
+    Глубина обхода для каждого из width источников пакета.
+
+    level_masks[L] - маска источников, фронт которых непуст на уровне L.
+    """
+    depths = [0] * width
+    unresolved = (1 << width) - 1
+    for level in range(len(level_masks) - 1, 0, -1):
+        hit = level_masks[level] & unresolved
+        unresolved &= ~hit
+        while hit:
+            low = hit & -hit
+            depths[low.bit_length() - 1] = level
+            hit ^= low
+    return depths
+
+
+def _bitset_batch(offsets: Sequence[int], targets: Sequence[int],
+                  start: int, stop: int) -> Tuple[List[int], int]:
+    """
+    Одновременный обход в ширину из вершин start..stop-1 на целых числах Python.
+
+    Бит i в seen[v] и frontier[v] означает, что вершина v достигнута из
+    источника start + i; фронт следующего уровня - OR фронтов соседей.
+
+    Returns:
+        кортеж (глубины обходов, маска источников, из которых достижимы все вершины)
+    """
+    n = len(offsets) - 1
+    width = stop - start
+    seen = [0] * n
+    frontier = [0] * n
+    active = list(range(start, stop))
+    for i, source in enumerate(active):
+        seen[source] = frontier[source] = 1 << i
+    level_masks = [(1 << width) - 1]
+    while active:
+        reached = {}
+        for u in active:
+            bits = frontier[u]
+            for v in targets[offsets[u]:offsets[u + 1]]:
+                reached[v] = reached.get(v, 0) | bits
+        active = []
+        level_mask = 0
+        for v, bits in reached.items():
+            bits &= ~seen[v]
+            if bits:
+                seen[v] |= bits
+                frontier[v] = bits
+                level_mask |= bits
+                active.append(v)
+        if level_mask:
+            level_masks.append(level_mask)
+    complete = (1 << width) - 1
+    for bits in seen:
+        complete &= bits
+    return _bit_depths(level_masks, width), complete
+
+
+def _reverse_csr_numpy(offsets, targets):
+    """Обратный граф в CSR-форме (массивы NumPy) для обхода «сбором» по входящим дугам."""
+    offs = np.asarray(offsets, dtype=np.int64)
+    dst = np.asarray(targets, dtype=np.int64)
+    n = len(offs) - 1
+    src = np.repeat(np.arange(n, dtype=np.int64), np.diff(offs))
+    order = np.argsort(dst, kind='stable')
+    reverse_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(dst, minlength=n), out=reverse_offsets[1:])
+    return reverse_offsets, src[order]
+
+
+def _bitset_batch_numpy(reverse_offsets, sources, start: int, stop: int) -> Tuple[List[int], List[bool]]:
+    """
+    Вариант _bitset_batch на словах uint64: фронт вершины - строка из
+    ceil(width / 64) слов, фронт следующего уровня собирается по входящим дугам
+    одним вызовом numpy.bitwise_or.reduceat.
+    """
+    n = len(reverse_offsets) - 1
+    width = stop - start
+    words = (width + 63) // 64
+    seen = np.zeros((n, words), dtype=np.uint64)
+    ids = np.arange(width)
+    seen[start + ids, ids // 64] = np.left_shift(np.uint64(1), (ids % 64).astype(np.uint64))
+    frontier = seen.copy()
+    # reduceat только по вершинам с входящими дугами: их начала строго возрастают
+    has_arcs = np.diff(reverse_offsets) > 0
+    starts = reverse_offsets[:-1][has_arcs]
+    reached = np.zeros_like(seen)
+    depths = np.zeros(width, dtype=np.int64)
+    level = 0
+    while len(sources):
+        reached[has_arcs] = np.bitwise_or.reduceat(frontier[sources], starts, axis=0)
+        np.bitwise_and(reached, ~seen, out=frontier)
+        level_mask = np.bitwise_or.reduce(frontier, axis=0)
+        if not level_mask.any():
+            break
+        level += 1
+        np.bitwise_or(seen, frontier, out=seen)
+        hit = np.unpackbits(level_mask.view(np.uint8), bitorder='little')[:width].astype(bool)
+        depths[hit] = level
+    complete = np.bitwise_and.reduce(seen, axis=0) if n else np.zeros(words, dtype=np.uint64)
+    complete = np.unpackbits(complete.view(np.uint8), bitorder='little')[:width].astype(bool)
+    return depths.tolist(), complete.tolist()
+
+
+def bitset_eccentricities(offsets: Sequence[int], targets: Sequence[int],
+                          ignore_unreachable: bool = False,
+                          batch: Optional[int] = None) -> List[float]:
+    """
+    Эксцентриситеты всех вершин невзвешенного (ор)графа пакетным обходом в ширину.
+
+    Источники обрабатываются пакетами по batch вершин: для каждой вершины
+    хранится битовая маска источников, уже достигших её, и маска текущего фронта.
+    Один уровень обхода - это OR масок фронта по дугам графа, поэтому все
+    расстояния находятся за ceil(V / batch) проходов вместо V обходов.
+    С NumPy маски хранятся словами uint64, иначе - целыми числами Python.
+
+    Args:
+        offsets, targets: граф в CSR-форме (0-индексация), дуги u -> v
+        ignore_unreachable: если True, эксцентриситет - наибольшее расстояние
+                            до достижимых вершин; иначе для вершин, из которых
+                            достижимы не все, возвращается math.inf
+        batch: количество источников в пакете (по умолчанию BITSET_BATCH_NUMPY
+               с NumPy и BITSET_BATCH без него)
+
+    Returns:
+        список эксцентриситетов (int или math.inf)
+    """
+    n = len(offsets) - 1
+    if batch is None:
+        batch = BITSET_BATCH if np is None else BITSET_BATCH_NUMPY
+    result = []
+    if np is not None:
+        reverse_offsets, sources = _reverse_csr_numpy(offsets, targets)
+    for start in range(0, n, batch):
+        stop = min(start + batch, n)
+        if np is not None:
+            depths, complete = _bitset_batch_numpy(reverse_offsets, sources, start, stop)
+        else:
+            depths, mask = _bitset_batch(offsets, targets, start, stop)
+            complete = [bool(mask >> i & 1) for i in range(stop - start)]
+        result.extend(depth if ignore_unreachable or full else math.inf
+                      for depth, full in zip(depths, complete))
+    return result
+
+
+def bfs_distances(offsets: Sequence[int], targets: Sequence[int], source: int) -> List[float]:
+    """Расстояния в рёбрах от source (math.inf для недостижимых вершин)."""
+    dist = [math.inf] * (len(offsets) - 1)
+    dist[source] = 0
+    frontier = [source]
+    level = 0
+    while frontier:
+        level += 1
+        next_frontier = []
+        for u in frontier:
+            for v in targets[offsets[u]:offsets[u + 1]]:
+                if dist[v] == math.inf:
+                    dist[v] = level
+                    next_frontier.append(v)
+        frontier = next_frontier
+    return dist
+
+
+def dijkstra_distances(offsets: Sequence[int], targets: Sequence[int],
+                       weights: Sequence[int], source: int) -> List[float]:
+    """Расстояния от source при неотрицательных весах (math.inf для недостижимых вершин)."""
+    dist = [math.inf] * (len(offsets) - 1)
+    dist[source] = 0
+    heap = [(0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            candidate = d + weights[i]
+            if candidate < dist[v]:
+                dist[v] = candidate
+                heapq.heappush(heap, (candidate, v))
+    return dist
+
+
+def _leaf_parents(offsets: Sequence[int], targets: Sequence[int]) -> dict:
+    """
+    Висячие вершины, эксцентриситет которых выражается через соседа.
+
+    Вершина v с единственным соседом u (петли и повторы дуг не учитываются)
+    попадает в результат, если у u есть и другие соседи: тогда самая далёкая
+    от v вершина - самая далёкая от u, и e(v) = e(u) + 1.
+
+    Returns:
+        словарь {висячая вершина: её сосед}
+    """
+    n = len(offsets) - 1
+    neighbours = [set(targets[offsets[v]:offsets[v + 1]]) - {v} for v in range(n)]
+    return {v: next(iter(adj)) for v, adj in enumerate(neighbours)
+            if len(adj) == 1 and len(neighbours[next(iter(adj))]) > 1}
+
+
+def bounded_eccentricities(offsets: Sequence[int], targets: Sequence[int],
+                           weights: Optional[Sequence[int]] = None,
+                           ignore_unreachable: bool = False,
+                           max_sweeps: Optional[int] = None,
+                           stats: Optional[dict] = None) -> List[float]:
+    """
+    Точные эксцентриситеты неориентированного графа методом ограничивающих
+    оценок (Takes, Kosters, "Computing the Eccentricity Distribution of Large Graphs").
+
+    Для каждой вершины w хранятся нижняя и верхняя оценки эксцентриситета.
+    После обхода из вершины v с эксцентриситетом e(v):
+        max(e(v) - d(v, w), d(v, w)) <= e(w) <= e(v) + d(v, w)
+    Вершина, у которой оценки совпали, больше не обходится. Следующий источник
+    выбирается поочерёдно: с наибольшей верхней и с наименьшей нижней оценкой
+    (при равенстве - с большей степенью). На реальных графах обычно хватает
+    нескольких обходов вместо V. В невзвешенном графе висячие вершины не
+    обходятся: их эксцентриситет на 1 больше, чем у соседа.
+
+    Если за max_sweeps обходов оценки сошлись не для всех вершин, оставшиеся
+    вычисляются полностью: bitset_eccentricities для невзвешенного графа,
+    алгоритмом Дейкстры из каждой вершины - для взвешенного.
+
+    Args:
+        offsets, targets: граф в CSR-форме (0-индексация), матрица симметрична
+        weights: веса рёбер (неотрицательные); None - все веса равны 1
+        ignore_unreachable: если True, эксцентриситет считается в пределах
+                            компоненты вершины; иначе для несвязного графа все
+                            эксцентриситеты равны math.inf
+        max_sweeps: наибольшее число обходов до перехода к полному вычислению
+                    (по умолчанию BOUNDING_MAX_SWEEPS)
+        stats: словарь, в который записываются 'sweeps' (число обходов) и
+               'fallback' (понадобилось ли полное вычисление)
+
+    Returns:
+        список эксцентриситетов (int или math.inf)
+    """
+    n = len(offsets) - 1
+    if max_sweeps is None:
+        max_sweeps = BOUNDING_MAX_SWEEPS
+    if weights is None:
+        def sweep(source):
+            return bfs_distances(offsets, targets, source)
+    else:
+        def sweep(source):
+            return dijkstra_distances(offsets, targets, weights, source)
+
+    degrees = [offsets[v + 1] - offsets[v] for v in range(n)]
+    lower = [0] * n
+    upper = [math.inf] * n
+    eccentricity = [math.inf] * n
+    candidates = set(range(n))
+    # Висячие вершины невзвешенного графа: e(v) = e(u) + 1 для единственного соседа u
+    leaves = _leaf_parents(offsets, targets) if weights is None else {}
+    candidates.difference_update(leaves)
+    sweeps = 0
+    pick_upper = True
+    while candidates and sweeps < max_sweeps:
+        if pick_upper:
+            v = max(candidates, key=lambda w: (upper[w], degrees[w]))
+        else:
+            v = min(candidates, key=lambda w: (lower[w], -degrees[w]))
+        pick_upper = not pick_upper
+
+        dist = sweep(v)
+        sweeps += 1
+        reached = [w for w in range(n) if dist[w] != math.inf]
+        if len(reached) < n and not ignore_unreachable:
+            # Граф несвязный: все эксцентриситеты бесконечны
+            candidates.clear()
+            break
+        e = max(dist[w] for w in reached)
+        eccentricity[v] = e
+        candidates.discard(v)
+        for w in reached:
+            if w in candidates:
+                d = dist[w]
+                lower[w] = max(lower[w], e - d, d)
+                upper[w] = min(upper[w], e + d)
+                if lower[w] == upper[w]:
+                    eccentricity[w] = lower[w]
+                    candidates.discard(w)
+
+    if candidates:
+        if weights is None:
+            full = bitset_eccentricities(offsets, targets, ignore_unreachable=True)
+            for w in candidates:
+                eccentricity[w] = full[w]
+        else:
+            for w in candidates:
+                eccentricity[w] = max(d for d in sweep(w) if d != math.inf)
+    for leaf, parent in leaves.items():
+        eccentricity[leaf] = eccentricity[parent] + 1
+    if stats is not None:
+        stats['sweeps'] = sweeps
+        stats['fallback'] = bool(candidates)
+    return eccentricity
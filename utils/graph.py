@@ -1,122 +1,308 @@
-from typing import List, Tuple, Optional
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple, Optional
+from array import array
+from bisect import bisect_left
 import os
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .csr import build_csr, csr_from_lists, is_sorted_csr, is_symmetric_csr, OFFSET_TYPECODE, TARGET_TYPECODE, WEIGHT_TYPECODE
+from .parser import read_vertices_count, iter_matrix_rows, iter_adjacency_rows, parse_edges
+from .cache import cache_path, load_cache, save_cache
+
+# Способы хранения графа в памяти
+STORAGE_TYPES = ('dense', 'sparse')
+
+# Размер блока (в ячейках матрицы) при проверке симметричности через NumPy
+SYMMETRY_BLOCK_CELLS = 1 << 20
 
 
 class Graph:
     """
     Класс для работы с графами и орграфами.
     Поддерживает два типа внутреннего представления: матрица смежности и списки смежности.
+    
+    В режиме storage='sparse' граф хранится только в виде CSR-массивов
+    (offsets, targets, weights): матрица V×V не создаётся, загрузка занимает
+    O(V + E) времени и памяти, а поиск ребра - O(log deg). Строки CSR
+    отсортированы по соседям; для списков смежности, записанных в другом
+    порядке, дополнительно хранятся строки в порядке файла, чтобы
+    adjacency_list() совпадал с режимом 'dense'.
+    
+    При cache=True рядом с исходным файлом сохраняется двоичный CSR-кэш
+    (см. utils.cache), который при следующих загрузках открывается через mmap.
     """
     
-    def __init__(self, file_path: str, file_type: str):
+    def __init__(self, file_path: str, file_type: str, storage: str = 'dense', cache: bool = False,
+                 profile_hook: Optional[Callable[[str, float], None]] = None):
         """
         Конструктор класса.
         
         Args:
             file_path: путь к файлу с данными графа
             file_type: тип файла ('matrix', 'adjacency_list', 'edges')
+            storage: способ хранения ('dense' - матрица и списки смежности,
+                     'sparse' - только CSR-массивы)
+            cache: использовать двоичный кэш <file_path>.gcache; устаревший
+                   кэш игнорируется и перезаписывается после разбора текста
+            profile_hook: функция (этап, секунды), вызываемая по завершении каждого
+                          этапа загрузки ('symmetry', 'parse')
         """
+        if storage not in STORAGE_TYPES:
+            raise ValueError(f"Неизвестный способ хранения: {storage}")
+        
         self._vertices_count = 0
         self._adjacency_matrix = []
         self._adjacency_lists = []
         self._is_directed = False
         self._file_type = file_type
+        self._storage = storage
+        # CSR-представление (только для storage='sparse'), 0-индексация;
+        # строки отсортированы по соседям, повторы дуг и нулевые веса удалены
+        self._offsets = None
+        self._targets = None
+        self._weights = None
+        # Списки смежности из файла в порядке файла (CSR), если они отличаются
+        # от отсортированных строк (только для storage='sparse')
+        self._rows = None
+        # Массивы смежности для обходов, строятся по требованию
+        self._adjacency_arrays = None
+        # Статистика загрузки: размер файла, время и скорость разбора, время этапов
+        self._load_profile = {}
+        self._profile_hook = profile_hook
         
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Файл {file_path} не найден")
         
-        self._load_from_file(file_path, file_type)
+        if not (cache and self._load_from_cache(file_path, file_type)):
+            self._load_from_file(file_path, file_type)
+            if cache:
+                self._save_cache(file_path, file_type)
     
-    def _load_from_file(self, file_path: str, file_type: str):
-        """Загружает граф из файла в зависимости от типа файла."""
-        with open(file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
+    def _load_from_cache(self, file_path: str, file_type: str) -> bool:
+        """
+        Загружает граф из двоичного кэша, если он актуален.
         
-        if not lines:
-            raise ValueError("Файл пуст")
+        В режиме 'sparse' CSR-массивы остаются отображением файла (без копирования),
+        в режиме 'dense' по ним строятся матрица и списки смежности. Списки
+        смежности из файла восстанавливаются в порядке файла, как при разборе текста.
         
-        # Первая строка содержит количество вершин
-        try:
-            self._vertices_count = int(lines[0].strip())
-        except ValueError:
-            raise ValueError("Первая строка должна содержать количество вершин")
+        Returns:
+            True, если граф загружен из кэша
+        """
+        started = time.perf_counter()
+        cached = load_cache(file_path, file_type)
+        if cached is None:
+            return False
+        
+        self._vertices_count, self._is_directed, offsets, targets, weights = cached
+        if file_type == 'adjacency_list':
+            if self._storage == 'dense':
+                self._adjacency_lists = [list(zip([v + 1 for v in targets[offsets[u]:offsets[u + 1]]],
+                                                  weights[offsets[u]:offsets[u + 1]]))
+                                         for u in range(self._vertices_count)]
+                self._create_adjacency_matrix()
+            elif is_sorted_csr(offsets, targets) and all(w > 0 for w in weights):
+                self._offsets, self._targets, self._weights = offsets, targets, weights
+            else:
+                self._set_rows(offsets, targets, weights)
+        elif self._storage == 'sparse':
+            self._offsets, self._targets, self._weights = offsets, targets, weights
+        else:
+            self._adjacency_matrix = [[0] * self._vertices_count for _ in range(self._vertices_count)]
+            for u in range(self._vertices_count):
+                row = self._adjacency_matrix[u]
+                for i in range(offsets[u], offsets[u + 1]):
+                    row[targets[i]] = weights[i]
+            self._create_adjacency_lists()
+        elapsed = time.perf_counter() - started
+        
+        size = os.path.getsize(cache_path(file_path))
+        self._record_phase('parse', elapsed)
+        self._load_profile.update({
+            'bytes': size,
+            'parse_mb_per_s': size / (1 << 20) / elapsed if elapsed > 0 else float('inf'),
+            'cache_hit': True,
+        })
+        return True
+    
+    def _save_cache(self, file_path: str, file_type: str):
+        """
+        Сохраняет CSR-представление графа в двоичный кэш (ошибки записи игнорируются).
         
-        if file_type == 'matrix':
-            self._load_matrix(lines[1:])
+        Списки смежности из файла записываются в порядке файла, иначе после
+        загрузки из кэша обходы шли бы по соседям в другом порядке.
+        """
+        if self._rows is not None:
+            offsets, targets, weights = self._rows
+        elif self._storage == 'sparse':
+            offsets, targets, weights = self._offsets, self._targets, self._weights
         elif file_type == 'adjacency_list':
-            self._load_adjacency_list(lines[1:])
-        elif file_type == 'edges':
-            self._load_edges(lines[1:])
+            offsets, targets, weights = csr_from_lists(self._adjacency_lists)
         else:
+            sources = array(TARGET_TYPECODE)
+            targets = array(TARGET_TYPECODE)
+            weights = array(WEIGHT_TYPECODE)
+            for u, row in enumerate(self._adjacency_matrix):
+                columns = [j for j, weight in enumerate(row) if weight != 0]
+                sources.extend([u] * len(columns))
+                targets.extend(columns)
+                weights.extend(row[j] for j in columns)
+            offsets, targets, weights = build_csr(self._vertices_count, sources, targets, weights)
+        try:
+            save_cache(file_path, file_type, self._vertices_count, self._is_directed,
+                       offsets, targets, weights)
+        except OSError:
+            pass
+    
+    def _load_from_file(self, file_path: str, file_type: str):
+        """
+        Загружает граф из файла в зависимости от типа файла.
+        
+        Файл разбирается потоково блоками (см. utils.parser), разобранные данные
+        сразу попадают во внутреннее представление. Время разбора и скорость
+        в МБ/с сохраняются в load_profile().
+        """
+        if file_type not in ('matrix', 'adjacency_list', 'edges'):
             raise ValueError(f"Неизвестный тип файла: {file_type}")
+        
+        started = time.perf_counter()
+        with open(file_path, 'rb') as file:
+            # Первая строка содержит количество вершин
+            self._vertices_count = read_vertices_count(file)
+            
+            if file_type == 'matrix':
+                self._load_matrix(iter_matrix_rows(file, self._vertices_count))
+            elif file_type == 'adjacency_list':
+                self._load_adjacency_list(iter_adjacency_rows(file, self._vertices_count))
+            else:
+                self._load_edges(*parse_edges(file))
+        elapsed = time.perf_counter() - started
+        
+        size = os.path.getsize(file_path)
+        self._record_phase('parse', elapsed)
+        self._load_profile.update({
+            'bytes': size,
+            'parse_mb_per_s': size / (1 << 20) / elapsed if elapsed > 0 else float('inf'),
+            'cache_hit': False,
+        })
     
-    def _load_matrix(self, lines: List[str]):
-        """Загружает граф из матрицы смежности."""
-        self._adjacency_matrix = []
-        for line in lines:
-            if line.strip():
-                row = [int(x) for x in line.strip().split()]
-                if len(row) != self._vertices_count:
-                    raise ValueError("Количество элементов в строке не соответствует количеству вершин")
-                self._adjacency_matrix.append(row)
+    def _load_matrix(self, rows: Iterable[List[int]]):
+        """Загружает граф из строк матрицы смежности."""
+        if self._storage == 'sparse':
+            self._load_matrix_sparse(rows)
+            return
+        self._adjacency_matrix = list(rows)
         
         if len(self._adjacency_matrix) != self._vertices_count:
             raise ValueError("Количество строк не соответствует количеству вершин")
         
         # Определяем, является ли граф ориентированным
-        self._is_directed = not self._is_symmetric()
+        self._is_directed = not self._timed_is_symmetric()
         
         # Создаем списки смежности
         self._create_adjacency_lists()
     
-    def _load_adjacency_list(self, lines: List[str]):
-        """Загружает граф из списков смежности."""
-        self._adjacency_lists = [[] for _ in range(self._vertices_count)]
-        
-        for i, line in enumerate(lines):
-            if i >= self._vertices_count:
-                break
-            if line.strip():
-                # Парсим строку вида "2 5" или "2:1 5:3"
-                parts = line.strip().split()
-                for part in parts:
-                    if ':' in part:
-                        # Формат "вершина:вес"
-                        vertex, weight = part.split(':')
-                        self._adjacency_lists[i].append((int(vertex), int(weight)))
-                    else:
-                        # Формат "вершина" (вес по умолчанию 1)
-                        self._adjacency_lists[i].append((int(part), 1))
+    def _load_adjacency_list(self, rows: Iterable[List[Tuple[int, int]]]):
+        """Загружает граф из списков смежности [(вершина, вес), ...]."""
+        if self._storage == 'sparse':
+            self._load_adjacency_list_sparse(rows)
+            return
+        self._adjacency_lists = list(rows)
+        self._adjacency_lists.extend([] for _ in range(self._vertices_count - len(self._adjacency_lists)))
         
         # Создаем матрицу смежности
         self._create_adjacency_matrix()
         
         # Определяем, является ли граф ориентированным
-        self._is_directed = not self._is_symmetric()
-    
-    def _load_edges(self, lines: List[str]):
-        """Загружает граф из списка рёбер."""
-        edges = []
-        for line in lines:
-            if line.strip():
-                parts = line.strip().split()
-                if len(parts) >= 2:
-                    from_vertex = int(parts[0]) - 1  # Переводим в 0-индексацию
-                    to_vertex = int(parts[1]) - 1
-                    weight = int(parts[2]) if len(parts) > 2 else 1
-                    edges.append((from_vertex, to_vertex, weight))
+        self._is_directed = not self._timed_is_symmetric()
+    
+    def _load_edges(self, sources: array, targets: array, weights: array):
+        """Загружает граф из массивов дуг (0-индексация)."""
+        if self._storage == 'sparse':
+            self._set_csr(sources, targets, weights)
+            return
         
         # Создаем матрицу смежности
         self._adjacency_matrix = [[0] * self._vertices_count for _ in range(self._vertices_count)]
-        for from_v, to_v, weight in edges:
+        for from_v, to_v, weight in zip(sources, targets, weights):
             self._adjacency_matrix[from_v][to_v] = weight
         
         # Определяем, является ли граф ориентированным
-        self._is_directed = not self._is_symmetric()
+        self._is_directed = not self._timed_is_symmetric()
         
         # Создаем списки смежности
         self._create_adjacency_lists()
     
+    def _load_matrix_sparse(self, rows: Iterable[List[int]]):
+        """Загружает матрицу смежности, сохраняя только ненулевые ячейки."""
+        sources = array(TARGET_TYPECODE)
+        targets = array(TARGET_TYPECODE)
+        weights = array(WEIGHT_TYPECODE)
+        count = 0
+        for row in rows:
+            columns = [j for j, weight in enumerate(row) if weight != 0]
+            sources.extend([count] * len(columns))
+            targets.extend(columns)
+            weights.extend(row[j] for j in columns)
+            count += 1
+        
+        if count != self._vertices_count:
+            raise ValueError("Количество строк не соответствует количеству вершин")
+        
+        self._set_csr(sources, targets, weights)
+    
+    def _load_adjacency_list_sparse(self, rows: Iterable[List[Tuple[int, int]]]):
+        """Загружает списки смежности сразу в CSR-массивы."""
+        offsets = array(OFFSET_TYPECODE, [0])
+        targets = array(TARGET_TYPECODE)
+        weights = array(WEIGHT_TYPECODE)
+        for adj_list in rows:
+            for vertex, weight in adj_list:
+                targets.append(vertex - 1)
+                weights.append(weight)
+            offsets.append(len(targets))
+        offsets.extend([len(targets)] * (self._vertices_count + 1 - len(offsets)))
+        
+        self._set_rows(offsets, targets, weights)
+        self._is_directed = not self._timed_is_symmetric()
+    
+    def _set_rows(self, offsets: Sequence[int], targets: Sequence[int], weights: Sequence[int]):
+        """
+        Строит CSR-представление из списков смежности в CSR-форме (порядок файла).
+        
+        Строки в порядке файла сохраняются в _rows, только если они отличаются
+        от отсортированных строк CSR (другой порядок, повторы или веса <= 0).
+        Ориентированность не определяется.
+        """
+        if len(offsets) != self._vertices_count + 1:
+            raise ValueError("Количество строк не соответствует количеству вершин")
+        sources = array(TARGET_TYPECODE)
+        for u in range(self._vertices_count):
+            sources.extend([u] * (offsets[u + 1] - offsets[u]))
+        self._offsets, self._targets, self._weights = build_csr(
+            self._vertices_count, sources, array(TARGET_TYPECODE, targets), weights)
+        if not (self._targets == targets and self._offsets == offsets and self._weights == weights
+                and all(w > 0 for w in weights)):
+            self._rows = (offsets, targets, weights)
+    
+    def _set_csr(self, sources: array, targets: array, weights: array):
+        """Строит CSR-представление из массивов дуг и определяет ориентированность."""
+        self._offsets, self._targets, self._weights = build_csr(
+            self._vertices_count, sources, targets, weights)
+        self._is_directed = not self._timed_is_symmetric()
+    
+    def _find_edge(self, u: int, v: int) -> int:
+        """Возвращает индекс дуги u->v в CSR-массивах (0-индексация) или -1."""
+        lo, hi = self._offsets[u], self._offsets[u + 1]
+        i = bisect_left(self._targets, v, lo, hi)
+        if i < hi and self._targets[i] == v:
+            return i
+        return -1
+    
     def _create_adjacency_matrix(self):
         """Создает матрицу смежности из списков смежности."""
         self._adjacency_matrix = [[0] * self._vertices_count for _ in range(self._vertices_count)]
@@ -132,12 +318,44 @@ class Graph:
                 if self._adjacency_matrix[i][j] > 0:
                     self._adjacency_lists[i].append((j + 1, self._adjacency_matrix[i][j]))  # Переводим в 1-индексацию
     
+    def _record_phase(self, phase: str, seconds: float):
+        """Сохраняет время этапа загрузки в load_profile() и передаёт его в profile_hook."""
+        self._load_profile[f'{phase}_seconds'] = seconds
+        if self._profile_hook is not None:
+            self._profile_hook(phase, seconds)
+    
+    def _timed_is_symmetric(self) -> bool:
+        """Вызывает _is_symmetric() и записывает его время как этап 'symmetry'."""
+        started = time.perf_counter()
+        symmetric = self._is_symmetric()
+        self._record_phase('symmetry', time.perf_counter() - started)
+        return symmetric
+    
     def _is_symmetric(self) -> bool:
-        """Проверяет, является ли матрица смежности симметричной."""
-        for i in range(self._vertices_count):
-            for j in range(i + 1, self._vertices_count):
-                if self._adjacency_matrix[i][j] != self._adjacency_matrix[j][i]:
+        """
+        Проверяет, является ли матрица смежности симметричной.
+        
+        Для CSR сравниваются отсортированные дуги (u, v, w) и (v, u, w),
+        для матрицы - блоки строк с соответствующими блоками столбцов (NumPy)
+        либо строка со столбцом. Проверка останавливается на первом расхождении.
+        """
+        if self._storage == 'sparse':
+            return is_symmetric_csr(self._vertices_count, self._offsets, self._targets, self._weights)
+        if np is not None:
+            # Строки [start, stop) правее диагонали сравниваются со столбцами
+            # [start, stop) ниже неё; в памяти одновременно не больше двух блоков
+            matrix, n = self._adjacency_matrix, self._vertices_count
+            step = max(1, SYMMETRY_BLOCK_CELLS // max(n, 1))
+            for start in range(0, n, step):
+                stop = min(start + step, n)
+                rows = np.array([row[start:] for row in matrix[start:stop]], dtype=np.int64)
+                columns = np.array([row[start:stop] for row in matrix[start:]], dtype=np.int64)
+                if not np.array_equal(rows, columns.T):
                     return False
+            return True
+        for row, column in zip(self._adjacency_matrix, zip(*self._adjacency_matrix)):
+            if tuple(row) != column:
+                return False
         return True
     
     def size(self) -> int:
@@ -148,6 +366,9 @@ class Graph:
         """Возвращает вес ребра/дуги между двумя вершинами."""
         if vertex1 < 1 or vertex1 > self._vertices_count or vertex2 < 1 or vertex2 > self._vertices_count:
             raise ValueError("Номер вершины должен быть в диапазоне [1, size]")
+        if self._storage == 'sparse':
+            i = self._find_edge(vertex1 - 1, vertex2 - 1)
+            return self._weights[i] if i >= 0 else 0
         return self._adjacency_matrix[vertex1 - 1][vertex2 - 1]
     
     def is_edge(self, vertex1: int, vertex2: int) -> bool:
@@ -156,16 +377,46 @@ class Graph:
     
     def adjacency_matrix(self) -> List[List[int]]:
         """Возвращает матрицу смежности графа/орграфа."""
+        if self._storage == 'sparse':
+            # Матрица V×V строится только по явному запросу
+            matrix = [[0] * self._vertices_count for _ in range(self._vertices_count)]
+            for u in range(self._vertices_count):
+                row = matrix[u]
+                for i in range(self._offsets[u], self._offsets[u + 1]):
+                    row[self._targets[i]] = self._weights[i]
+            return matrix
         return [row[:] for row in self._adjacency_matrix]
     
     def adjacency_list(self, vertex: int) -> List[int]:
         """Возвращает список смежных вершин для данной вершины."""
         if vertex < 1 or vertex > self._vertices_count:
             raise ValueError("Номер вершины должен быть в диапазоне [1, size]")
+        if self._rows is not None:
+            offsets, targets, _ = self._rows
+            return [v + 1 for v in targets[offsets[vertex - 1]:offsets[vertex]]]
+        if self._storage == 'sparse':
+            lo, hi = self._offsets[vertex - 1], self._offsets[vertex]
+            return [v + 1 for v, w in zip(self._targets[lo:hi], self._weights[lo:hi]) if w > 0]
         return [v for v, _ in self._adjacency_lists[vertex - 1]]
     
     def list_of_edges(self, vertex: Optional[int] = None) -> List[Tuple[int, int, int]]:
         """Возвращает список рёбер графа."""
+        if self._storage == 'sparse':
+            if vertex is None:
+                vertices = range(1, self._vertices_count + 1)
+            elif vertex < 1 or vertex > self._vertices_count:
+                raise ValueError("Номер вершины должен быть в диапазоне [1, size]")
+            else:
+                if self._rows is not None:
+                    offsets, targets, weights = self._rows
+                    lo, hi = offsets[vertex - 1], offsets[vertex]
+                    return [(vertex, v + 1, w) for v, w in zip(targets[lo:hi], weights[lo:hi])]
+                vertices = (vertex,)
+            edges = []
+            for u in vertices:
+                lo, hi = self._offsets[u - 1], self._offsets[u]
+                edges.extend((u, v + 1, w) for v, w in zip(self._targets[lo:hi], self._weights[lo:hi]) if w > 0)
+            return edges
         if vertex is None:
             # Возвращаем все рёбра
             edges = []
@@ -182,4 +433,52 @@ class Graph:
     
     def is_directed(self) -> bool:
         """Возвращает True, если граф ориентированный, False, если простой."""
-        return self._is_directed 
\ No newline at end of file
+        return self._is_directed
+    
+    def load_profile(self) -> Dict[str, float]:
+        """
+        Возвращает статистику загрузки графа.
+        
+        Returns:
+            словарь с ключами 'bytes' (размер файла), 'parse_seconds' (время
+            разбора и построения), 'parse_mb_per_s' (скорость разбора, МБ/с),
+            'symmetry_seconds' (время определения ориентированности; нет при
+            загрузке из кэша) и 'cache_hit' (граф загружен из двоичного кэша)
+        """
+        return dict(self._load_profile)
+    
+    def storage(self) -> str:
+        """Возвращает способ хранения графа ('dense' или 'sparse')."""
+        return self._storage
+    
+    def csr(self) -> Tuple[array, array, array]:
+        """
+        Возвращает массивы смежности в формате CSR (0-индексация).
+        
+        Содержимое совпадает с adjacency_list(): соседи вершины u (в том же порядке)
+        лежат в targets[offsets[u]:offsets[u + 1]], их веса - в weights.
+        Массивы общие для всех вызовов и не должны изменяться.
+        
+        Returns:
+            кортеж (offsets, targets, weights)
+        """
+        if self._adjacency_arrays is None:
+            if self._storage == 'dense':
+                self._adjacency_arrays = csr_from_lists(self._adjacency_lists)
+            elif self._rows is not None:
+                self._adjacency_arrays = self._rows
+            elif all(w > 0 for w in self._weights):
+                self._adjacency_arrays = (self._offsets, self._targets, self._weights)
+            else:
+                # Ячейки с неположительным весом не являются рёбрами для обходов
+                offsets = array(OFFSET_TYPECODE, [0])
+                targets = array(TARGET_TYPECODE)
+                weights = array(WEIGHT_TYPECODE)
+                for u in range(self._vertices_count):
+                    for i in range(self._offsets[u], self._offsets[u + 1]):
+                        if self._weights[i] > 0:
+                            targets.append(self._targets[i])
+                            weights.append(self._weights[i])
+                    offsets.append(len(targets))
+                self._adjacency_arrays = (offsets, targets, weights)
+        return self._adjacency_arrays
@@ -0,0 +1,168 @@
+"""
+Двоичный формат карты высот для больших карт.
+
+Формат файла (little-endian):
+- заголовок HEADER: сигнатура, версия, rows, cols, размер высоты в байтах
+  (2 - int16, 4 - int32), наименьшая и наибольшая высота
+- высоты: rows * cols значений по строкам
+
+Map открывает такой файл через mmap (см. Map.is_mapped): страницы высот
+читаются с диска только при обращении к ним, маски соседей строятся по
+плиткам по мере надобности. Текстовую карту можно преобразовать построчно
+функцией convert_map, не загружая её в память целиком.
+"""
+
+from array import array
+from typing import Iterable, Optional, Sequence, Tuple
+import mmap
+import os
+import struct
+import sys
+
+GRID_SUFFIX = '.grid'
+MAGIC = b'MAPGRID\x00'
+VERSION = 1
+
+# Размер высоты в байтах -> код типа array/memoryview
+TYPECODES = {2: 'h', 4: 'i'}
+INT16_RANGE = (-(1 << 15), (1 << 15) - 1)
+
+# сигнатура, версия, rows, cols, размер высоты, min, max
+HEADER = struct.Struct('<8sIIIIii')
+
+
+def is_grid_file(path: str) -> bool:
+    """Начинается ли файл с сигнатуры двоичной карты."""
+    with open(path, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def write_grid(path: str, rows: int, cols: int, row_values: Iterable[Sequence[int]], itemsize: int = 4):
+    """
+    Записывает двоичную карту построчно (атомарно, через временный файл).
+
+    Args:
+        row_values: rows строк по cols высот
+        itemsize: 2 (int16) или 4 (int32)
+
+    Raises:
+        ValueError: неверное количество строк или столбцов, высота вне int16
+        OSError: если файл не удалось записать
+    """
+    typecode = TYPECODES[itemsize]
+    low, high = None, None
+    count = 0
+    temp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp, 'wb') as file:
+            file.write(bytes(HEADER.size))
+            for values in row_values:
+                try:
+                    row = array(typecode, values)
+                except OverflowError:
+                    raise ValueError(f"Высота в строке {count + 1} не помещается в int{8 * itemsize}")
+                if len(row) != cols:
+                    raise ValueError(f"Количество элементов в строке {count + 1} не соответствует количеству столбцов")
+                if row:
+                    low = min(row) if low is None else min(low, min(row))
+                    high = max(row) if high is None else max(high, max(row))
+                if sys.byteorder != 'little':
+                    row.byteswap()
+                file.write(row.tobytes())
+                count += 1
+            if count != rows:
+                raise ValueError("Количество строк не соответствует указанному")
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, VERSION, rows, cols, itemsize, low or 0, high or 0))
+        os.replace(temp, path)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+def _text_rows(text_path: str) -> Tuple[int, int, Iterable[Sequence[int]]]:
+    """Размеры текстовой карты и итератор по её строкам (как Map._load_from_file)."""
+    with open(text_path, 'r', encoding='utf-8') as file:
+        first = next((line for line in file if line.strip()), None)
+        if first is None:
+            raise ValueError("Файл пуст")
+        rows = 0
+        for line in file:
+            if line.strip():
+                rows += 1
+    try:
+        header_rows, cols = map(int, first.split())
+        has_header = True
+    except ValueError:
+        has_header = False
+        rows += 1
+        cols = len(first.split())
+    else:
+        rows = header_rows
+
+    def values():
+        with open(text_path, 'r', encoding='utf-8') as file:
+            lines = (line for line in file if line.strip())
+            if has_header:
+                next(lines)
+            for line in lines:
+                yield map(int, line.split())
+    return rows, cols, values()
+
+
+def convert_map(text_path: str, grid_path: Optional[str] = None, itemsize: Optional[int] = None) -> str:
+    """
+    Преобразует текстовую карту в двоичную, читая файл по строкам.
+
+    Args:
+        grid_path: файл результата (по умолчанию <text_path>.grid)
+        itemsize: 2 или 4; по умолчанию int16, если все высоты в него помещаются
+                  (определяется дополнительным проходом по файлу)
+
+    Returns:
+        путь к двоичной карте
+    """
+    grid_path = grid_path or text_path + GRID_SUFFIX
+    rows, cols, values = _text_rows(text_path)
+    if itemsize is None:
+        low, high = INT16_RANGE
+        itemsize = 2
+        for row in _text_rows(text_path)[2]:
+            if any(not low <= value <= high for value in row):
+                itemsize = 4
+                break
+    write_grid(grid_path, rows, cols, values, itemsize)
+    return grid_path
+
+
+def open_grid(path: str) -> Tuple[int, int, Sequence[int], int, int]:
+    """
+    Открывает двоичную карту.
+
+    Высоты - memoryview поверх mmap с копированием при записи: изменения
+    (Map.set_height) не попадают в файл. На машинах с обратным порядком байт
+    высоты читаются в память целиком.
+
+    Returns:
+        (rows, cols, высоты по строкам, наименьшая высота, наибольшая высота)
+
+    Raises:
+        ValueError: файл повреждён или имеет другую версию формата
+    """
+    with open(path, 'rb') as file:
+        header = file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError("Файл карты повреждён")
+        magic, version, rows, cols, itemsize, low, high = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or itemsize not in TYPECODES:
+            raise ValueError("Неизвестный формат двоичной карты")
+        size = HEADER.size + rows * cols * itemsize
+        if os.fstat(file.fileno()).st_size != size:
+            raise ValueError("Файл карты повреждён")
+        typecode = TYPECODES[itemsize]
+        if sys.byteorder != 'little' or rows * cols == 0:
+            heights = array(typecode, file.read())
+            heights.byteswap()
+            return rows, cols, heights, low, high
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+    return rows, cols, memoryview(mapped)[HEADER.size:].cast(typecode), low, high
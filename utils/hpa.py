@@ -0,0 +1,367 @@
+"""
+Иерархический поиск пути (HPA*) на карте (задание 12).
+
+Карта делится на квадратные кластеры cluster_size × cluster_size. На каждой
+границе соседних кластеров непрерывные отрезки клеток, проходимых с обеих
+сторон (входы), дают переходы: короткий вход - один переход в середине,
+длинный (от ENTRANCE_SPLIT клеток) - два на концах. Клетки переходов - вершины
+абстрактного графа; рёбра - шаг через границу (1 + |Δh|) и точные расстояния
+с учётом высот между вершинами одного кластера (Дейкстра внутри кластера).
+
+Запрос: старт и цель соединяются с вершинами своих кластеров, A* ищет путь в
+абстрактном графе, затем путь уточняется до клеток:
+- 'fast' - каждый участок внутри кластера - кратчайший путь внутри этого
+  кластера; длина равна длине абстрактного пути (почти оптимальна);
+- 'exact' - A* по клеткам коридора: кластеров найденного пути и их соседей;
+  путь кратчайший среди путей внутри коридора, не длиннее 'fast' и обычно
+  совпадает по длине с поиском по всей карте.
+Ни один режим не гарантирует глобально кратчайший путь: точный ответ даёт
+task12.astar_search.
+"""
+
+import heapq
+import time
+import weakref
+from operator import and_
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .map import Map
+from .pathfinding import SearchStats, phase_timer
+
+# Сторона кластера по умолчанию
+CLUSTER_SIZE = 16
+# Вход не короче этого получает два перехода (на концах), короче - один
+ENTRANCE_SPLIT = 6
+# Способы уточнения абстрактного пути
+MODES = ('fast', 'exact')
+
+# Иерархии, уже построенные для объекта Map: Map -> {cluster_size: HierarchicalMap}
+_hierarchies: "weakref.WeakKeyDictionary[Map, Dict[int, HierarchicalMap]]" = weakref.WeakKeyDictionary()
+
+
+class HierarchicalMap:
+    """
+    Абстрактный граф HPA* над картой.
+
+    Атрибуты:
+        edges: вершина (номер клетки) -> список пар (вершина, стоимость)
+        cluster_nodes: номер кластера -> список его вершин
+        build_seconds: время построения
+        version: версия карты (Map.version), для которой построен граф
+    """
+
+    def __init__(self, map_obj: Map, cluster_size: int = CLUSTER_SIZE):
+        started = time.perf_counter()
+        self.map = map_obj
+        # Версия карты, для которой построен граф
+        self.version = map_obj.version()
+        self.cluster_size = cluster_size
+        rows, cols = map_obj.size()
+        self.cluster_rows = (rows + cluster_size - 1) // cluster_size
+        self.cluster_cols = (cols + cluster_size - 1) // cluster_size
+        self.edges: Dict[int, List[Tuple[int, int]]] = {}
+        self.cluster_nodes: List[List[int]] = [[] for _ in range(self.cluster_rows * self.cluster_cols)]
+        self._intra_masks = self._build_intra_masks()
+        self._add_transitions()
+        for nodes in self.cluster_nodes:
+            self._connect_cluster(nodes)
+        self.build_seconds = time.perf_counter() - started
+
+    def cluster_of(self, cell: int) -> int:
+        """Номер кластера клетки."""
+        row, col = self.map.position(cell)
+        size = self.cluster_size
+        return row // size * self.cluster_cols + col // size
+
+    def node_count(self) -> int:
+        """Количество вершин абстрактного графа."""
+        return len(self.edges)
+
+    def edge_count(self) -> int:
+        """Количество (ориентированных) рёбер абстрактного графа."""
+        return sum(len(adjacent) for adjacent in self.edges.values())
+
+    def _build_intra_masks(self) -> bytearray:
+        """
+        Маски соседей без переходов через границы кластеров: поиск с ними не
+        выходит из кластера стартовой клетки. Строятся построчно операциями над
+        байтами без цикла по клеткам.
+        """
+        rows, cols = self.map.size()
+        size = self.cluster_size
+        masks, _ = self.map.neighbor_table()
+        # Биты направлений: 1 - вверх, 2 - влево, 4 - вправо, 8 - вниз
+        column_pattern = bytes(15 & ~(2 if col % size == 0 else 0) & ~(4 if col % size == size - 1 else 0)
+                               for col in range(cols))
+        result = bytearray(len(masks))
+        for row in range(rows):
+            pattern = column_pattern
+            clear = (1 if row % size == 0 else 0) | (8 if row % size == size - 1 else 0)
+            if clear:
+                pattern = bytes(value & ~clear for value in column_pattern)
+            begin = row * cols
+            result[begin:begin + cols] = bytes(map(and_, masks[begin:begin + cols], pattern))
+        return result
+
+    def _add_node(self, cell: int):
+        if cell not in self.edges:
+            self.edges[cell] = []
+            self.cluster_nodes[self.cluster_of(cell)].append(cell)
+
+    def _add_transition(self, a: int, b: int):
+        """Переход через границу между соседними клетками a и b."""
+        heights = self.map.heights()
+        cost = 1 + abs(heights[a] - heights[b])
+        self._add_node(a)
+        self._add_node(b)
+        self.edges[a].append((b, cost))
+        self.edges[b].append((a, cost))
+
+    def _add_transitions(self):
+        """Находит входы на всех границах кластеров и добавляет переходы."""
+        rows, cols = self.map.size()
+        size = self.cluster_size
+        heights = self.map.heights()
+        # Вертикальные границы: столбцы col | col + 1, отрезки по строкам кластера
+        for col in range(size - 1, cols - 1, size):
+            for top in range(0, rows, size):
+                self._add_entrances([(row * cols + col, row * cols + col + 1)
+                                     for row in range(top, min(top + size, rows))], heights)
+        # Горизонтальные границы: строки row | row + 1, отрезки по столбцам кластера
+        for row in range(size - 1, rows - 1, size):
+            for left in range(0, cols, size):
+                self._add_entrances([(row * cols + col, (row + 1) * cols + col)
+                                     for col in range(left, min(left + size, cols))], heights)
+
+    def _add_entrances(self, pairs: List[Tuple[int, int]], heights):
+        """Делит пары клеток вдоль границы на входы и добавляет их переходы."""
+        run: List[Tuple[int, int]] = []
+        for a, b in pairs + [(-1, -1)]:
+            if a >= 0 and heights[a] > 0 and heights[b] > 0:
+                run.append((a, b))
+                continue
+            if len(run) >= ENTRANCE_SPLIT:
+                self._add_transition(*run[0])
+                self._add_transition(*run[-1])
+            elif run:
+                self._add_transition(*run[len(run) // 2])
+            run = []
+
+    def _cluster_distances(self, source: int, targets: Iterable[int]) -> Dict[int, int]:
+        """Расстояния внутри кластера от source до достижимых клеток targets."""
+        heights = self.map.heights()
+        _, table = self.map.neighbor_table()
+        masks = self._intra_masks
+        remaining = set(targets)
+        dist = {source: 0}
+        found = {}
+        heap = [(0, source)]
+        while heap and remaining:
+            cost, u = heapq.heappop(heap)
+            if cost > dist[u]:
+                continue
+            if u in remaining:
+                remaining.discard(u)
+                found[u] = cost
+            height = heights[u]
+            for step in table[masks[u]]:
+                v = u + step
+                new_cost = cost + 1 + abs(heights[v] - height)
+                if new_cost < dist.get(v, new_cost + 1):
+                    dist[v] = new_cost
+                    heapq.heappush(heap, (new_cost, v))
+        return found
+
+    def _connect_cluster(self, nodes: List[int]):
+        """Рёбра между всеми парами вершин кластера с точными внутренними расстояниями."""
+        for i, a in enumerate(nodes):
+            others = nodes[i + 1:]
+            if not others:
+                continue
+            for b, cost in self._cluster_distances(a, others).items():
+                self.edges[a].append((b, cost))
+                self.edges[b].append((a, cost))
+
+    def _search_cells(self, s: int, g: int, clusters: Set[int],
+                      stats: Optional[SearchStats]) -> Tuple[List[int], int]:
+        """
+        A* (манхэттенская эвристика) по клеткам кластеров clusters.
+
+        Returns:
+            (номера клеток пути, длина) или ([], 0), если пути нет
+        """
+        heights = self.map.heights()
+        masks, table = self.map.neighbor_table()
+        _, cols = self.map.size()
+        size = self.cluster_size
+        cluster_cols = self.cluster_cols
+        goal_row, goal_col = divmod(g, cols)
+        g_score = {s: 0}
+        came_from = {}
+        heap = [(0, s, 0)]
+        expanded = 0
+        pushes = peak = 1
+        pops = stale = 0
+        path: List[int] = []
+        length = 0
+        while heap:
+            if len(heap) > peak:
+                peak = len(heap)
+            _, u, cost = heapq.heappop(heap)
+            pops += 1
+            if u == g:
+                path = [g]
+                while u != s:
+                    u = came_from[u]
+                    path.append(u)
+                path.reverse()
+                length = cost
+                break
+            if cost > g_score[u]:
+                stale += 1
+                continue
+            expanded += 1
+            height = heights[u]
+            for step in table[masks[u]]:
+                v = u + step
+                row, col = divmod(v, cols)
+                if row // size * cluster_cols + col // size not in clusters:
+                    continue
+                new_cost = cost + 1 + abs(heights[v] - height)
+                if new_cost < g_score.get(v, new_cost + 1):
+                    g_score[v] = new_cost
+                    came_from[v] = u
+                    heapq.heappush(heap, (new_cost + abs(row - goal_row) + abs(col - goal_col), v, new_cost))
+                    pushes += 1
+        if stats is not None:
+            stats.forward_expanded += expanded
+            stats.count_queue(pushes, pops, stale, peak)
+        return path, length
+
+    def _abstract_path(self, s: int, g: int, stats: Optional[SearchStats]) -> Optional[List[int]]:
+        """
+        A* в абстрактном графе, дополненном стартом и целью.
+
+        Returns:
+            последовательность клеток s, вершины..., g или None, если пути нет
+        """
+        _, cols = self.map.size()
+        heights = self.map.heights()
+        goal_row, goal_col = divmod(g, cols)
+        s_cluster = self.cluster_of(s)
+        g_cluster = self.cluster_of(g)
+        to_goal = self._cluster_distances(g, self.cluster_nodes[g_cluster]) if self.map.is_passable(g) else {}
+
+        def adjacency(u: int) -> List[Tuple[int, int]]:
+            if u in self.edges and u != s:
+                adjacent = list(self.edges[u])
+                if u in to_goal:
+                    adjacent.append((g, to_goal[u]))
+                return adjacent
+            # Старт и соседние с ним клетки других кластеров не обязательно
+            # вершины графа: их рёбра - расстояния внутри своего кластера
+            cluster = self.cluster_of(u)
+            targets = self.cluster_nodes[cluster] + ([g] if cluster == g_cluster else [])
+            adjacent = list(self._cluster_distances(u, targets).items())
+            adjacent.extend(self.edges.get(u, ()))
+            if u == s:
+                # Шаги из старта через границу (непроходимый старт не бывает вершиной)
+                adjacent.extend((v, 1 + abs(heights[v] - heights[s])) for v in self.map.neighbor_ids(s)
+                                if self.cluster_of(v) != s_cluster)
+            return adjacent
+
+        # Вершина -1 - цель
+        best = {s: 0}
+        came_from: Dict[int, int] = {}
+        heap = [(0, s, 0)]
+        expanded = 0
+        found = False
+        while heap:
+            _, u, cost = heapq.heappop(heap)
+            if u == -1:
+                found = True
+                break
+            if cost > best[u]:
+                continue
+            expanded += 1
+            for v, weight in adjacency(u):
+                if v == g:
+                    v = -1
+                new_cost = cost + weight
+                if new_cost < best.get(v, new_cost + 1):
+                    best[v] = new_cost
+                    came_from[v] = u
+                    row, col = divmod(v, cols) if v >= 0 else (goal_row, goal_col)
+                    heapq.heappush(heap, (new_cost + abs(row - goal_row) + abs(col - goal_col), v, new_cost))
+        if stats is not None:
+            stats.abstract_expanded += expanded
+        if not found:
+            return None
+        nodes = [g]
+        u = came_from[-1]
+        while u != s:
+            nodes.append(u)
+            u = came_from[u]
+        nodes.append(s)
+        nodes.reverse()
+        return nodes
+
+    def find_path(self, s: int, g: int, mode: str = 'fast',
+                  stats: Optional[SearchStats] = None) -> Tuple[List[int], int]:
+        """
+        Путь между клетками s и g.
+
+        Args:
+            mode: 'fast' или 'exact' (см. описание модуля)
+            stats: счётчики; клетки уточнения - forward_expanded, вершины
+                   абстрактного графа - abstract_expanded
+
+        Returns:
+            (номера клеток пути, длина) или ([], 0), если пути нет
+        """
+        if mode not in MODES:
+            raise ValueError(f"Неизвестный режим HPA*: {mode}")
+        if s == g:
+            return [s], 0
+        with phase_timer(stats, 'connectivity'):
+            if not self.map.connected(s, g):
+                return [], 0
+        with phase_timer(stats, 'abstract'):
+            nodes = self._abstract_path(s, g, stats)
+        if nodes is None:
+            return [], 0
+        path = [s]
+        length = 0
+        heights = self.map.heights()
+        for a, b in zip(nodes, nodes[1:]):
+            cluster = self.cluster_of(a)
+            if cluster != self.cluster_of(b):
+                path.append(b)
+                length += 1 + abs(heights[a] - heights[b])
+                continue
+            with phase_timer(stats, 'refine'):
+                segment, cost = self._search_cells(a, b, {cluster}, stats)
+            path.extend(segment[1:])
+            length += cost
+        if mode == 'exact':
+            corridor = set()
+            for cluster in {self.cluster_of(cell) for cell in path}:
+                row, col = divmod(cluster, self.cluster_cols)
+                for r in range(max(row - 1, 0), min(row + 2, self.cluster_rows)):
+                    for c in range(max(col - 1, 0), min(col + 2, self.cluster_cols)):
+                        corridor.add(r * self.cluster_cols + c)
+            with phase_timer(stats, 'exact'):
+                path, length = self._search_cells(s, g, corridor, stats)
+        return path, length
+
+
+def hierarchy_for(map_obj: Map, cluster_size: int = CLUSTER_SIZE) -> HierarchicalMap:
+    """
+    Иерархия HPA* для карты (строится один раз на объект Map и размер кластера;
+    после изменения карты строится заново).
+    """
+    by_size = _hierarchies.setdefault(map_obj, {})
+    hierarchy = by_size.get(cluster_size)
+    if hierarchy is None or hierarchy.version != map_obj.version():
+        hierarchy = by_size[cluster_size] = HierarchicalMap(map_obj, cluster_size)
+    return hierarchy
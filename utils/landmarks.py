@@ -0,0 +1,269 @@
+"""
+Ориентиры (landmarks) для эвристики ALT на карте (задание 12).
+
+Для K клеток-ориентиров L заранее вычисляются точные расстояния d(L, x) до всех
+клеток с учётом высот. Стоимость шага симметрична, поэтому по неравенству
+треугольника |d(L, g) - d(L, x)| <= d(x, g) - согласованная нижняя оценка,
+учитывающая рельеф, в отличие от манхэттенской, чебышёвской и евклидовой.
+
+Ориентиры выбираются по очереди как самые удалённые от уже выбранных клетки
+(первый - самая удалённая от клетки самой большой области связности карты).
+
+Формат файла <файл карты>.alt (little-endian):
+- заголовок HEADER: сигнатура, версия, rows, cols, K, mtime (нс), размер и хэш
+  файла карты
+- cells: K × int32 - номера клеток-ориентиров
+- tables: K × (rows * cols) × int32 - расстояния от каждого ориентира
+
+Файл открывается через mmap, таблицы - memoryview поверх отображённого файла.
+"""
+
+from array import array
+from collections import Counter
+from operator import indexOf
+from typing import Callable, List, Optional, Sequence
+import mmap
+import os
+import struct
+import sys
+import weakref
+
+from .cache import file_digest
+from .map import Map
+
+LANDMARK_SUFFIX = '.alt'
+MAGIC = b'MAPALT\x00\x00'
+VERSION = 1
+
+# Количество ориентиров по умолчанию
+DEFAULT_LANDMARKS = 8
+# Сколько лучших для запроса ориентиров использует эвристика
+ACTIVE_LANDMARKS = 4
+
+# Расстояние до недостижимой клетки
+UNREACHED = (1 << 31) - 1
+
+# сигнатура, версия, rows, cols, K, mtime_ns, размер, хэш
+HEADER = struct.Struct('<8sIIIIqq16s')
+
+# Ориентиры, уже построенные или загруженные для объекта Map
+_landmarks_by_map: "weakref.WeakKeyDictionary[Map, Landmarks]" = weakref.WeakKeyDictionary()
+
+
+def distance_table(map_obj: Map, source: int) -> array:
+    """
+    Расстояния от клетки source до всех клеток карты (Дейкстра с очередью Диала).
+
+    Returns:
+        array('i') по номерам клеток, UNREACHED для недостижимых
+    """
+    heights = map_obj.heights()
+    masks, table = map_obj.neighbor_table()
+    dist = array('i', [UNREACHED]) * len(heights)
+    dist[source] = 0
+    low, high = map_obj.height_range()
+    ring = 2 + high - low
+    buckets = [[] for _ in range(ring)]
+    buckets[0].append(source)
+    pending = 1
+    cost = 0
+    while pending:
+        slot = cost % ring
+        bucket = buckets[slot]
+        if bucket:
+            buckets[slot] = []
+            pending -= len(bucket)
+            for u in bucket:
+                if dist[u] != cost:
+                    continue  # Устаревшая запись
+                height = heights[u]
+                for step in table[masks[u]]:
+                    v = u + step
+                    new_cost = cost + 1 + abs(heights[v] - height)
+                    if new_cost < dist[v]:
+                        dist[v] = new_cost
+                        buckets[new_cost % ring].append(v)
+                        pending += 1
+        cost += 1
+    return dist
+
+
+class Landmarks:
+    """
+    Клетки-ориентиры и таблицы расстояний от них.
+
+    tables[k][x] - расстояние от ориентира cells[k] до клетки x (UNREACHED, если
+    клетка недостижима или непроходима).
+    """
+
+    def __init__(self, rows: int, cols: int, cells: Sequence[int], tables: Sequence[Sequence[int]],
+                 version: int = 0):
+        self.rows = rows
+        self.cols = cols
+        self.cells = list(cells)
+        self.tables = list(tables)
+        # Версия карты (Map.version), для которой вычислены таблицы
+        self.version = version
+
+    def count(self) -> int:
+        """Количество ориентиров."""
+        return len(self.cells)
+
+    def heuristic(self, goal: int, start: Optional[int] = None,
+                  active: int = ACTIVE_LANDMARKS) -> Callable[[int], int]:
+        """
+        Эвристика ALT до клетки goal как функция номера клетки.
+
+        Используются ориентиры, от которых goal достижима; если задан start,
+        из них берутся active ориентиров с наибольшей оценкой для start.
+        Результат не меньше манхэттенского расстояния; для клеток, недостижимых
+        от ориентира, оценка по нему не используется, поэтому эвристика
+        согласована и для непроходимой стартовой клетки.
+        """
+        pairs = [(table, table[goal]) for table in self.tables if table[goal] != UNREACHED]
+        if start is not None and len(pairs) > active:
+            pairs.sort(key=lambda pair: abs(pair[0][start] - pair[1]) if pair[0][start] != UNREACHED else -1,
+                       reverse=True)
+            pairs = pairs[:active]
+        cols = self.cols
+        goal_row, goal_col = divmod(goal, cols)
+
+        def alt(cell: int) -> int:
+            bound = abs(cell // cols - goal_row) + abs(cell % cols - goal_col)
+            for table, goal_distance in pairs:
+                estimate = table[cell]
+                if estimate == UNREACHED:
+                    continue  # Непроходимая стартовая клетка или другая компонента
+                estimate -= goal_distance
+                if estimate < 0:
+                    estimate = -estimate
+                if estimate > bound:
+                    bound = estimate
+            return bound
+        return alt
+
+    def save(self, path: str, map_file: str):
+        """
+        Записывает ориентиры в файл (атомарно, через временный файл).
+
+        Raises:
+            OSError: если файл не удалось записать
+        """
+        stat = os.stat(map_file)
+        header = HEADER.pack(MAGIC, VERSION, self.rows, self.cols, len(self.cells),
+                             stat.st_mtime_ns, stat.st_size, file_digest(map_file))
+        sections = [array('i', self.cells)] + [array('i', table) for table in self.tables]
+        if sys.byteorder != 'little':
+            for section in sections:
+                section.byteswap()
+        temp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp, 'wb') as file:
+                file.write(header)
+                for section in sections:
+                    file.write(section.tobytes())
+            os.replace(temp, path)
+        finally:
+            if os.path.exists(temp):
+                os.remove(temp)
+
+    @classmethod
+    def load(cls, path: str, map_file: str) -> Optional['Landmarks']:
+        """
+        Открывает файл ориентиров через mmap, если он соответствует файлу карты.
+
+        Returns:
+            объект Landmarks или None, если файла нет, он повреждён или устарел
+        """
+        if sys.byteorder != 'little' or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(mapped) < HEADER.size:
+            return None
+        magic, version, rows, cols, count, mtime_ns, size, digest = HEADER.unpack_from(mapped)
+        if magic != MAGIC or version != VERSION:
+            return None
+        stat = os.stat(map_file)
+        if stat.st_size != size:
+            return None
+        if stat.st_mtime_ns != mtime_ns and file_digest(map_file) != digest:
+            return None
+        n = rows * cols
+        if len(mapped) != HEADER.size + 4 * count * (n + 1):
+            return None
+        view = memoryview(mapped)[HEADER.size:].cast('i')
+        tables = [view[count + k * n:count + (k + 1) * n] for k in range(count)]
+        return cls(rows, cols, view[:count].tolist(), tables)
+
+
+def select_landmarks(map_obj: Map, count: int = DEFAULT_LANDMARKS) -> Landmarks:
+    """
+    Выбирает count ориентиров и вычисляет таблицы расстояний от них.
+
+    Каждый следующий ориентир - клетка с наибольшим расстоянием до ближайшего
+    из уже выбранных (в самой большой области связности). Если клеток
+    меньше, чем count, ориентиров будет меньше.
+    """
+    rows, cols = map_obj.size()
+    cells: List[int] = []
+    tables: List[array] = []
+    # Ориентиры выбираются в самой большой области связности карты (метки -
+    # array или memoryview разделяемой памяти, поэтому indexOf, а не index)
+    labels = map_obj.region_labels()
+    sizes = Counter(labels)
+    sizes.pop(0, None)
+    first = indexOf(labels, max(sizes, key=sizes.get)) if sizes else None
+    if first is None or count <= 0:
+        return Landmarks(rows, cols, cells, tables, map_obj.version())
+    # Расстояние до ближайшего ориентира, -1 - клетка вне компоненты
+    nearest = array('i', (-1 if d == UNREACHED else d for d in distance_table(map_obj, first)))
+    while len(cells) < count:
+        farthest = max(nearest)
+        if farthest <= 0:
+            break  # Все клетки компоненты уже ориентиры
+        cell = nearest.index(farthest)
+        table = distance_table(map_obj, cell)
+        cells.append(cell)
+        tables.append(table)
+        nearest = array('i', map(min, nearest, table))
+    return Landmarks(rows, cols, cells, tables, map_obj.version())
+
+
+def landmarks_for(map_obj: Map, count: int = DEFAULT_LANDMARKS, persist: bool = True) -> Landmarks:
+    """
+    Ориентиры для карты: из памяти, из файла <файл карты>.alt или построенные заново.
+
+    Построенные ориентиры сохраняются рядом с файлом карты (если persist и
+    запись возможна) и запоминаются для объекта map_obj. Для карты, изменённой
+    через set_height, файл не используется, а ориентиры пересчитываются
+    после каждого изменения.
+    """
+    landmarks = _landmarks_by_map.get(map_obj)
+    if landmarks is not None and landmarks.count() == count and landmarks.version == map_obj.version():
+        return landmarks
+    persist = persist and map_obj.version() == 0
+    map_file = map_obj.file_path()
+    path = map_file + LANDMARK_SUFFIX
+    landmarks = Landmarks.load(path, map_file) if persist else None
+    if landmarks is None or landmarks.count() != count:
+        landmarks = select_landmarks(map_obj, count)
+        if persist:
+            try:
+                landmarks.save(path, map_file)
+            except OSError:
+                pass  # Каталог только для чтения: ориентиры останутся в памяти
+    _landmarks_by_map[map_obj] = landmarks
+    return landmarks
+
+
+def remember_landmarks(map_obj: Map, landmarks: Landmarks):
+    """
+    Запоминает готовые ориентиры для объекта map_obj: landmarks_for вернёт их,
+    пока карта не изменится (например, таблицы, переданные процессу-обработчику
+    в разделяемой памяти, см. utils.shared_map).
+    """
+    _landmarks_by_map[map_obj] = landmarks
@@ -1,11 +1,128 @@
-from typing import List, Tuple, Optional
+from array import array
+from collections import OrderedDict
+from typing import Iterator, List, Tuple, Optional, Union
+import mmap
 import os
+import re
+
+from .dsu import DisjointSet
+from .grid_file import is_grid_file, open_grid
+
+# Смещения соседей в порядке возрастания номера клетки: вверх, влево, вправо, вниз
+# (бит k маски соседей соответствует направлению k)
+NEIGHBOR_DIRECTIONS = ((-1, 0), (0, -1), (0, 1), (1, 0))
+
+# Непрерывный отрезок проходимых клеток в байтах проходимости
+_PASSABLE_RUN = re.compile(b'\x01+')
+
+# Сторона плитки масок соседей карты, открытой через mmap (степень двойки)
+TILE_SIZE = 256
+
+
+class _TiledMasks:
+    """
+    Маски соседей карты, открытой через mmap: строятся плитками TILE_SIZE ×
+    TILE_SIZE при первом обращении к клетке плитки.
+    
+    Значения хранятся в анонимном mmap: страницы непостроенных плиток не
+    занимают память. Индексация номером клетки и срезом - как у bytearray.
+    """
+    
+    def __init__(self, heights, rows: int, cols: int):
+        self._heights = heights
+        self._rows = rows
+        self._cols = cols
+        self._shift = TILE_SIZE.bit_length() - 1
+        self._tile_cols = (cols + TILE_SIZE - 1) >> self._shift
+        tile_rows = (rows + TILE_SIZE - 1) >> self._shift
+        self._ready = bytearray(tile_rows * self._tile_cols)
+        self._data = mmap.mmap(-1, max(rows * cols, 1))
+        self._length = rows * cols
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            begin, end, step = key.indices(self._length)
+            if begin < end:
+                self._ensure_range(begin, end - 1)
+            return self._data[begin:end:step] if step != 1 else self._data[begin:end]
+        row, col = divmod(key, self._cols)
+        tile = (row >> self._shift) * self._tile_cols + (col >> self._shift)
+        if not self._ready[tile]:
+            self._build(tile)
+        return self._data[key]
+    
+    def __setitem__(self, cell: int, mask: int):
+        self[cell]  # Плитка строится до изменения, иначе построение затрёт значение
+        self._data[cell] = mask
+    
+    def built_tiles(self) -> int:
+        """Количество построенных плиток."""
+        return sum(self._ready)
+    
+    def _ensure_range(self, first: int, last: int):
+        """Строит плитки всех клеток с номерами first..last."""
+        first_row, first_col = divmod(first, self._cols)
+        last_row, last_col = divmod(last, self._cols)
+        if first_row != last_row:
+            first_col, last_col = 0, self._cols - 1
+        for tile_row in range(first_row >> self._shift, (last_row >> self._shift) + 1):
+            for tile_col in range(first_col >> self._shift, (last_col >> self._shift) + 1):
+                tile = tile_row * self._tile_cols + tile_col
+                if not self._ready[tile]:
+                    self._build(tile)
+    
+    def _build(self, tile: int):
+        """Маски клеток плитки - построчно операциями над байтами, как _build_neighbor_masks."""
+        rows, cols = self._rows, self._cols
+        heights = self._heights
+        tile_row, tile_col = divmod(tile, self._tile_cols)
+        row_begin = tile_row << self._shift
+        row_end = min(row_begin + TILE_SIZE, rows)
+        col_begin = tile_col << self._shift
+        col_end = min(col_begin + TILE_SIZE, cols)
+        width = col_end - col_begin
+        
+        def passable(row: int, begin: int, end: int) -> int:
+            base = row * cols
+            return int.from_bytes(bytes(map((0).__lt__, heights[base + begin:base + end])), 'little')
+        
+        for row in range(row_begin, row_end):
+            up = passable(row - 1, col_begin, col_end) if row > 0 else 0
+            down = passable(row + 1, col_begin, col_end) if row < rows - 1 else 0
+            # Проходимость строки с соседними столбцами: бит 0 - столбец col_begin - 1
+            line = passable(row, max(col_begin - 1, 0), min(col_end + 1, cols))
+            if col_begin == 0:
+                line <<= 8
+            left = line & ((1 << 8 * width) - 1)
+            right = line >> 16
+            mask = up | left << 1 | right << 2 | down << 3
+            base = row * cols
+            self._data[base + col_begin:base + col_end] = mask.to_bytes(width, 'little')
+        self._ready[tile] = 1
 
 
 class Map:
     """
     Класс для работы с лабиринтами и картами.
     Поддерживает поиск пути между точками с различными эвристиками.
+    
+    Высоты хранятся в одном плоском массиве array('i') по строкам, клетка (row, col)
+    имеет номер row * cols + col. Для каждой клетки заранее вычислена маска соседей
+    (4 бита): бит k установлен, если сосед в направлении NEIGHBOR_DIRECTIONS[k]
+    лежит внутри карты и проходим (высота > 0). Поиск пути может работать только
+    с номерами клеток: neighbor_offsets(cell) возвращает заранее построенный кортеж
+    смещений номеров без выделения памяти.
+    
+    Метки областей связности проходимых клеток (region_labels) вычисляются при
+    первом обращении; connected(s, g) после этого отвечает за O(1). Изменение
+    карты через set_height увеличивает версию (version) и сбрасывает метки.
+    
+    Двоичная карта (utils.grid_file) открывается через mmap (is_mapped): высоты
+    читаются с диска по страницам при обращении, маски соседей строятся
+    плитками TILE_SIZE × TILE_SIZE при первом обращении к клетке плитки.
     """
     
     def __init__(self, file_path: str):
@@ -15,14 +132,56 @@ class Map:
         Args:
             file_path: путь к файлу с данными лабиринта/карты
         """
-        self._matrix = []
+        self._heights = array('i')
+        self._neighbor_masks = bytearray()
+        self._mask_offsets: List[Tuple[int, ...]] = []
         self._rows = 0
         self._cols = 0
+        self._file_path = file_path
+        self._version = 0
+        self._labels: Optional[array] = None
+        self._height_range: Optional[Tuple[int, int]] = None
+        self._mapped = False
         
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Файл {file_path} не найден")
         
-        self._load_from_file(file_path)
+        if is_grid_file(file_path):
+            self._rows, self._cols, self._heights, low, high = open_grid(file_path)
+            self._height_range = (low, high)
+            self._mapped = True
+            self._neighbor_masks = _TiledMasks(self._heights, self._rows, self._cols)
+            self._build_mask_offsets()
+        else:
+            self._load_from_file(file_path)
+            self._build_neighbor_masks()
+    
+    @classmethod
+    def from_buffers(cls, rows: int, cols: int, heights, masks, labels=None,
+                     file_path: str = '', version: int = 0) -> 'Map':
+        """
+        Карта поверх готовых массивов высот и масок соседей (например, memoryview
+        разделяемой памяти, см. utils.shared_map) без копирования и разбора файла.
+        
+        Массивы не должны изменяться, пока карта используется; set_height для
+        такой карты изменит их у всех владельцев.
+        
+        Args:
+            labels: метки областей (region_labels) или None - вычислить при обращении
+            version: версия исходной карты
+        """
+        map_obj = cls.__new__(cls)
+        map_obj._heights = heights
+        map_obj._neighbor_masks = masks
+        map_obj._rows = rows
+        map_obj._cols = cols
+        map_obj._file_path = file_path
+        map_obj._version = version
+        map_obj._labels = labels
+        map_obj._height_range = None
+        map_obj._mapped = False
+        map_obj._build_mask_offsets()
+        return map_obj
     
     def _load_from_file(self, file_path: str):
         """Загружает лабиринт/карту из файла."""
@@ -40,14 +199,47 @@ class Map:
             self._rows = len(lines)
             self._cols = len(lines[0].strip().split())
             data_lines = lines
-        self._matrix = []
+        heights = array('i')
         for i, line in enumerate(data_lines):
-            row = [int(x) for x in line.strip().split()]
+            row = array('i', map(int, line.split()))
             if len(row) != self._cols:
                 raise ValueError(f"Количество элементов в строке {i+1} не соответствует количеству столбцов")
-            self._matrix.append(row)
-        if len(self._matrix) != self._rows:
+            heights.extend(row)
+        if len(data_lines) != self._rows:
             raise ValueError("Количество строк не соответствует указанному")
+        self._heights = heights
+    
+    def _build_neighbor_masks(self):
+        """
+        Строит маски соседей для всех клеток.
+        
+        Проходимость клеток - байты 0/1; сдвиги на 1 и на cols дают проходимость
+        соседа по каждому направлению. Четыре таких байтовых массива объединяются
+        в одно целое число (бит k каждого байта - направление k) операциями над
+        целыми числами, без цикла по клеткам.
+        """
+        rows, cols = self._rows, self._cols
+        n = rows * cols
+        passable = bytes(map((0).__lt__, self._heights))
+        up = b'\0' * cols + passable[:n - cols] if rows > 1 else bytes(n)
+        down = passable[cols:] + b'\0' * cols if rows > 1 else bytes(n)
+        left = bytearray(b'\0' + passable[:n - 1]) if n else bytearray()
+        right = bytearray(passable[1:] + b'\0') if n else bytearray()
+        # Соседи слева у первого столбца и справа у последнего лежат в другой строке
+        left[0::cols] = bytes(len(left[0::cols]))
+        right[cols - 1::cols] = bytes(len(right[cols - 1::cols]))
+        mask = 0
+        for bit, shifted in enumerate((up, left, right, down)):
+            mask |= int.from_bytes(shifted, 'little') << bit
+        self._neighbor_masks = bytearray(mask.to_bytes(n, 'little'))
+        self._build_mask_offsets()
+    
+    def _build_mask_offsets(self):
+        """Таблица смещений номеров соседей для каждой из 16 масок."""
+        cols = self._cols
+        steps = [dr * cols + dc for dr, dc in NEIGHBOR_DIRECTIONS]
+        self._mask_offsets = [tuple(step for bit, step in enumerate(steps) if mask_value >> bit & 1)
+                              for mask_value in range(16)]
     
     def __getitem__(self, key: Tuple[int, int]) -> int:
         """
@@ -62,7 +254,7 @@ class Map:
         row, col = key
         if row < 0 or row >= self._rows or col < 0 or col >= self._cols:
             raise IndexError("Координаты выходят за границы карты")
-        return self._matrix[row][col]
+        return self._heights[row * self._cols + col]
     
     def size(self) -> Tuple[int, int]:
         """
@@ -73,6 +265,201 @@ class Map:
         """
         return self._rows, self._cols
     
+    def version(self) -> int:
+        """Номер версии карты: увеличивается при каждом изменении (set_height)."""
+        return self._version
+    
+    def is_mapped(self) -> bool:
+        """Открыта ли карта из двоичного файла через mmap (высоты не в памяти целиком)."""
+        return self._mapped
+    
+    def height_range(self) -> Tuple[int, int]:
+        """
+        Наименьшая и наибольшая высота карты (для двоичной карты - из заголовка,
+        без просмотра высот).
+        """
+        if self._height_range is None:
+            self._height_range = (min(self._heights), max(self._heights)) if self._heights else (0, 0)
+        return self._height_range
+    
+    def set_height(self, row: int, col: int, height: int):
+        """
+        Изменяет высоту клетки.
+        
+        Обновляет маски соседей клетки и её соседей, увеличивает версию и
+        сбрасывает метки областей (они будут пересчитаны при обращении).
+        """
+        if row < 0 or row >= self._rows or col < 0 or col >= self._cols:
+            raise IndexError("Координаты выходят за границы карты")
+        cell = row * self._cols + col
+        self._heights[cell] = height
+        if self._height_range is not None:
+            low, high = self._height_range
+            self._height_range = (min(low, height), max(high, height))
+        steps = [dr * self._cols + dc for dr, dc in NEIGHBOR_DIRECTIONS]
+        for target in [cell] + list(self._adjacent_cells(row, col)):
+            target_row, target_col = divmod(target, self._cols)
+            mask = 0
+            for bit, (dr, dc) in enumerate(NEIGHBOR_DIRECTIONS):
+                r, c = target_row + dr, target_col + dc
+                if 0 <= r < self._rows and 0 <= c < self._cols and self._heights[target + steps[bit]] > 0:
+                    mask |= 1 << bit
+            self._neighbor_masks[target] = mask
+        self._version += 1
+        self._labels = None
+    
+    def _adjacent_cells(self, row: int, col: int) -> Iterator[int]:
+        """Номера соседних клеток внутри карты (независимо от проходимости)."""
+        for dr, dc in NEIGHBOR_DIRECTIONS:
+            r, c = row + dr, col + dc
+            if 0 <= r < self._rows and 0 <= c < self._cols:
+                yield r * self._cols + c
+    
+    def region_labels(self) -> array:
+        """
+        Метки областей связности проходимых клеток: array('i') по номерам клеток,
+        0 - непроходимая клетка, области нумеруются с 1 в порядке первой клетки.
+        
+        Вычисляются один раз (до изменения карты). Массив общий и не должен изменяться.
+        """
+        if self._labels is None:
+            self._labels = self._label_regions()
+        return self._labels
+    
+    def _label_regions(self) -> array:
+        """
+        Разметка областей через DSU по отрезкам строк.
+        
+        Отрезки подряд идущих проходимых клеток каждой строки находятся
+        регулярным выражением по байтам проходимости; отрезки соседних строк,
+        перекрывающиеся по столбцам, объединяются в DSU. Метки заполняются
+        срезами, без цикла по клеткам.
+        """
+        rows, cols = self._rows, self._cols
+        passable = bytes(map((0).__lt__, self._heights))
+        runs: List[Tuple[int, int]] = []
+        row_starts = []
+        for row in range(rows):
+            row_starts.append(len(runs))
+            runs.extend(match.span() for match in _PASSABLE_RUN.finditer(passable, row * cols, (row + 1) * cols))
+        row_starts.append(len(runs))
+        regions = DisjointSet(len(runs))
+        for row in range(1, rows):
+            # Два указателя по отрезкам предыдущей (сдвинутым на строку) и текущей строки
+            i, i_end = row_starts[row - 1], row_starts[row]
+            j, j_end = row_starts[row], row_starts[row + 1]
+            while i < i_end and j < j_end:
+                upper_begin, upper_end = runs[i]
+                lower_begin, lower_end = runs[j]
+                if upper_begin + cols < lower_end and lower_begin < upper_end + cols:
+                    regions.union(i, j)
+                if upper_end + cols <= lower_end:
+                    i += 1
+                else:
+                    j += 1
+        labels = array('i', [0]) * (rows * cols)
+        numbers = {}
+        for index, (begin, end) in enumerate(runs):
+            root = regions.find(index)
+            if root not in numbers:
+                numbers[root] = len(numbers) + 1
+            labels[begin:end] = array('i', [numbers[root]]) * (end - begin)
+        return labels
+    
+    def connected(self, s: int, g: int) -> bool:
+        """
+        Есть ли путь из клетки s в клетку g (по номерам клеток).
+        
+        В непроходимую клетку войти нельзя, но из непроходимого старта можно
+        выйти в любого проходимого соседа. Для карты, открытой через mmap,
+        False означает только непроходимую цель - True не гарантирует пути.
+        """
+        if s == g:
+            return True
+        if self._mapped:
+            # Метки потребовали бы просмотра всей карты: только проверка цели
+            return self._heights[g] > 0
+        labels = self.region_labels()
+        target = labels[g]
+        if not target:
+            return False
+        if labels[s]:
+            return labels[s] == target
+        return any(labels[cell] == target for cell in self.neighbor_ids(s))
+    
+    def file_path(self) -> str:
+        """Путь к файлу, из которого загружена карта."""
+        return self._file_path
+    
+    def cell_id(self, row: int, col: int) -> int:
+        """Номер клетки (row, col) в плоском массиве: row * cols + col."""
+        return row * self._cols + col
+    
+    def position(self, cell: int) -> Tuple[int, int]:
+        """Координаты (row, col) клетки с номером cell."""
+        return divmod(cell, self._cols)
+    
+    def heights(self) -> array:
+        """
+        Возвращает плоский массив высот по строкам (индекс - номер клетки):
+        array('i') или, для карты в mmap, memoryview.
+        
+        Массив общий для всех вызовов и не должен изменяться.
+        """
+        return self._heights
+    
+    def is_passable(self, cell: int) -> bool:
+        """Проверяет, проходима ли клетка (высота > 0)."""
+        return self._heights[cell] > 0
+    
+    def neighbor_offsets(self, cell: int) -> Tuple[int, ...]:
+        """
+        Смещения номеров проходимых соседей клетки: соседи - cell + смещение.
+        
+        Кортеж заранее построен для каждой из 16 масок, порядок - по возрастанию
+        номера соседа.
+        """
+        return self._mask_offsets[self._neighbor_masks[cell]]
+    
+    def neighbor_table(self) -> Tuple[bytearray, List[Tuple[int, ...]]]:
+        """
+        Маски соседей всех клеток и таблица смещений по маске.
+        
+        Соседи клетки cell - cell + step для step in table[masks[cell]]; в горячих
+        циклах это избавляет от вызова метода на каждую клетку.
+        Массивы общие для всех вызовов и не должны изменяться.
+        
+        Returns:
+            кортеж (masks, table)
+        """
+        return self._neighbor_masks, self._mask_offsets
+    
+    def restricted_masks(self, cells) -> bytearray:
+        """
+        Маски соседей подграфа, состоящего только из клеток cells.
+        
+        Клетки вне cells не имеют соседей, переходы в клетки вне cells убраны.
+        Используется вместе с таблицей из neighbor_table().
+        """
+        allowed = bytearray(self._rows * self._cols)
+        for cell in cells:
+            allowed[cell] = 1
+        steps = [dr * self._cols + dc for dr, dc in NEIGHBOR_DIRECTIONS]
+        masks = bytearray(len(allowed))
+        for cell in cells:
+            mask = self._neighbor_masks[cell]
+            restricted = 0
+            for bit, step in enumerate(steps):
+                if mask >> bit & 1 and allowed[cell + step]:
+                    restricted |= 1 << bit
+            masks[cell] = restricted
+        return masks
+    
+    def neighbor_ids(self, cell: int) -> Iterator[int]:
+        """Номера проходимых соседей клетки в порядке возрастания."""
+        for step in self._mask_offsets[self._neighbor_masks[cell]]:
+            yield cell + step
+    
     def neighbors(self, row: int, col: int) -> List[Tuple[int, int]]:
         """
         Возвращает список соседних клеток.
@@ -82,25 +469,12 @@ class Map:
             col: номер столбца
             
         Returns:
-            список координат соседних клеток [(row, col), ...]
+            список координат соседних клеток [(row, col), ...] в порядке возрастания
         """
         if row < 0 or row >= self._rows or col < 0 or col >= self._cols:
             return []
-        
-        neighbors = []
-        # Изменяем порядок направлений для соответствия ожидаемому пути
-        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # вправо, вниз, влево, вверх
-        
-        for dr, dc in directions:
-            new_row, new_col = row + dr, col + dc
-            if (0 <= new_row < self._rows and 
-                0 <= new_col < self._cols and 
-                self._matrix[new_row][new_col] > 0):  # проходимая клетка
-                neighbors.append((new_row, new_col))
-        
-        # Сортируем соседей для детерминированности
-        neighbors.sort()
-        return neighbors
+        cell = row * self._cols + col
+        return [divmod(cell + step, self._cols) for step in self.neighbor_offsets(cell)]
     
     def distance(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> int:
         """
@@ -115,8 +489,8 @@ class Map:
         """
         row1, col1 = pos1
         row2, col2 = pos2
-        height1 = self._matrix[row1][col1]
-        height2 = self._matrix[row2][col2]
+        height1 = self._heights[row1 * self._cols + col1]
+        height2 = self._heights[row2 * self._cols + col2]
         
         return abs(row2 - row1) + abs(col2 - col1) + abs(height2 - height1)
     
@@ -140,4 +514,45 @@ class Map:
     
     def get_matrix(self) -> List[List[int]]:
         """Возвращает копию матрицы карты."""
-        return [row[:] for row in self._matrix] 
\ No newline at end of file
+        cols = self._cols
+        return [self._heights[i:i + cols].tolist() for i in range(0, self._rows * cols, cols)] 
+
+# Наибольшее количество карт в кэше load_map
+MAP_CACHE_SIZE = 4
+
+# Загруженные карты: (абсолютный путь, mtime, размер файла) -> Map
+_map_cache: "OrderedDict[Tuple[str, int, int], Map]" = OrderedDict()
+
+
+def load_map(file_path: str) -> Map:
+    """
+    Загружает карту с кэшированием: повторный вызов для неизменённого файла
+    возвращает тот же объект Map без повторного разбора.
+    
+    Файл считается изменённым, если изменились его mtime или размер. Хранятся
+    последние MAP_CACHE_SIZE карт.
+    
+    Args:
+        file_path: путь к файлу с данными лабиринта/карты
+        
+    Returns:
+        объект Map (общий для всех вызовов; изменённая через set_height карта
+        из кэша не возвращается - файл разбирается заново)
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Файл {file_path} не найден")
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    if key in _map_cache and _map_cache[key].version() == 0:
+        _map_cache.move_to_end(key)
+        return _map_cache[key]
+    map_obj = Map(file_path)
+    _map_cache[key] = map_obj
+    while len(_map_cache) > MAP_CACHE_SIZE:
+        _map_cache.popitem(last=False)
+    return map_obj
+
+
+def as_map(source: Union[Map, str]) -> Map:
+    """Возвращает source, если это Map, иначе загружает карту из файла через load_map."""
+    return source if isinstance(source, Map) else load_map(source)
@@ -0,0 +1,250 @@
+"""
+Потоковый разбор текстовых файлов графа.
+
+Файл читается блоками фиксированного размера (CHUNK_SIZE байт), каждый блок
+обрезается по последнему переводу строки и разбирается целиком: токены блока
+переводятся в числа одним вызовом (numpy.fromstring + array.frombytes, если
+установлен NumPy, иначе array(..., map(int, chunk.split()))).
+Текст файла целиком в памяти не хранится, поэтому пиковое потребление
+определяется размером итогового представления графа.
+
+Поддерживаются три формата: 'matrix', 'adjacency_list', 'edges'.
+"""
+
+from array import array
+from itertools import repeat
+from operator import sub
+from typing import BinaryIO, Iterator, List, Tuple
+
+from .csr import TARGET_TYPECODE, WEIGHT_TYPECODE
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Размер блока чтения по умолчанию (1 МБ)
+CHUNK_SIZE = 1 << 20
+
+
+def read_vertices_count(file: BinaryIO) -> int:
+    """
+    Читает первую строку файла - количество вершин.
+
+    Raises:
+        ValueError: если файл пуст или первая строка не является числом
+    """
+    first_line = file.readline()
+    if not first_line:
+        raise ValueError("Файл пуст")
+    try:
+        return int(first_line.strip())
+    except ValueError:
+        raise ValueError("Первая строка должна содержать количество вершин")
+
+
+def iter_chunks(file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Читает файл блоками, каждый из которых заканчивается на границе строки.
+
+    Args:
+        file: файл, открытый в двоичном режиме
+        chunk_size: размер блока чтения в байтах
+
+    Yields:
+        блоки целых строк
+    """
+    tail = b''
+    while True:
+        block = file.read(chunk_size)
+        if not block:
+            break
+        block = tail + block
+        cut = block.rfind(b'\n') + 1
+        if cut == 0:
+            # Строка длиннее блока - дочитываем дальше
+            tail = block
+            continue
+        tail = block[cut:]
+        yield block[:cut]
+    if tail:
+        yield tail
+
+
+def tokenize(chunk: bytes) -> array:
+    """
+    Переводит все целые числа блока в массив int64.
+
+    Если NumPy не смог разобрать блок целиком, блок разбирается через int(),
+    который и сообщает об ошибке формата.
+    """
+    if np is not None:
+        try:
+            parsed = np.fromstring(chunk, dtype=np.int64, sep=' ')
+        except ValueError:
+            parsed = None
+        if parsed is not None:
+            values = array(WEIGHT_TYPECODE)
+            values.frombytes(parsed.tobytes())
+            return values
+    return array(WEIGHT_TYPECODE, map(int, chunk.split()))
+
+
+def _count_lines(chunk: bytes) -> int:
+    """Количество строк в блоке (последняя строка может быть без перевода строки)."""
+    return chunk.count(b'\n') + (0 if chunk.endswith(b'\n') else 1)
+
+
+def _uniform_lines(chunk: bytes, columns: int) -> bool:
+    """
+    Каждая строка блока содержит ровно columns токенов.
+
+    Совпадения общего числа токенов с (строки × columns) недостаточно: короткая
+    и длинная строки дают ту же сумму, и срезы массива токенов перемешали бы
+    соседние строки. С NumPy начала токенов считаются по строкам одной
+    векторной операцией над байтами блока.
+    """
+    if np is not None:
+        buf = np.frombuffer(chunk, dtype=np.uint8)
+        word = buf > 32  # Пробел, табуляция, \r и \n - разделители
+        starts = np.empty(len(buf), dtype=np.uint8)
+        starts[0] = word[0]
+        np.greater(word[1:], word[:-1], out=starts[1:])
+        lines = np.flatnonzero(buf == 10) + 1
+        lines = np.concatenate(([0], lines[lines < len(buf)]))
+        return bool(np.all(np.add.reduceat(starts, lines, dtype=np.int64) == columns))
+    lines = chunk.split(b'\n')
+    if chunk.endswith(b'\n'):
+        lines.pop()
+    return all(map(columns.__eq__, map(len, map(bytes.split, lines))))
+
+
+def iter_matrix_rows(file: BinaryIO, n: int, chunk_size: int = CHUNK_SIZE) -> Iterator[List[int]]:
+    """
+    Потоково разбирает матрицу смежности, пустые строки пропускаются.
+
+    Args:
+        file: файл, открытый в двоичном режиме, после строки с количеством вершин
+        n: количество вершин
+        chunk_size: размер блока чтения в байтах
+
+    Yields:
+        строки матрицы длины n
+
+    Raises:
+        ValueError: если строка содержит не n элементов
+    """
+    for chunk in iter_chunks(file, chunk_size):
+        values = tokenize(chunk)
+        lines_count = _count_lines(chunk)
+        if len(values) == n * lines_count and _uniform_lines(chunk, n):
+            # Быстрый путь: все строки блока полные
+            for i in range(0, len(values), n):
+                yield values[i:i + n].tolist()
+            continue
+        for line in chunk.split(b'\n'):
+            if line.strip():
+                row = [int(x) for x in line.split()]
+                if len(row) != n:
+                    raise ValueError("Количество элементов в строке не соответствует количеству вершин")
+                yield row
+
+
+def _parse_adjacency_line(line: bytes) -> List[Tuple[int, int]]:
+    """Разбирает строку вида "2 5" или "2:1 5:3" в список пар (вершина, вес)."""
+    colons = line.count(b':')
+    if colons == 0:
+        return [(vertex, 1) for vertex in map(int, line.split())]
+    values = line.replace(b':', b' ').split()
+    if 2 * colons == len(values):
+        # Все элементы строки в формате "вершина:вес"
+        numbers = list(map(int, values))
+        return list(zip(numbers[0::2], numbers[1::2]))
+    adj_list = []
+    for part in line.split():
+        if b':' in part:
+            vertex, weight = part.split(b':')
+            adj_list.append((int(vertex), int(weight)))
+        else:
+            adj_list.append((int(part), 1))
+    return adj_list
+
+
+def iter_adjacency_rows(file: BinaryIO, n: int,
+                        chunk_size: int = CHUNK_SIZE) -> Iterator[List[Tuple[int, int]]]:
+    """
+    Потоково разбирает списки смежности.
+
+    Строка с номером i (считая пустые) описывает соседей вершины i + 1,
+    строки после n-й игнорируются.
+
+    Yields:
+        списки пар (вершина, вес) в 1-индексации
+    """
+    row = 0
+    for chunk in iter_chunks(file, chunk_size):
+        if chunk.endswith(b'\n'):
+            chunk = chunk[:-1]
+        for line in chunk.split(b'\n'):
+            if row >= n:
+                return
+            yield _parse_adjacency_line(line)
+            row += 1
+
+
+def iter_edge_chunks(file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[array, array, array]]:
+    """
+    Потоково разбирает список рёбер "из в [вес]", по одному блоку за раз.
+
+    Количество столбцов определяется по первой непустой строке. Если в каждой
+    строке блока ровно столько токенов, блок разбирается срезами массива без
+    построчной обработки, иначе - построчно.
+
+    Yields:
+        кортежи (sources, targets, weights) дуг блока в 0-индексации
+    """
+    columns = 0
+    for chunk in iter_chunks(file, chunk_size):
+        if not columns:
+            for line in chunk.split(b'\n'):
+                parts = line.split()
+                if len(parts) >= 2:
+                    columns = len(parts)
+                    break
+        sources = array(TARGET_TYPECODE)
+        targets = array(TARGET_TYPECODE)
+        weights = array(WEIGHT_TYPECODE)
+        values = tokenize(chunk)
+        if columns and len(values) == columns * _count_lines(chunk) and _uniform_lines(chunk, columns):
+            # Переводим в 0-индексацию
+            sources.extend(map(sub, values[0::columns], repeat(1)))
+            targets.extend(map(sub, values[1::columns], repeat(1)))
+            if columns > 2:
+                weights.extend(values[2::columns])
+            else:
+                weights.extend([1] * (len(values) // columns))
+        else:
+            for line in chunk.split(b'\n'):
+                parts = line.split()
+                if len(parts) >= 2:
+                    sources.append(int(parts[0]) - 1)  # Переводим в 0-индексацию
+                    targets.append(int(parts[1]) - 1)
+                    weights.append(int(parts[2]) if len(parts) > 2 else 1)
+        yield sources, targets, weights
+
+
+def parse_edges(file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Tuple[array, array, array]:
+    """
+    Потоково разбирает список рёбер "из в [вес]" в массивы дуг (см. iter_edge_chunks).
+
+    Returns:
+        кортеж (sources, targets, weights) в 0-индексации
+    """
+    sources = array(TARGET_TYPECODE)
+    targets = array(TARGET_TYPECODE)
+    weights = array(WEIGHT_TYPECODE)
+    for chunk_sources, chunk_targets, chunk_weights in iter_edge_chunks(file, chunk_size):
+        sources.extend(chunk_sources)
+        targets.extend(chunk_targets)
+        weights.extend(chunk_weights)
+    return sources, targets, weights
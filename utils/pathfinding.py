@@ -0,0 +1,287 @@
+"""
+Двунаправленный поиск пути на карте (задания 6 и 12).
+
+Стоимость шага между соседними клетками 1 + |Δh| симметрична, поэтому обратный
+поиск от цели идёт по тем же рёбрам, что и прямой. Поиск с потенциалом -
+двунаправленный A* со средними потенциалами: p(v) = (h_goal(v) - h_start(v)) / 2
+для прямого поиска и -p(v) для обратного. При согласованной эвристике
+приведённые стоимости рёбер неотрицательны, и остановка по условию
+top_f + top_r > mu верна так же, как для двунаправленного Дейкстры.
+
+Поиск продолжается до строгого неравенства top_f + top_r > mu, поэтому каждая
+клетка каждого кратчайшего пути раскрыта хотя бы одним направлением. По
+точным расстояниям обоих направлений собирается коридор - все клетки
+кратчайших путей, и путь восстанавливается повтором обычного
+(однонаправленного) поиска только по коридору: среди равных по длине путей
+выбирается тот же путь, что и при поиске по всей карте.
+"""
+
+import heapq
+import time
+from array import array
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.map import Map
+
+# Допуск сравнения для дробных потенциалов (евклидова эвристика)
+TIE_EPSILON = 1e-6
+
+# Расстояние до ещё не достигнутой клетки в массиве int32 (как INF_COST задания 6)
+UNREACHED = (1 << 31) - 1
+
+
+class SearchStats:
+    """
+    Счётчики поиска пути (клетка раскрыта, когда из очереди извлечена её
+    актуальная запись и просмотрены её соседи).
+
+    Однонаправленный поиск учитывается в forward_expanded. Операции с очередью
+    считаются для всех этапов поиска:
+    - pushes, pops - добавления в очередь и извлечения из неё (для очереди
+      Диала - добавления в корзины и просмотренные записи корзин);
+    - stale_pops - извлечённые устаревшие записи (клетка уже раскрыта дешевле);
+    - reopened - повторные раскрытия уже раскрытой клетки (A* с
+      несогласованной эвристикой);
+    - peak_open - наибольший размер очереди (сумма двух очередей
+      двунаправленного поиска);
+    - phases - время этапов в секундах по названию этапа (timer).
+    """
+
+    # Счётчики, которые складываются при объединении (merge)
+    COUNTERS = ('forward_expanded', 'backward_expanded', 'replay_expanded', 'abstract_expanded',
+                'pushes', 'pops', 'stale_pops', 'reopened')
+
+    def __init__(self):
+        self.forward_expanded = 0
+        self.backward_expanded = 0
+        # Повтор однонаправленного поиска в коридоре двунаправленного
+        self.replay_expanded = 0
+        # Вершины абстрактного графа HPA* (не клетки, в expanded не входят)
+        self.abstract_expanded = 0
+        self.pushes = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.reopened = 0
+        self.peak_open = 0
+        self.phases: Dict[str, float] = {}
+
+    @property
+    def expanded(self) -> int:
+        """Всего раскрыто клеток."""
+        return self.forward_expanded + self.backward_expanded + self.replay_expanded
+
+    def count_queue(self, pushes: int, pops: int, stale_pops: int, peak_open: int, reopened: int = 0):
+        """Добавляет счётчики очереди одного поиска."""
+        self.pushes += pushes
+        self.pops += pops
+        self.stale_pops += stale_pops
+        self.reopened += reopened
+        if peak_open > self.peak_open:
+            self.peak_open = peak_open
+
+    def merge(self, other: 'SearchStats', as_replay: bool = False):
+        """
+        Добавляет счётчики other (например, другого процесса). При as_replay
+        раскрытия other.forward_expanded учитываются как повтор (replay_expanded).
+        """
+        for name in self.COUNTERS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        if as_replay:
+            self.forward_expanded -= other.forward_expanded
+            self.replay_expanded += other.forward_expanded
+        self.peak_open = max(self.peak_open, other.peak_open)
+        for phase, seconds in other.phases.items():
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def timer(self, phase: str):
+        """Добавляет время выполнения блока with к этапу phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[phase] = self.phases.get(phase, 0.0) + time.perf_counter() - start
+
+    def __repr__(self) -> str:
+        return (f"SearchStats(forward={self.forward_expanded}, backward={self.backward_expanded}, "
+                f"replay={self.replay_expanded}, abstract={self.abstract_expanded}, "
+                f"pushes={self.pushes}, pops={self.pops}, stale={self.stale_pops}, "
+                f"reopened={self.reopened}, peak_open={self.peak_open})")
+
+
+def phase_timer(stats: Optional[SearchStats], phase: str):
+    """stats.timer(phase) или пустой контекст, если счётчики не заданы."""
+    return stats.timer(phase) if stats is not None else nullcontext()
+
+
+def bidirectional_search(map_obj: Map, s: int, g: int,
+                         potential: Optional[Callable[[int], float]] = None,
+                         stats: Optional[SearchStats] = None) -> Optional[Tuple[int, List[int]]]:
+    """
+    Двунаправленный Дейкстра (potential=None) или A* между клетками s и g.
+
+    Args:
+        map_obj: карта
+        s, g: номера клеток старта и цели
+        potential: потенциал прямого поиска p(v); обратный поиск использует -p(v)
+        stats: счётчики раскрытых клеток (дополняются)
+
+    Returns:
+        (длина кратчайшего пути, список клеток всех кратчайших путей) или None,
+        если пути нет
+    """
+    heights = map_obj.heights()
+    masks, table = map_obj.neighbor_table()
+    rows, cols = map_obj.size()
+    n = rows * cols
+    p = potential if potential is not None else (lambda cell: 0)
+    # Стартовая клетка может быть непроходимой: из неё выйти можно, войти - нет.
+    # Обратный поиск должен уметь в неё прийти.
+    start_is_wall = not map_obj.is_passable(s)
+    start_row, start_col = map_obj.position(s)
+
+    dist_f = array('i', [UNREACHED]) * n
+    dist_r = array('i', [UNREACHED]) * n
+    # Бит 1 - клетка раскрыта прямым поиском, бит 2 - обратным
+    done = bytearray(n)
+    corridor = []
+    dist_f[s] = 0
+    dist_r[g] = 0
+    heap_f = [(p(s), s)]
+    heap_r = [(-p(g), g)]
+    best = 0 if s == g else UNREACHED
+    expanded_f = expanded_r = 0
+    pushes = 2
+    pops = stale = 0
+    peak = 2
+
+    while heap_f and heap_r:
+        if heap_f[0][0] + heap_r[0][0] - best > TIE_EPSILON:
+            break
+        if len(heap_f) + len(heap_r) > peak:
+            peak = len(heap_f) + len(heap_r)
+        pops += 1
+        if len(heap_f) <= len(heap_r):
+            _, u = heapq.heappop(heap_f)
+            if done[u] & 1:
+                stale += 1
+                continue
+            if not done[u]:
+                corridor.append(u)
+            done[u] |= 1
+            expanded_f += 1
+            du = dist_f[u]
+            height = heights[u]
+            for step in table[masks[u]]:
+                v = u + step
+                nd = du + 1 + abs(heights[v] - height)
+                if nd < dist_f[v]:
+                    dist_f[v] = nd
+                    heapq.heappush(heap_f, (nd + p(v), v))
+                    pushes += 1
+                    if nd + dist_r[v] < best:
+                        best = nd + dist_r[v]
+        else:
+            _, u = heapq.heappop(heap_r)
+            if done[u] & 2:
+                stale += 1
+                continue
+            if not done[u]:
+                corridor.append(u)
+            done[u] |= 2
+            expanded_r += 1
+            if heights[u] <= 0:
+                continue  # В непроходимую клетку (цель или старт) рёбер нет
+            du = dist_r[u]
+            height = heights[u]
+            sources = [u + step for step in table[masks[u]]]
+            if start_is_wall:
+                row, col = divmod(u, cols)
+                if abs(row - start_row) + abs(col - start_col) == 1:
+                    sources.append(s)
+            for v in sources:
+                nd = du + 1 + abs(heights[v] - height)
+                if nd < dist_r[v]:
+                    dist_r[v] = nd
+                    heapq.heappush(heap_r, (nd - p(v), v))
+                    pushes += 1
+                    if nd + dist_f[v] < best:
+                        best = nd + dist_f[v]
+    if stats is not None:
+        stats.forward_expanded += expanded_f
+        stats.backward_expanded += expanded_r
+        stats.count_queue(pushes, pops, stale, peak)
+    if best >= UNREACHED:
+        return None
+    # Кратчайший путь - начало из клеток, раскрытых прямым поиском, и конец из
+    # клеток, раскрытых обратным: они стыкуются в клетке с d_f + d_r = best или
+    # на ребре (u, v) с d_f(u) + w + d_r(v) = best. От стыков по "тугим" рёбрам
+    # (d_f(u) + w = d_f(v) назад, d_r(v) + w = d_r(u) вперёд) собираются ровно
+    # клетки кратчайших путей.
+    # Расстояния до самих s и g точны, даже если их направление до них не дошло
+    for cell, side in ((s, 1), (g, 2)):
+        if not done[cell]:
+            corridor.append(cell)
+        done[cell] |= side
+    on_path = bytearray(n)
+    stack_f = []
+    stack_r = []
+    for u in corridor:
+        side = done[u]
+        if side == 3 and dist_f[u] + dist_r[u] == best:
+            on_path[u] = 1
+            stack_f.append(u)
+            stack_r.append(u)
+        if side & 1:
+            du = dist_f[u] - best
+            height = heights[u]
+            for step in table[masks[u]]:
+                v = u + step
+                if done[v] & 2 and du + 1 + abs(heights[v] - height) + dist_r[v] == 0:
+                    if not on_path[u]:
+                        on_path[u] = 1
+                        stack_f.append(u)
+                    if not on_path[v]:
+                        on_path[v] = 1
+                        stack_r.append(v)
+    kept = stack_f + stack_r
+    while stack_f:
+        v = stack_f.pop()
+        dv = dist_f[v]
+        height = heights[v]
+        sources = [v + step for step in table[masks[v]]] if height > 0 else []
+        if start_is_wall and height > 0:
+            row, col = divmod(v, cols)
+            if abs(row - start_row) + abs(col - start_col) == 1:
+                sources.append(s)
+        for u in sources:
+            if done[u] & 1 and not on_path[u] and dist_f[u] + 1 + abs(heights[u] - height) == dv:
+                on_path[u] = 1
+                stack_f.append(u)
+                kept.append(u)
+    while stack_r:
+        u = stack_r.pop()
+        du = dist_r[u]
+        height = heights[u]
+        for step in table[masks[u]]:
+            v = u + step
+            if done[v] & 2 and not on_path[v] and dist_r[v] + 1 + abs(heights[v] - height) == du:
+                on_path[v] = 1
+                stack_r.append(v)
+                kept.append(v)
+    return best, kept
+
+
+def bidirectional_corridor(map_obj: Map, s: int, g: int,
+                           potential: Optional[Callable[[int], float]] = None,
+                           stats: Optional[SearchStats] = None) -> Optional[bytearray]:
+    """
+    Маски соседей коридора двунаправленного поиска (см. Map.restricted_masks)
+    или None, если пути нет. Однонаправленный поиск с этими масками вместо
+    масок карты находит тот же путь, что и по всей карте.
+    """
+    found = bidirectional_search(map_obj, s, g, potential, stats)
+    if found is None:
+        return None
+    return map_obj.restricted_masks(found[1])
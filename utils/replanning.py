@@ -0,0 +1,174 @@
+"""
+Инкрементальное перепланирование пути на изменяющейся карте (D* Lite).
+
+Поиск идёт от цели к старту: g(x) - текущая оценка расстояния от x до цели,
+rhs(x) = min по соседям y (c(x, y) + g(y)) - оценка на один шаг вперёд.
+Клетка несогласована, если g != rhs; в очереди лежат только несогласованные
+клетки с ключом (min(g, rhs) + h(start, x) + km, min(g, rhs)). После изменения
+высот пересчитываются rhs только изменённых клеток и их соседей, и повторный
+поиск обрабатывает лишь затронутую ими часть карты, используя прежние g/rhs.
+km накапливает смещение эвристики при перемещении старта (move_start).
+
+Рёбра x -> y существуют, если y проходима; стоимость 1 + |h(x) - h(y)|.
+Эвристика - манхэттенское расстояние до старта (согласована для любых высот).
+"""
+
+import heapq
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .map import NEIGHBOR_DIRECTIONS, Map
+from .pathfinding import SearchStats
+
+
+class IncrementalPlanner:
+    """
+    Планировщик D* Lite для пары (старт, цель) на изменяемой карте.
+
+    Пример:
+        planner = IncrementalPlanner(map_obj, (0, 0), (9, 9))
+        path, length = planner.find_path()
+        planner.apply_changes([(3, 4, 0), (5, 5, 7)])   # (строка, столбец, высота)
+        path, length = planner.find_path()              # ремонт прежнего решения
+    """
+
+    def __init__(self, map_obj: Map, start: Tuple[int, int], goal: Tuple[int, int]):
+        self.map = map_obj
+        self._cols = map_obj.size()[1]
+        # Высоты и маски соседей изменяются set_height на месте
+        self._heights = map_obj.heights()
+        self._masks, self._table = map_obj.neighbor_table()
+        self._start = map_obj.cell_id(*start)
+        self._start_row, self._start_col = divmod(self._start, self._cols)
+        self._goal = map_obj.cell_id(*goal)
+        self._last_start = self._start
+        self._km = 0
+        self._g: Dict[int, float] = {}
+        self._rhs: Dict[int, float] = {self._goal: 0}
+        # Текущий ключ каждой клетки в очереди; записи кучи с другим ключом устарели
+        self._open: Dict[int, Tuple[float, float]] = {}
+        self._heap: List[Tuple[float, float, int]] = []
+        self._push(self._goal)
+
+    def _h(self, cell: int) -> int:
+        """Манхэттенское расстояние от старта до клетки."""
+        row, col = divmod(cell, self._cols)
+        return abs(row - self._start_row) + abs(col - self._start_col)
+
+    def _key(self, cell: int) -> Tuple[float, float]:
+        best = min(self._g.get(cell, math.inf), self._rhs.get(cell, math.inf))
+        return best + self._h(cell) + self._km, best
+
+    def _push(self, cell: int):
+        key = self._key(cell)
+        self._open[cell] = key
+        heapq.heappush(self._heap, (key[0], key[1], cell))
+
+    def _successors(self, cell: int) -> Iterable[Tuple[int, int]]:
+        """Пары (сосед, стоимость шага) для рёбер cell -> сосед."""
+        heights = self._heights
+        height = heights[cell]
+        for step in self._table[self._masks[cell]]:
+            yield cell + step, 1 + abs(heights[cell + step] - height)
+
+    def _predecessors(self, cell: int) -> List[int]:
+        """Клетки x с ребром x -> cell: проходимые соседи и непроходимый старт."""
+        if self._heights[cell] <= 0:
+            return []
+        result = [cell + step for step in self._table[self._masks[cell]]]
+        if self._heights[self._start] <= 0 and self._h(cell) == 1:
+            result.append(self._start)
+        return result
+
+    def _update_vertex(self, cell: int):
+        g = self._g
+        if cell != self._goal:
+            heights = self._heights
+            height = heights[cell]
+            best = math.inf
+            for step in self._table[self._masks[cell]]:
+                estimate = g.get(cell + step, math.inf) + 1 + abs(heights[cell + step] - height)
+                if estimate < best:
+                    best = estimate
+            self._rhs[cell] = best
+        self._open.pop(cell, None)
+        if g.get(cell, math.inf) != self._rhs.get(cell, math.inf):
+            self._push(cell)
+
+    def _compute_shortest_path(self, stats: Optional[SearchStats]):
+        expanded = 0
+        heap = self._heap
+        g = self._g
+        rhs = self._rhs
+        start = self._start
+        while heap:
+            k1, k2, u = heap[0]
+            if self._open.get(u) != (k1, k2):
+                heapq.heappop(heap)  # Устаревшая запись
+                continue
+            if (k1, k2) >= self._key(start) and rhs.get(start, math.inf) == g.get(start, math.inf):
+                break
+            heapq.heappop(heap)
+            new_key = self._key(u)
+            if (k1, k2) < new_key:
+                self._push(u)
+                continue
+            del self._open[u]
+            expanded += 1
+            if g.get(u, math.inf) > rhs.get(u, math.inf):
+                g[u] = rhs[u]
+                for p in self._predecessors(u):
+                    self._update_vertex(p)
+            else:
+                g[u] = math.inf
+                for p in self._predecessors(u) + [u]:
+                    self._update_vertex(p)
+        if stats is not None:
+            stats.forward_expanded += expanded
+
+    def find_path(self, stats: Optional[SearchStats] = None) -> Tuple[List[Tuple[int, int]], int]:
+        """
+        Кратчайший путь от старта до цели на текущей карте.
+
+        Returns:
+            (путь [(row, col), ...], длина) или ([], 0), если пути нет
+            (как task12.astar_search)
+        """
+        self._compute_shortest_path(stats)
+        total = self._g.get(self._start, math.inf)
+        if total == math.inf:
+            return [], 0
+        path = [self.map.position(self._start)]
+        cell = self._start
+        while cell != self._goal:
+            cell = min(((cost + self._g.get(neighbor, math.inf), neighbor)
+                        for neighbor, cost in self._successors(cell)))[1]
+            path.append(self.map.position(cell))
+        return path, int(total)
+
+    def move_start(self, start: Tuple[int, int]):
+        """Переносит старт (например, агент прошёл часть пути); цель не меняется."""
+        self._start = self.map.cell_id(*start)
+        self._start_row, self._start_col = divmod(self._start, self._cols)
+        self._km += self._h(self._last_start)
+        self._last_start = self._start
+
+    def apply_changes(self, changes: Iterable[Tuple[int, int, int]]):
+        """
+        Изменяет высоты клеток карты (0 - клетка становится непроходимой) и
+        обновляет rhs затронутых клеток: изменённой и её соседей.
+
+        Args:
+            changes: тройки (строка, столбец, новая высота)
+        """
+        rows, cols = self.map.size()
+        touched = set()
+        for row, col, height in changes:
+            self.map.set_height(row, col, height)
+            touched.add(row * cols + col)
+            for dr, dc in NEIGHBOR_DIRECTIONS:
+                r, c = row + dr, col + dc
+                if 0 <= r < rows and 0 <= c < cols:
+                    touched.add(r * cols + c)
+        for cell in touched:
+            self._update_vertex(cell)
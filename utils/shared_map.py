@@ -0,0 +1,91 @@
+"""
+Карта в разделяемой памяти для пакетного поиска пути в нескольких процессах.
+
+Процесс-владелец один раз копирует высоты (int32), маски соседей и метки
+областей (int32) в блок shared_memory; процесс-обработчик подключается к
+блоку по имени и собирает объект Map поверх memoryview без копирования и без
+передачи массивов через pickle. Карта, открытая из двоичного файла через mmap
+и не изменённая, не копируется: обработчики открывают тот же файл, и страницы
+высот разделяются через страничный кэш ОС. Таблицы ориентиров ALT, если они
+нужны, кладутся в тот же блок.
+"""
+
+from array import array
+from typing import Optional, Tuple
+
+from .landmarks import Landmarks, remember_landmarks
+from .map import Map
+
+# Описание блока для обработчиков: (имя блока или None, rows, cols, путь к файлу,
+# версия, количество ориентиров ALT в блоке, скопирована ли карта в блок)
+SharedMapInfo = Tuple[Optional[str], int, int, str, int, int, bool]
+
+
+def share_map(map_obj: Map, landmarks: Optional[Landmarks] = None):
+    """
+    Копирует карту (и таблицы ориентиров ALT, если заданы) в новый блок
+    разделяемой памяти.
+
+    Блок: ориентиры (K × int32 клеток, K × rows * cols × int32 таблиц), затем,
+    если карта копируется, высоты, метки областей (int32) и маски соседей.
+    Ориентиры строятся один раз в процессе-владельце: обработчик получает их
+    готовыми, даже если файла .alt нет (persist=False, каталог только для
+    чтения, карта изменена через set_height).
+
+    Returns:
+        (блок SharedMemory или None, описание для attach_map); владелец
+        закрывает и удаляет блок (close, unlink) после завершения обработчиков
+    """
+    rows, cols = map_obj.size()
+    n = rows * cols
+    version = map_obj.version()
+    copy_map = not (map_obj.is_mapped() and version == 0)
+    count = landmarks.count() if landmarks is not None else 0
+    if not copy_map and not count:
+        return None, (None, rows, cols, map_obj.file_path(), 0, 0, False)
+    from multiprocessing import shared_memory
+    size = 4 * count * (n + 1) + (9 * n if copy_map else 0)
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    view = block.buf
+    offset = 0
+    if count:
+        sections = [array('i', landmarks.cells)] + [array('i', table) for table in landmarks.tables]
+        for section in sections:
+            view[offset:offset + 4 * len(section)] = section.tobytes()
+            offset += 4 * len(section)
+    if copy_map:
+        masks, _ = map_obj.neighbor_table()
+        view[offset:offset + 4 * n] = array('i', map_obj.heights()).tobytes()
+        view[offset + 4 * n:offset + 8 * n] = array('i', map_obj.region_labels()).tobytes()
+        view[offset + 8 * n:offset + 9 * n] = bytes(masks[:n])
+    return block, (block.name, rows, cols, map_obj.file_path(), version, count, copy_map)
+
+
+def attach_map(info: SharedMapInfo):
+    """
+    Подключает карту, описанную share_map, в процессе-обработчике. Ориентиры
+    из блока запоминаются для карты (landmarks_for вернёт их без построения).
+
+    Returns:
+        (блок SharedMemory или None, объект Map); блок должен жить, пока
+        используется карта
+    """
+    name, rows, cols, file_path, version, count, copied = info
+    if name is None:
+        return None, Map(file_path)
+    from multiprocessing import shared_memory
+    block = shared_memory.SharedMemory(name=name)
+    n = rows * cols
+    view = block.buf
+    offset = 4 * count * (n + 1)
+    if copied:
+        map_obj = Map.from_buffers(rows, cols, view[offset:offset + 4 * n].cast('i'),
+                                   view[offset + 8 * n:offset + 9 * n],
+                                   view[offset + 4 * n:offset + 8 * n].cast('i'), file_path, version)
+    else:
+        map_obj = Map(file_path)
+    if count:
+        landmarks = view[:offset].cast('i')
+        tables = [landmarks[count + k * n:count + (k + 1) * n] for k in range(count)]
+        remember_landmarks(map_obj, Landmarks(rows, cols, landmarks[:count].tolist(), tables, version))
+    return block, map_obj
@@ -0,0 +1,181 @@
+"""
+Однопроходная обработка списка рёбер без построения Graph.
+
+Файл "из в [вес]" читается блоками (utils.parser.iter_edge_chunks), дуги
+каждого блока сразу объединяются в системе непересекающихся множеств и
+отбрасываются. В памяти остаются только массивы DSU, рёбра остовного леса
+(не больше V - 1) и контрольные суммы, то есть O(V) независимо от числа рёбер.
+
+Ориентированность определяется без хранения дуг: граф неориентированный, если
+мультимножество дуг (u, v, w) совпадает с мультимножеством (v, u, w). Для этого
+суммируются 64-битные хэши дуг в прямом и обратном направлении; совпадение
+сумм у несимметричного графа возможно лишь с вероятностью порядка 2^-64.
+Повторная дуга при этом учитывается дважды, а в Graph заменяет прежнюю, поэтому
+несовпадение сумм (например, ребро 1 - 2 записано как 1 2, 2 1, 1 2) ещё не
+означает орграф: stream_edges подтверждает его загрузкой Graph в режиме
+'sparse', и только в этом случае память - O(E).
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+from .dsu import DisjointSet
+from .graph import Graph
+from .parser import CHUNK_SIZE, iter_edge_chunks, read_vertices_count
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MASK = (1 << 64) - 1
+
+# Множители хэша дуги (нечётные 64-битные константы)
+HASH_SOURCE = 0x9E3779B97F4A7C15
+HASH_TARGET = 0xC2B2AE3D27D4EB4F
+HASH_WEIGHT = 0x165667B19E3779F9
+
+
+def _arc_hash(u: int, v: int, w: int) -> int:
+    """64-битный хэш дуги (перемешивание splitmix64)."""
+    x = (u * HASH_SOURCE ^ v * HASH_TARGET ^ w * HASH_WEIGHT) & MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK
+    return x ^ (x >> 31)
+
+
+def _arc_hash_sum(u, v, w) -> int:
+    """Сумма хэшей дуг блока по модулю 2^64 (массивы NumPy uint64)."""
+    with np.errstate(over='ignore'):
+        x = u * np.uint64(HASH_SOURCE) ^ v * np.uint64(HASH_TARGET) ^ w * np.uint64(HASH_WEIGHT)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        x ^= x >> np.uint64(31)
+        return int(x.sum(dtype=np.uint64))
+
+
+class StreamingForest:
+    """
+    Компоненты и остовный лес графа, накапливаемые по блокам дуг.
+
+    Дугами считаются записи с положительным весом (как Graph.is_edge). Ребро
+    добавляется в лес, если его концы были в разных компонентах, поэтому лес
+    зависит от порядка рёбер в файле (в отличие от леса обхода в глубину).
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self.arcs = 0
+        self._sets = DisjointSet(n)
+        self._forest: List[Tuple[int, int]] = []
+        self._forward = 0
+        self._backward = 0
+        # Ориентированность, подтверждённая по Graph (None - по хэшам дуг)
+        self._directed: Optional[bool] = None
+
+    def add_arcs(self, sources, targets, weights):
+        """
+        Учитывает блок дуг (0-индексация).
+
+        Raises:
+            ValueError: номер вершины вне диапазона 1..n
+        """
+        if not len(sources):
+            return
+        if min(min(sources), min(targets)) < 0 or max(max(sources), max(targets)) >= self.n:
+            raise ValueError("Номер вершины вне диапазона")
+        self.arcs += len(sources)
+        # Нулевой вес означает отсутствие дуги и в проверке симметричности
+        if np is not None:
+            weight_values = np.asarray(weights)
+            present = weight_values != 0
+            u = np.asarray(sources)[present].astype(np.uint64)
+            v = np.asarray(targets)[present].astype(np.uint64)
+            w = weight_values[present].astype(np.uint64)
+            self._forward = (self._forward + _arc_hash_sum(u, v, w)) & MASK
+            self._backward = (self._backward + _arc_hash_sum(v, u, w)) & MASK
+            positive = weight_values > 0
+            if not positive.all():
+                sources = np.asarray(sources)[positive].tolist()
+                targets = np.asarray(targets)[positive].tolist()
+        else:
+            forward = backward = 0
+            for u, v, w in zip(sources, targets, weights):
+                if w:
+                    forward += _arc_hash(u, v, w)
+                    backward += _arc_hash(v, u, w)
+            self._forward = (self._forward + forward) & MASK
+            self._backward = (self._backward + backward) & MASK
+            if min(weights) <= 0:
+                arcs = [(u, v) for u, v, w in zip(sources, targets, weights) if w > 0]
+                sources = [u for u, _ in arcs]
+                targets = [v for _, v in arcs]
+        self._sets.union_pairs(sources, targets, self._forest)
+
+    def is_directed(self) -> bool:
+        """
+        Ориентированный ли граф: подтверждённое значение (confirm_directed) или,
+        если его нет, несимметричность мультимножества дуг.
+        """
+        if self._directed is not None:
+            return self._directed
+        return self._forward != self._backward
+
+    def confirm_directed(self, directed: bool):
+        """Задаёт ориентированность, проверенную без учёта повторных дуг."""
+        self._directed = directed
+
+    def components(self) -> List[List[int]]:
+        """Компоненты (для орграфа - слабой связности), вершины с 1."""
+        return [[vertex + 1 for vertex in group] for group in self._sets.groups()]
+
+    def forest_edges(self) -> List[Tuple[int, int]]:
+        """Рёбра остовного леса (u, v), u < v, вершины с 1, в порядке добавления."""
+        return [(u + 1, v + 1) if u < v else (v + 1, u + 1) for u, v in self._forest]
+
+
+def stream_edges(file_path: str, chunk_size: int = CHUNK_SIZE) -> StreamingForest:
+    """
+    Читает файл списка рёбер (первая строка - число вершин) за один проход.
+    Если суммы хэшей дуг не совпали, ориентированность проверяется загрузкой
+    Graph (см. модуль).
+
+    Raises:
+        ValueError: неверный формат файла или номер вершины вне диапазона
+    """
+    with open(file_path, 'rb') as file:
+        forest = StreamingForest(read_vertices_count(file))
+        for sources, targets, weights in iter_edge_chunks(file, chunk_size):
+            forest.add_arcs(sources, targets, weights)
+    if forest.is_directed():
+        # Несовпадение сумм хэшей может дать и повторная дуга неориентированного
+        # графа: ответ должен совпадать с solve_task, поэтому решает Graph
+        forest.confirm_directed(Graph(file_path, 'edges', 'sparse').is_directed())
+    return forest
+
+
+def is_spanning_forest(file_path: str, edges: Iterable[Tuple[int, int]],
+                       chunk_size: int = CHUNK_SIZE) -> bool:
+    """
+    Проверяет за один проход по файлу списка рёбер, что edges (пары вершин с 1)
+    - остовный лес графа: каждое ребро есть в графе (дуга с положительным
+    весом в любом направлении), рёбра не образуют циклов и их ровно V - c,
+    где c - число компонент графа.
+
+    Остовный лес не единственный, поэтому результат --stream задания 3
+    проверяется так, а не сравнением с эталоном.
+    """
+    with open(file_path, 'rb') as file:
+        n = read_vertices_count(file)
+        forest = DisjointSet(n)
+        wanted = set()
+        for u, v in edges:
+            if not (1 <= u <= n and 1 <= v <= n) or not forest.union(u - 1, v - 1):
+                return False  # Вершина вне графа, петля, повтор или цикл
+            wanted.add((u - 1, v - 1) if u < v else (v - 1, u - 1))
+        sets = DisjointSet(n)
+        for sources, targets, weights in iter_edge_chunks(file, chunk_size):
+            arcs = [(u, v) if u < v else (v, u) for u, v, w in zip(sources, targets, weights) if w > 0]
+            sets.union_pairs([u for u, _ in arcs], [v for _, v in arcs])
+            if wanted:
+                wanted.difference_update(arcs)
+    return not wanted and len(forest) - forest.set_count() == n - sets.set_count()